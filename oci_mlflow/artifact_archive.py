@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+"""
+Packing of artifact directories into single tar objects.
+
+A directory logged as an archive is stored as one uncompressed tar object, along with
+a JSON index of the data offset and size of every member, so each member can be read
+with a single ranged request. Both objects are kept in the hidden `.oci-mlflow-archive`
+directory under the logged directory. Every archive also gets its own manifest in the
+`.oci-mlflow-archives` directory at the root of the run artifacts, so the archives are
+found with a single listing, and concurrent writers never update a shared object.
+"""
+
+import io
+import json
+import os
+import tarfile
+import time
+import uuid
+from typing import BinaryIO, Dict, List, Tuple
+
+from mlflow.utils.file_utils import relative_path_to_artifact_path
+
+ARCHIVE_DIR = ".oci-mlflow-archive"
+ARCHIVE_MANIFEST_DIR = ".oci-mlflow-archives"
+MANIFEST_VERSION = 1
+
+
+def is_archive_path(path: str) -> bool:
+    """Checks whether an artifact path belongs to the archive bookkeeping objects.
+
+    Parameters
+    ----------
+    path: str
+        The artifact path, relative to the run artifacts root.
+
+    Returns
+    -------
+    bool
+        True for the manifests, and for the archive directories and their content.
+    """
+    parts = path.strip("/").split("/")
+    return ARCHIVE_DIR in parts or parts[0] == ARCHIVE_MANIFEST_DIR
+
+
+def write_tar(local_dir: str, fileobj: BinaryIO) -> Dict[str, List[int]]:
+    """Writes the files of a directory into a tar stream.
+
+    Parameters
+    ----------
+    local_dir: str
+        The directory to pack.
+    fileobj: BinaryIO
+        The stream to write the tar archive to. It is written sequentially, so it may be a pipe.
+
+    Returns
+    -------
+    Dict[str, List[int]]
+        The member paths relative to the directory, mapped to their [data offset, size]
+        in the archive.
+    """
+    members = {}
+    with tarfile.open(fileobj=fileobj, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+        for root, dirs, filenames in os.walk(local_dir):
+            dirs.sort()
+            for filename in sorted(filenames):
+                local_file = os.path.join(root, filename)
+                name = relative_path_to_artifact_path(os.path.relpath(local_file, local_dir))
+                tarinfo = tar.gettarinfo(local_file, arcname=name)
+                with open(local_file, "rb") as f:
+                    tar.addfile(tarinfo, f)
+                # The data ends the member, padded to a whole number of blocks.
+                padded_size = -(-tarinfo.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+                members[name] = [tar.offset - padded_size, tarinfo.size]
+    return members
+
+
+def new_archive_id() -> str:
+    """Generates a unique archive identifier, sorting in the order the archives are logged."""
+    return f"{time.time_ns():020d}-{uuid.uuid4().hex}"
+
+
+def manifest_path(archive_id: str) -> str:
+    """Gets the path of the manifest of an archive, relative to the run artifacts root."""
+    return f"{ARCHIVE_MANIFEST_DIR}/{archive_id}.json"
+
+
+def read_manifest(content: bytes) -> Dict[str, str]:
+    """Parses the manifest of an archive.
+
+    Parameters
+    ----------
+    content: bytes
+        The manifest content.
+
+    Returns
+    -------
+    Dict[str, str]
+        The "path" of the logged directory and the "archive" and "index" object paths,
+        relative to the run artifacts root.
+    """
+    manifest = json.loads(content)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported archive manifest version `{manifest.get('version')}`.")
+    return {key: manifest[key] for key in ("path", "archive", "index")}
+
+
+def dump_manifest(archive: Dict[str, str]) -> bytes:
+    """Serializes the manifest of an archive, see `read_manifest`."""
+    return json.dumps({"version": MANIFEST_VERSION, **archive}).encode("utf-8")
+
+
+def archive_paths(artifact_path: str, archive_id: str) -> Tuple[str, str]:
+    """Gets the archive and index object paths of an archived directory.
+
+    Parameters
+    ----------
+    artifact_path: str
+        The archived directory path, relative to the run artifacts root.
+    archive_id: str
+        The unique identifier of the archive.
+
+    Returns
+    -------
+    Tuple[str, str]
+        The archive and index object paths, relative to the run artifacts root.
+    """
+    base = f"{artifact_path.strip('/')}/{ARCHIVE_DIR}" if artifact_path.strip("/") else ARCHIVE_DIR
+    return f"{base}/{archive_id}.tar", f"{base}/{archive_id}.json"
+
+
+class MemberReader(io.RawIOBase):
+    """Read-only, seekable view of an archive member, read from the opened archive object."""
+
+    def __init__(self, fileobj: BinaryIO, offset: int, size: int):
+        """Initializes `MemberReader` instance.
+
+        Parameters
+        ----------
+        fileobj: BinaryIO
+            The seekable archive file object. It is closed with the reader.
+        offset: int
+            The data offset of the member in the archive.
+        size: int
+            The size of the member.
+        """
+        super().__init__()
+        self._file = fileobj
+        self._offset = offset
+        self._size = size
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"Invalid whence `{whence}`.")
+        if offset < 0:
+            raise ValueError(f"Negative seek position `{offset}`.")
+        self._position = offset
+        return offset
+
+    def readinto(self, b) -> int:
+        size = min(len(b), self._size - self._position)
+        if size <= 0:
+            return 0
+        self._file.seek(self._offset + self._position)
+        data = self._file.read(size)
+        b[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
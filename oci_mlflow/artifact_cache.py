@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+import hashlib
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import uuid
+from typing import Callable, Dict, Optional
+
+from oci_mlflow import logger
+from oci_mlflow.env import get_env_int
+
+ARTIFACT_CACHE_DIR = "OCI_MLFLOW_ARTIFACT_CACHE_DIR"
+ARTIFACT_CACHE_SIZE = "OCI_MLFLOW_ARTIFACT_CACHE_SIZE"
+DEFAULT_ARTIFACT_CACHE_SIZE = 10 * 1024**3
+
+
+class ArtifactCache:
+    """
+    Local read-through cache of downloaded artifacts.
+
+    The entries are keyed by the object URI and its ETag, so a changed object is never
+    served from the cache. When the cache grows over its size cap, the least recently
+    used entries are evicted. The total size of each cache directory is tracked in memory,
+    so the directory is only walked on the first write and when the cap is exceeded. Cache hits are installed into the destination with hard
+    links when possible, falling back to copies across filesystems. The entries are made
+    read-only, since a hard linked destination shares its content with the cache.
+
+    Attributes
+    ----------
+    cache_dir: str
+        The cache directory.
+    max_size: int
+        The maximum total size of the cached entries in bytes.
+    """
+
+    _lock = threading.Lock()
+    # The tracked total size of the entries of each cache directory, set by `evict`.
+    _sizes: Dict[str, int] = {}
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_ARTIFACT_CACHE_SIZE):
+        """Initializes `ArtifactCache` instance.
+
+        Parameters
+        ----------
+        cache_dir: str
+            The cache directory. Created if it does not exist.
+        max_size: (int, optional). Defaults to 10 GiB.
+            The maximum total size of the cached entries in bytes.
+        """
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        self.max_size = max_size
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional["ArtifactCache"]:
+        """Creates the cache configured by the `OCI_MLFLOW_ARTIFACT_CACHE_DIR` and
+        `OCI_MLFLOW_ARTIFACT_CACHE_SIZE` environment variables.
+
+        Returns
+        -------
+        Optional[ArtifactCache]
+            The artifact cache, or None if no cache directory is configured.
+        """
+        cache_dir = os.environ.get(ARTIFACT_CACHE_DIR)
+        if not cache_dir:
+            return None
+        return cls(cache_dir, get_env_int(ARTIFACT_CACHE_SIZE, DEFAULT_ARTIFACT_CACHE_SIZE))
+
+    def entry_path(self, uri: str, etag: str) -> str:
+        """Gets the path of the cache entry of an object version.
+
+        Parameters
+        ----------
+        uri: str
+            The object URI.
+        etag: str
+            The object ETag.
+
+        Returns
+        -------
+        str
+            The cache entry path.
+        """
+        key = hashlib.sha256(f"{uri}\n{etag}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, uri: str, etag: str, local_path: str) -> bool:
+        """Installs a cached object version into the destination.
+
+        Parameters
+        ----------
+        uri: str
+            The object URI.
+        etag: str
+            The object ETag.
+        local_path: str
+            The destination path.
+
+        Returns
+        -------
+        bool
+            True if the object was served from the cache, False on a cache miss.
+        """
+        entry = self.entry_path(uri, etag)
+        try:
+            # The modification time tracks the last use of the entry for the LRU eviction.
+            os.utime(entry)
+            self._install(entry, local_path)
+        except FileNotFoundError:
+            # The entry is missing, or was evicted before it could be installed.
+            return False
+        logger.debug(f"Served {uri} from the artifact cache.")
+        return True
+
+    def put(
+        self, uri: str, etag: str, fetch: Callable[[str], None], local_path: str
+    ):
+        """Fetches an object version into the cache and installs it into the destination.
+
+        Parameters
+        ----------
+        uri: str
+            The object URI.
+        etag: str
+            The object ETag.
+        fetch: Callable[[str], None]
+            The function downloading the object to the given path.
+        local_path: str
+            The destination path.
+        """
+        entry = self.entry_path(uri, etag)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(entry), suffix=".tmp")
+        os.close(fd)
+        try:
+            fetch(tmp_path)
+            size = os.path.getsize(tmp_path)
+            os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(tmp_path, entry)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._install(entry, local_path)
+        with self._lock:
+            total_size = self._sizes.get(self.cache_dir)
+            if total_size is not None:
+                total_size += size
+                self._sizes[self.cache_dir] = total_size
+        # The directory is walked to build the size index, or to evict entries. Entries
+        # written by other processes are only accounted for by the walks.
+        if total_size is None or total_size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits its size cap."""
+        with self._lock:
+            entries = []
+            for root, _, filenames in os.walk(self.cache_dir):
+                for filename in filenames:
+                    if filename.endswith(".tmp"):
+                        continue
+                    path = os.path.join(root, filename)
+                    try:
+                        entry_stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((entry_stat.st_mtime, entry_stat.st_size, path))
+            total_size = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total_size <= self.max_size:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total_size -= size
+                logger.debug(f"Evicted {path} from the artifact cache.")
+            self._sizes[self.cache_dir] = total_size
+
+    @staticmethod
+    def _install(entry: str, local_path: str):
+        """Atomically places a cache entry at the destination, sharing its content if possible."""
+        tmp_path = f"{local_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.link(entry, tmp_path)
+        except FileNotFoundError:
+            # The entry was evicted meanwhile, a copy would fail the same way.
+            raise
+        except OSError:
+            # Hard links are not possible across filesystems.
+            shutil.copyfile(entry, tmp_path)
+        try:
+            os.replace(tmp_path, local_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+"""
+Listings of the stored artifacts, and the summaries of the sync and bulk delete operations.
+
+`ArtifactIndex` answers the directory listings from a single flat listing of the objects,
+and `ArchiveCatalog` lists the members of the archived directories alongside them.
+"""
+
+import posixpath
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from mlflow.entities import FileInfo
+from oci import object_storage
+
+
+@dataclass
+class SyncSummary:
+    """Class representing the outcome of an artifact directory sync.
+
+    Attributes
+    ----------
+    uploaded: int
+        The number of new or changed files uploaded.
+    skipped: int
+        The number of files skipped because the stored artifacts are identical.
+    deleted: int
+        The number of stored artifacts deleted because their files are gone locally.
+    """
+
+    uploaded: int = 0
+    skipped: int = 0
+    deleted: int = 0
+
+
+@dataclass
+class DeleteSummary:
+    """Class representing the outcome of a bulk artifact deletion.
+
+    Attributes
+    ----------
+    objects: int
+        The number of objects found under the deleted path.
+    bytes: int
+        The total size of the objects found, in bytes.
+    deleted: int
+        The number of objects deleted. Always 0 for a dry run.
+    failures: Dict[str, Exception]
+        The objects that could not be deleted, mapped to the error raised for them.
+    """
+
+    objects: int = 0
+    bytes: int = 0
+    deleted: int = 0
+    failures: Dict[str, Exception] = field(default_factory=dict)
+
+
+class ArtifactIndex:
+    """
+    In-memory directory index of all the artifacts stored under a root URI.
+
+    Attributes
+    ----------
+    root: str
+        The URI of the indexed directory.
+    created_at: float
+        The monotonic time the index was built at.
+    """
+
+    def __init__(self, root: str):
+        """Initializes an empty `ArtifactIndex` instance.
+
+        Parameters
+        ----------
+        root: str
+            The URI of the indexed directory.
+        """
+        self.root = root
+        self.created_at = time.monotonic()
+        self._children: Dict[str, Dict[str, FileInfo]] = {}
+
+    def add(self, path: str, size: int = 0, is_dir: bool = False):
+        """Adds an artifact to the index, along with all its parent directories.
+
+        Parameters
+        ----------
+        path: str
+            The artifact path, relative to the root.
+        size: (int, optional). Defaults to 0.
+            The artifact size in bytes.
+        is_dir: (bool, optional). Defaults to False.
+            Whether the artifact is a directory.
+        """
+        parts = [part for part in path.split("/") if part]
+        parent = ""
+        for i, part in enumerate(parts):
+            child = f"{parent}/{part}" if parent else part
+            child_is_dir = is_dir or i < len(parts) - 1
+            self._children.setdefault(parent, {})[child] = FileInfo(
+                child, child_is_dir, 0 if child_is_dir else size
+            )
+            parent = child
+
+    def list(self, path: str = "") -> List[FileInfo]:
+        """Lists the artifacts directly under a directory of the index.
+
+        Parameters
+        ----------
+        path: (str, optional). Defaults to the root.
+            The directory path, relative to the root.
+
+        Returns
+        -------
+        List[FileInfo]
+            The artifacts directly under the directory, with paths relative to the root.
+        """
+        path = "" if path in ("", ".") else path.strip("/")
+        return sorted(self._children.get(path, {}).values(), key=lambda f: f.path)
+
+    def files(self, path: str = "") -> List[FileInfo]:
+        """Lists all the files under a directory of the index, recursively.
+
+        Parameters
+        ----------
+        path: (str, optional). Defaults to the root.
+            The directory path, relative to the root.
+
+        Returns
+        -------
+        List[FileInfo]
+            The files under the directory, with paths relative to the root.
+        """
+        result = []
+        pending = [path]
+        while pending:
+            for info in self.list(pending.pop()):
+                if info.is_dir:
+                    pending.append(info.path)
+                else:
+                    result.append(info)
+        return sorted(result, key=lambda f: f.path)
+
+
+class ArchiveCatalog:
+    """
+    Virtual view of the members of the archives logged under the run artifacts root.
+
+    Attributes
+    ----------
+    created_at: float
+        The monotonic time the catalog was loaded at.
+    index: ArtifactIndex
+        The directory index of the members, relative to the run artifacts root.
+    members: Dict[str, Tuple[str, int, int]]
+        The member paths mapped to their (archive path, data offset, size).
+    """
+
+    def __init__(self):
+        """Initializes an empty `ArchiveCatalog` instance."""
+        self.created_at = time.monotonic()
+        self.index = ArtifactIndex("")
+        self.members: Dict[str, Tuple[str, int, int]] = {}
+
+    def add(self, path: str, archive: str, members: Dict[str, List[int]]):
+        """Adds the members of an archive, replacing the members of the earlier archives.
+
+        Parameters
+        ----------
+        path: str
+            The archived directory path, relative to the run artifacts root.
+        archive: str
+            The archive object path, relative to the run artifacts root.
+        members: Dict[str, List[int]]
+            The member paths relative to the archived directory, mapped to their [offset, size].
+        """
+        for name, (offset, size) in members.items():
+            member_path = posixpath.join(path, name) if path else name
+            self.members[member_path] = (archive, offset, size)
+            self.index.add(member_path, size)
+
+    def files(self, path: str = "") -> Dict[str, Tuple[str, int, int]]:
+        """Gets the members at or under a path.
+
+        Parameters
+        ----------
+        path: (str, optional). Defaults to the root.
+            The artifact path, relative to the run artifacts root.
+
+        Returns
+        -------
+        Dict[str, Tuple[str, int, int]]
+            The member paths mapped to their (archive path, data offset, size).
+        """
+        path = path.strip("/")
+        return {
+            member_path: member
+            for member_path, member in self.members.items()
+            if not path or member_path == path or member_path.startswith(path + "/")
+        }
+
+
+def is_unchanged(
+    obj: object_storage.models.ObjectSummary, size: int, md5: str
+) -> Optional[bool]:
+    """
+    Checks whether an object holds the content of a local file by comparing their sizes
+    and MD5 digests. The modification times are not compared, since the clocks of the
+    client and of Object Storage may differ.
+
+    Parameters
+    ----------
+    obj: oci.object_storage.models.ObjectSummary
+        The listed object, with its size and MD5.
+    size: int
+        The size of the local file.
+    md5: str
+        The base64 encoded MD5 digest of the local file.
+
+    Returns
+    -------
+    Optional[bool]
+        True if the object has the same size and MD5 as the file, None if the sizes match
+        but the listing has no plain MD5 to compare, e.g. for multipart uploads.
+    """
+    if obj.size != size:
+        return False
+    # The MD5 of multipart uploads is a digest of the parts, suffixed with the part count.
+    if not obj.md5 or "-" in obj.md5:
+        return None
+    return md5 == obj.md5
@@ -0,0 +1,932 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+"""
+Uploads of the artifacts to Object Storage.
+
+`ArtifactUploader` uploads files and in-memory data with single or multipart requests,
+optionally skipping the content already stored and compressing the eligible files.
+`ArtifactUploadQueue` runs the uploads of the asynchronous artifact logging in the
+background, and makes `mlflow.end_run` wait for them.
+"""
+
+import atexit
+import base64
+import functools
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Dict, List, Tuple, Union
+
+from oci import object_storage
+from oci.exceptions import ServiceError
+
+from oci_mlflow import logger
+from oci_mlflow.env import get_env_bool, get_env_int
+from oci_mlflow.object_storage_auth import ObjectStorageClientPool, get_signer, get_token_path
+from oci_mlflow.object_storage_utils import (
+    HASH_CHUNK_SIZE,
+    MEBIBYTE,
+    ArtifactTransferError,
+    call_with_retry,
+    file_md5,
+    parse_os_uri,
+    run_parallel,
+)
+from oci_mlflow.transfer_metrics import TransferMetrics
+
+UPLOAD_CONCURRENCY = "OCI_MLFLOW_UPLOAD_CONCURRENCY"
+UPLOAD_RETRIES = "OCI_MLFLOW_UPLOAD_RETRIES"
+UPLOAD_PART_SIZE = "OCI_MLFLOW_UPLOAD_PART_SIZE"
+UPLOAD_PARALLEL_PROCESS_COUNT = "OCI_MLFLOW_UPLOAD_PARALLEL_PROCESS_COUNT"
+MULTIPART_UPLOAD_THRESHOLD = "OCI_MLFLOW_MULTIPART_UPLOAD_THRESHOLD"
+DEDUPLICATE_UPLOADS = "OCI_MLFLOW_DEDUPLICATE_UPLOADS"
+ASYNC_UPLOAD_QUEUE_SIZE = "OCI_MLFLOW_ASYNC_UPLOAD_QUEUE_SIZE"
+COMPRESS_ARTIFACTS = "OCI_MLFLOW_COMPRESS_ARTIFACTS"
+COMPRESS_EXTENSIONS = "OCI_MLFLOW_COMPRESS_EXTENSIONS"
+COMPRESS_MIN_SIZE = "OCI_MLFLOW_COMPRESS_MIN_SIZE"
+DEFAULT_UPLOAD_CONCURRENCY = 8
+DEFAULT_UPLOAD_RETRIES = 3
+DEFAULT_UPLOAD_PARALLEL_PROCESS_COUNT = 4
+MAX_UPLOAD_PARTS = 10000
+DEFAULT_UPLOAD_PART_SIZE = 128 * MEBIBYTE
+DEFAULT_MULTIPART_UPLOAD_THRESHOLD = 128 * MEBIBYTE
+DEFAULT_ASYNC_UPLOAD_QUEUE_SIZE = 64
+MD5_METADATA_KEY = "oci-mlflow-md5"
+ENCODING_METADATA_KEY = "oci-mlflow-encoding"
+SIZE_METADATA_KEY = "oci-mlflow-size"
+GZIP_ENCODING = "gzip"
+GZIP_MAGIC = b"\x1f\x8b"
+DEFAULT_COMPRESS_EXTENSIONS = ".csv,.json,.jsonl,.log,.md,.tsv,.txt,.xml,.yaml,.yml"
+DEFAULT_COMPRESS_MIN_SIZE = 64 * 1024
+
+_end_run_lock = threading.Lock()
+
+
+class GzipReader(io.RawIOBase):
+    """
+    Read-only stream of a file compressed with gzip on the fly, so large files are
+    compressed while they are uploaded without a compressed copy on disk.
+
+    Wrap it into `io.BufferedReader` for reads returning the full requested size.
+    """
+
+    def __init__(self, file_path: str, compresslevel: int = 6):
+        """Initializes `GzipReader` instance.
+
+        Parameters
+        ----------
+        file_path: str
+            The path of the file to compress.
+        compresslevel: (int, optional). Defaults to 6.
+            The gzip compression level, from 1 (fastest) to 9 (smallest).
+        """
+        super().__init__()
+        self._file = open(file_path, "rb")
+        # wbits=31 writes the gzip header and trailer around the deflate stream.
+        self._compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, 31)
+        self._buffer = bytearray()
+        self._eof = False
+        self.compressed_size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while len(self._buffer) < len(b) and not self._eof:
+            chunk = self._file.read(HASH_CHUNK_SIZE)
+            if chunk:
+                self._buffer += self._compressor.compress(chunk)
+            else:
+                self._buffer += self._compressor.flush()
+                self._eof = True
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        del self._buffer[:size]
+        self.compressed_size += size
+        return size
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+class PrefixedReader(io.RawIOBase):
+    """
+    Read-only stream of bytes already read from a stream, followed by the rest of it.
+
+    Wrap it into `io.BufferedReader` for reads returning the full requested size.
+    """
+
+    def __init__(self, prefix: bytes, stream: BinaryIO):
+        """Initializes `PrefixedReader` instance.
+
+        Parameters
+        ----------
+        prefix: bytes
+            The bytes already read from the stream.
+        stream: BinaryIO
+            The stream to read the rest from.
+        """
+        super().__init__()
+        self._prefix = memoryview(prefix)
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if self._prefix:
+            size = min(len(b), len(self._prefix))
+            b[:size] = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return size
+        chunk = self._stream.read(len(b))
+        b[: len(chunk)] = chunk
+        return len(chunk)
+
+
+def _read_up_to(stream: BinaryIO, size: int) -> bytes:
+    """Reads a stream until `size` bytes are read or the stream ends."""
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+class ArtifactUploader:
+    """
+    The class helper to upload model artifacts.
+
+    Attributes
+    ----------
+    upload_manager: UploadManager
+        The uploadManager simplifies interaction with the Object Storage service.
+    part_size: int
+        The size of the parts of multipart uploads in bytes. When not configured, it is chosen
+        by file size: 128 MiB, growing for huge files to stay within the parts limit.
+    parallel_process_count: int
+        The number of parts of a multipart upload uploaded in parallel.
+    multipart_threshold: int
+        The file size in bytes above which files are uploaded in parts.
+        Smaller files are uploaded with a single request.
+    deduplicate: bool
+        Whether to skip uploading files whose content is already stored at the destination.
+    record_md5: bool
+        Whether to record the MD5 of the uploaded files in their metadata, even when they
+        are not deduplicated.
+    compress: bool
+        Whether to compress the eligible files with gzip while they are uploaded.
+    """
+
+    def __init__(
+        self,
+        part_size: int = None,
+        parallel_process_count: int = None,
+        multipart_threshold: int = None,
+        deduplicate: bool = None,
+        compress: bool = None,
+        record_md5: bool = False,
+    ):
+        """Initializes `ArtifactUploader` instance.
+
+        Parameters
+        ----------
+        part_size: (int, optional). Defaults to `OCI_MLFLOW_UPLOAD_PART_SIZE`.
+            The size of the parts of multipart uploads in bytes.
+        parallel_process_count: (int, optional). Defaults to `OCI_MLFLOW_UPLOAD_PARALLEL_PROCESS_COUNT` or 4.
+            The number of parts of a multipart upload uploaded in parallel.
+        multipart_threshold: (int, optional). Defaults to `OCI_MLFLOW_MULTIPART_UPLOAD_THRESHOLD` or 128 MiB.
+            The file size in bytes above which files are uploaded in parts.
+        deduplicate: (bool, optional). Defaults to `OCI_MLFLOW_DEDUPLICATE_UPLOADS` or False.
+            Whether to skip uploading files whose content is already stored at the destination.
+        compress: (bool, optional). Defaults to `OCI_MLFLOW_COMPRESS_ARTIFACTS` or False.
+            Whether to compress the eligible files with gzip while they are uploaded. The files
+            with the `OCI_MLFLOW_COMPRESS_EXTENSIONS` extensions and at least
+            `OCI_MLFLOW_COMPRESS_MIN_SIZE` bytes (64 KiB by default) are eligible.
+        record_md5: (bool, optional). Defaults to False.
+            Whether to record the MD5 of the uploaded files in their metadata, even when they
+            are not deduplicated. Object Storage reports no plain MD5 for multipart uploads,
+            so the recorded one is what the later syncs compare.
+        """
+        self.deduplicate = (
+            deduplicate if deduplicate is not None else get_env_bool(DEDUPLICATE_UPLOADS)
+        )
+        self.compress = compress if compress is not None else get_env_bool(COMPRESS_ARTIFACTS)
+        self.record_md5 = record_md5
+        self.part_size = part_size or get_env_int(UPLOAD_PART_SIZE, 0, allow_zero=True) or None
+        self.parallel_process_count = parallel_process_count or get_env_int(
+            UPLOAD_PARALLEL_PROCESS_COUNT, DEFAULT_UPLOAD_PARALLEL_PROCESS_COUNT
+        )
+        self.multipart_threshold = (
+            multipart_threshold
+            if multipart_threshold is not None
+            else get_env_int(
+                MULTIPART_UPLOAD_THRESHOLD, DEFAULT_MULTIPART_UPLOAD_THRESHOLD, allow_zero=True
+            )
+        )
+        self._token_path = get_token_path()
+        self._auth = get_signer(token_path=self._token_path)
+        self.upload_manager = self._get_upload_manager()
+
+    def _get_upload_manager(self) -> object_storage.UploadManager:
+        """Gets the pooled upload manager matching the uploader settings."""
+        return ObjectStorageClientPool.get_upload_manager(
+            self._auth,
+            self._token_path,
+            allow_parallel_uploads=True,
+            parallel_process_count=self.parallel_process_count,
+        )
+
+    def _upload_kwargs(self, file_path: str) -> Dict:
+        """
+        Chooses the multipart settings for a file based on its size.
+
+        Parameters
+        ----------
+        file_path: str
+            The source file path.
+
+        Returns
+        -------
+        Dict
+            The extra arguments for `UploadManager.upload_file`.
+        """
+        try:
+            file_size = os.path.getsize(file_path)
+        except OSError:
+            # Let the upload manager report the missing file.
+            return {}
+        if file_size <= self.multipart_threshold:
+            # The upload manager only splits files larger than the part size.
+            return {"part_size": max(file_size, 1)}
+        part_size = self.part_size or DEFAULT_UPLOAD_PART_SIZE
+        return {"part_size": max(part_size, -(-file_size // MAX_UPLOAD_PARTS))}
+
+    def _reauthenticate(self):
+        """Drops the pooled client of the current signer and switches to a fresh one."""
+        ObjectStorageClientPool.invalidate(self._auth, self._token_path)
+        self._token_path = get_token_path()
+        self._auth = get_signer(token_path=self._token_path, refresh=True)
+        self.upload_manager = self._get_upload_manager()
+
+    def _is_uploaded(
+        self, size: int, namespace_name: str, bucket_name: str, object_name: str, md5: str
+    ) -> bool:
+        """
+        Checks whether the destination object already holds the given content.
+        The MD5 recorded in the object metadata is used for multipart uploads,
+        which Object Storage does not report a plain MD5 for.
+
+        Parameters
+        ----------
+        size: int
+            The content size in bytes.
+        namespace_name: str
+            The Object Storage namespace.
+        bucket_name: str
+            The bucket name.
+        object_name: str
+            The destination object name.
+        md5: str
+            The base64 encoded MD5 digest of the content.
+
+        Returns
+        -------
+        bool
+            True if the destination object has the same size and MD5 as the content.
+        """
+        try:
+            headers = self.upload_manager.object_storage_client.head_object(
+                namespace_name, bucket_name, object_name
+            ).headers
+        except ServiceError as ex:
+            if ex.status == 404:
+                return False
+            raise
+        # Compressed objects record the size of the original content.
+        stored_size = headers.get(f"opc-meta-{SIZE_METADATA_KEY}") or headers.get("content-length")
+        if str(stored_size) != str(size):
+            return False
+        return md5 in (
+            headers.get("content-md5"),
+            headers.get(f"opc-meta-{MD5_METADATA_KEY}"),
+        )
+
+    def upload(self, file_path: str, dst_path: str, md5: str = None) -> bool:
+        """Uploads model artifacts.
+
+        Parameters
+        ----------
+        file_path: str
+            The source file path.
+        dst_path: str
+            The destination path.
+        md5: (str, optional). Defaults to None.
+            The base64 encoded MD5 digest of the file, if it is already known.
+
+        Returns
+        -------
+        bool
+            False if the upload was skipped because the destination already holds
+            the file content, True otherwise.
+        """
+        if self.is_compressible(file_path):
+            return self._upload_compressed(file_path, dst_path, md5)
+        bucket_name, namespace_name, object_name = parse_os_uri(dst_path)
+        logger.debug(f"{bucket_name=}, {namespace_name=}, {object_name=}")
+        kwargs = self._upload_kwargs(file_path)
+        if self.deduplicate or self.record_md5:
+            md5 = md5 or file_md5(file_path)
+            size = os.path.getsize(file_path)
+            if self.deduplicate and self._is_uploaded(
+                size, namespace_name, bucket_name, object_name, md5
+            ):
+                logger.debug(f"Skipped uploading {file_path}, {dst_path} is identical.")
+                return False
+            kwargs["metadata"] = {MD5_METADATA_KEY: md5}
+        with TransferMetrics.measure("upload", dst_path) as event:
+            if "part_size" in kwargs:
+                event.bytes = os.path.getsize(file_path)
+                event.parts = max(1, -(-event.bytes // kwargs["part_size"]))
+            response = self.upload_manager.upload_file(
+                namespace_name=namespace_name,
+                bucket_name=bucket_name,
+                object_name=object_name,
+                file_path=file_path,
+                **kwargs,
+            )
+        logger.debug(response)
+        return True
+
+    def is_compressible(self, file_path: str) -> bool:
+        """Checks whether a file is compressed on upload.
+
+        Parameters
+        ----------
+        file_path: str
+            The source file path.
+
+        Returns
+        -------
+        bool
+            True if compression is enabled and the file has an eligible extension and size.
+        """
+        if not self.compress:
+            return False
+        extensions = os.environ.get(COMPRESS_EXTENSIONS) or DEFAULT_COMPRESS_EXTENSIONS
+        extensions = {ext.strip().lower() for ext in extensions.split(",") if ext.strip()}
+        if os.path.splitext(file_path)[1].lower() not in extensions:
+            return False
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return False
+        return size >= get_env_int(
+            COMPRESS_MIN_SIZE, DEFAULT_COMPRESS_MIN_SIZE, allow_zero=True
+        )
+
+    def _upload_compressed(self, file_path: str, dst_path: str, md5: str = None) -> bool:
+        """
+        Uploads a file compressed with gzip on the fly. The object keeps the artifact name
+        and is marked with the encoding in its metadata, so downloads decompress it. The
+        original size and MD5 are recorded as well, for the deduplication and the sync.
+        Content-Encoding is not used, since HTTP clients would decode the content implicitly.
+
+        Parameters
+        ----------
+        file_path: str
+            The source file path.
+        dst_path: str
+            The destination path.
+        md5: (str, optional). Defaults to None.
+            The base64 encoded MD5 digest of the file, if it is already known.
+
+        Returns
+        -------
+        bool
+            False if the upload was skipped because the destination already holds
+            the file content, True otherwise.
+        """
+        bucket_name, namespace_name, object_name = parse_os_uri(dst_path)
+        size = os.path.getsize(file_path)
+        md5 = md5 or file_md5(file_path)
+        if self.deduplicate and self._is_uploaded(
+            size, namespace_name, bucket_name, object_name, md5
+        ):
+            logger.debug(f"Skipped uploading {file_path}, {dst_path} is identical.")
+            return False
+        metadata = {
+            ENCODING_METADATA_KEY: GZIP_ENCODING,
+            SIZE_METADATA_KEY: str(size),
+            MD5_METADATA_KEY: md5,
+        }
+        reader = GzipReader(file_path)
+        with io.BufferedReader(reader, HASH_CHUNK_SIZE) as stream:
+            with TransferMetrics.measure("upload", dst_path, parts=1) as event:
+                if size <= self.multipart_threshold:
+                    data = stream.read()
+                    event.bytes = len(data)
+                    response = self.upload_manager.object_storage_client.put_object(
+                        namespace_name,
+                        bucket_name,
+                        object_name,
+                        data,
+                        content_length=len(data),
+                        opc_meta=metadata,
+                    )
+                else:
+                    response = self.upload_manager.upload_stream(
+                        namespace_name,
+                        bucket_name,
+                        object_name,
+                        stream,
+                        part_size=self._upload_kwargs(file_path)["part_size"],
+                        metadata=metadata,
+                    )
+                    event.bytes = reader.compressed_size
+        logger.debug(f"Uploaded {file_path} compressed, {response}")
+        return True
+
+    def upload_stream(
+        self, data: Union[str, bytes, bytearray, memoryview, BinaryIO], dst_path: str
+    ) -> bool:
+        """Uploads in-memory data or the content of a file-like object, without a local file.
+
+        Parameters
+        ----------
+        data: Union[str, bytes, bytearray, memoryview, BinaryIO]
+            The content to upload. Strings are encoded as UTF-8. File-like objects
+            ending within the multipart threshold are uploaded with a single request,
+            larger ones are read in parts and uploaded with a multipart upload.
+        dst_path: str
+            The destination path.
+
+        Returns
+        -------
+        bool
+            False if the upload was skipped because the destination already holds
+            the content, True otherwise.
+        """
+        bucket_name, namespace_name, object_name = parse_os_uri(dst_path)
+        logger.debug(f"{bucket_name=}, {namespace_name=}, {object_name=}")
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            # Reading one byte past the threshold tells whether the stream ends within it.
+            head = _read_up_to(data, self.multipart_threshold + 1)
+            if len(head) > self.multipart_threshold:
+                with TransferMetrics.measure("upload", dst_path):
+                    response = self.upload_manager.upload_stream(
+                        namespace_name,
+                        bucket_name,
+                        object_name,
+                        io.BufferedReader(PrefixedReader(head, data), HASH_CHUNK_SIZE),
+                        part_size=self.part_size or DEFAULT_UPLOAD_PART_SIZE,
+                    )
+                logger.debug(response)
+                return True
+            data = head
+
+        data = memoryview(data).cast("B")
+        md5 = base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+        kwargs = {}
+        if self.deduplicate:
+            if self._is_uploaded(len(data), namespace_name, bucket_name, object_name, md5):
+                logger.debug(f"Skipped uploading to {dst_path}, the content is identical.")
+                return False
+            kwargs["metadata"] = {MD5_METADATA_KEY: md5}
+        with TransferMetrics.measure("upload", dst_path, bytes=len(data), parts=1) as event:
+            if len(data) <= self.multipart_threshold:
+                response = self.upload_manager.object_storage_client.put_object(
+                    namespace_name,
+                    bucket_name,
+                    object_name,
+                    data.tobytes(),
+                    content_length=len(data),
+                    content_md5=md5,
+                    opc_meta=kwargs.get("metadata"),
+                )
+            else:
+                part_size = max(
+                    self.part_size or DEFAULT_UPLOAD_PART_SIZE,
+                    -(-len(data) // MAX_UPLOAD_PARTS),
+                )
+                event.parts = -(-len(data) // part_size)
+                response = self.upload_manager.upload_stream(
+                    namespace_name,
+                    bucket_name,
+                    object_name,
+                    io.BytesIO(data),
+                    part_size=part_size,
+                    **kwargs,
+                )
+        logger.debug(response)
+        return True
+
+    def upload_files(
+        self,
+        files: List[Tuple[str, str]],
+        max_workers: int = None,
+        retries: int = None,
+        md5s: Dict[str, str] = None,
+    ):
+        """Uploads model artifacts concurrently using a bounded pool of workers.
+
+        Parameters
+        ----------
+        files: List[Tuple[str, str]]
+            The list of (source file path, destination path) pairs.
+        max_workers: (int, optional). Defaults to `OCI_MLFLOW_UPLOAD_CONCURRENCY` or 8.
+            The maximum number of files uploaded in parallel.
+        retries: (int, optional). Defaults to `OCI_MLFLOW_UPLOAD_RETRIES` or 3.
+            The number of times a failed file upload is retried.
+        md5s: (Dict[str, str], optional). Defaults to None.
+            The base64 encoded MD5 digests already known, by source file path.
+
+        Raises
+        ------
+        ArtifactTransferError
+            If any of the files could not be uploaded.
+        """
+        if not files:
+            return
+        if max_workers is None:
+            max_workers = get_env_int(UPLOAD_CONCURRENCY, DEFAULT_UPLOAD_CONCURRENCY)
+        if retries is None:
+            retries = get_env_int(UPLOAD_RETRIES, DEFAULT_UPLOAD_RETRIES, allow_zero=True)
+
+        md5s = md5s or {}
+        run_parallel(
+            self._upload_with_retry,
+            (
+                (file_path, (file_path, dst_path, retries, md5s.get(file_path)))
+                for file_path, dst_path in files
+            ),
+            max_workers=min(max_workers, len(files)),
+            operation="upload",
+        )
+
+    def _upload_with_retry(self, file_path: str, dst_path: str, retries: int, md5: str = None):
+        """Uploads a single file, retrying transient failures with exponential backoff."""
+        with TransferMetrics.measure("upload", dst_path):
+            return call_with_retry(
+                lambda: self.upload(file_path, dst_path, md5),
+                retries=retries,
+                description=f"upload of {file_path}",
+                reauthenticate=self._reauthenticate,
+            )
+
+
+class ArtifactUploadQueue:
+    """
+    Background queue of artifact uploads, used by the asynchronous artifact logging.
+
+    The local files are snapshotted into a staging directory when they are queued, so the
+    callers are free to modify or remove them right away. At most `max_pending` uploads
+    are queued at a time, further submissions block until an upload completes. The
+    failed uploads are collected and raised by `flush`, which `mlflow.end_run` calls once
+    the process-wide queue exists, see `install_end_run_flush`.
+
+    Attributes
+    ----------
+    max_workers: int
+        The maximum number of artifacts uploaded in parallel.
+    max_pending: int
+        The maximum number of queued uploads.
+    retries: int
+        The number of times a failed upload is retried.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_workers: int = None, max_pending: int = None, retries: int = None):
+        """Initializes `ArtifactUploadQueue` instance.
+
+        Parameters
+        ----------
+        max_workers: (int, optional). Defaults to `OCI_MLFLOW_UPLOAD_CONCURRENCY` or 8.
+            The maximum number of artifacts uploaded in parallel.
+        max_pending: (int, optional). Defaults to `OCI_MLFLOW_ASYNC_UPLOAD_QUEUE_SIZE` or 64.
+            The maximum number of queued uploads.
+        retries: (int, optional). Defaults to `OCI_MLFLOW_UPLOAD_RETRIES` or 3.
+            The number of times a failed upload is retried.
+        """
+        self.max_workers = max_workers or get_env_int(
+            UPLOAD_CONCURRENCY, DEFAULT_UPLOAD_CONCURRENCY
+        )
+        self.max_pending = max_pending or get_env_int(
+            ASYNC_UPLOAD_QUEUE_SIZE, DEFAULT_ASYNC_UPLOAD_QUEUE_SIZE
+        )
+        self.retries = (
+            retries
+            if retries is not None
+            else get_env_int(UPLOAD_RETRIES, DEFAULT_UPLOAD_RETRIES, allow_zero=True)
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="oci-mlflow-upload"
+        )
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._total = 0
+        self._failures = {}
+        self._uploader = None
+        self._staging_dir = tempfile.mkdtemp(prefix="oci-mlflow-uploads-")
+
+    @classmethod
+    def get_instance(cls) -> "ArtifactUploadQueue":
+        """Gets the process-wide upload queue, flushed when a run ends and when the
+        interpreter exits."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                atexit.register(cls._instance._flush_at_exit)
+                install_end_run_flush()
+            return cls._instance
+
+    def _get_uploader(self) -> ArtifactUploader:
+        """Gets the uploader shared by the workers, created on the first upload."""
+        with self._condition:
+            if self._uploader is None:
+                self._uploader = ArtifactUploader()
+            return self._uploader
+
+    def submit_file(self, local_file: str, dst_path: str, callback: Callable[[], None] = None):
+        """Snapshots a local file and queues its upload.
+
+        Parameters
+        ----------
+        local_file: str
+            The source file path.
+        dst_path: str
+            The destination path.
+        callback: (Callable[[], None], optional). Defaults to None.
+            The function called once the upload has completed or failed.
+        """
+        self._slots.acquire()
+        try:
+            snapshot = self._snapshot(lambda dst: shutil.copyfile(local_file, dst))
+        except BaseException:
+            self._slots.release()
+            raise
+        self._submit(
+            local_file,
+            dst_path,
+            lambda uploader: uploader.upload(snapshot, dst_path),
+            cleanup=lambda: os.remove(snapshot),
+            callback=callback,
+        )
+
+    def submit_data(
+        self,
+        data: Union[str, bytes, bytearray, memoryview, BinaryIO],
+        dst_path: str,
+        callback: Callable[[], None] = None,
+    ):
+        """Snapshots in-memory data or the content of a file-like object and queues its upload.
+
+        Parameters
+        ----------
+        data: Union[str, bytes, bytearray, memoryview, BinaryIO]
+            The content to upload. Strings are encoded as UTF-8.
+        dst_path: str
+            The destination path.
+        callback: (Callable[[], None], optional). Defaults to None.
+            The function called once the upload has completed or failed.
+        """
+        self._slots.acquire()
+        try:
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            elif isinstance(data, (bytearray, memoryview)):
+                data = bytes(data)
+            elif not isinstance(data, bytes):
+                stream = data
+
+                def copy_stream(dst: str):
+                    with open(dst, "wb") as dst_file:
+                        shutil.copyfileobj(stream, dst_file, HASH_CHUNK_SIZE)
+
+                snapshot = self._snapshot(copy_stream)
+        except BaseException:
+            self._slots.release()
+            raise
+        if isinstance(data, bytes):
+            self._submit(
+                dst_path,
+                dst_path,
+                lambda uploader: uploader.upload_stream(data, dst_path),
+                callback=callback,
+            )
+        else:
+            self._submit(
+                dst_path,
+                dst_path,
+                lambda uploader: uploader.upload(snapshot, dst_path),
+                cleanup=lambda: os.remove(snapshot),
+                callback=callback,
+            )
+
+    def _snapshot(self, copy: Callable[[str], None]) -> str:
+        """Copies the content to upload into a new file of the staging directory."""
+        fd, snapshot = tempfile.mkstemp(dir=self._staging_dir)
+        os.close(fd)
+        try:
+            copy(snapshot)
+        except BaseException:
+            os.remove(snapshot)
+            raise
+        return snapshot
+
+    def _submit(
+        self,
+        source: str,
+        dst_path: str,
+        upload: Callable[[ArtifactUploader], Any],
+        cleanup: Callable[[], None] = None,
+        callback: Callable[[], None] = None,
+    ):
+        """Queues an upload, the caller must hold one of the queue slots."""
+        with self._condition:
+            self._pending += 1
+            self._total += 1
+        try:
+            self._executor.submit(self._run, source, dst_path, upload, cleanup, callback)
+        except BaseException:
+            self._finish()
+            if cleanup:
+                cleanup()
+            raise
+
+    def _run(
+        self,
+        source: str,
+        dst_path: str,
+        upload: Callable[[ArtifactUploader], Any],
+        cleanup: Callable[[], None] = None,
+        callback: Callable[[], None] = None,
+    ):
+        """Uploads a queued artifact, recording the failure if it does not succeed."""
+        try:
+            uploader = self._get_uploader()
+            with TransferMetrics.measure("upload", dst_path):
+                call_with_retry(
+                    lambda: upload(uploader),
+                    retries=self.retries,
+                    description=f"upload of {source}",
+                    reauthenticate=uploader._reauthenticate,
+                )
+        except Exception as ex:
+            logger.debug(f"Failed to upload {source}: {ex}")
+            with self._condition:
+                self._failures[source] = ex
+        finally:
+            try:
+                if cleanup:
+                    cleanup()
+                if callback:
+                    callback()
+            finally:
+                self._finish()
+
+    def _finish(self):
+        """Releases the queue slot of a completed upload."""
+        self._slots.release()
+        with self._condition:
+            self._pending -= 1
+            self._condition.notify_all()
+
+    @property
+    def pending(self) -> int:
+        """The number of queued uploads that have not completed yet."""
+        with self._condition:
+            return self._pending
+
+    def wait(self, timeout: float = None) -> bool:
+        """Waits until all queued uploads have completed, without raising their failures.
+
+        Parameters
+        ----------
+        timeout: (float, optional). Defaults to None.
+            The maximum number of seconds to wait. Waits indefinitely by default.
+
+        Returns
+        -------
+        bool
+            False if the uploads did not complete within the timeout, True otherwise.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending == 0, timeout)
+
+    def flush(self, timeout: float = None):
+        """Waits until all queued uploads have completed.
+
+        Parameters
+        ----------
+        timeout: (float, optional). Defaults to None.
+            The maximum number of seconds to wait. Waits indefinitely by default.
+
+        Raises
+        ------
+        TimeoutError
+            If the uploads did not complete within the timeout.
+        ArtifactTransferError
+            If any of the uploads queued since the previous flush failed.
+        """
+        with self._condition:
+            if not self.wait(timeout):
+                raise TimeoutError(
+                    f"{self._pending} artifact upload(s) did not complete in {timeout}s."
+                )
+            failures, total = self._failures, self._total
+            self._failures = {}
+            self._total = 0
+        if failures:
+            raise ArtifactTransferError("upload", failures, total)
+
+    def _flush_at_exit(self):
+        """Completes the queued uploads before the interpreter exits."""
+        try:
+            self.flush()
+        except ArtifactTransferError as ex:
+            logger.error(str(ex))
+        finally:
+            self._executor.shutdown(wait=True)
+            shutil.rmtree(self._staging_dir, ignore_errors=True)
+
+
+def wait_for_artifact_uploads(timeout: float = None):
+    """Waits until the artifacts logged asynchronously have been uploaded.
+
+    `mlflow.end_run()` calls it once artifacts were logged asynchronously, see
+    `install_end_run_flush`. Call it to make sure that the artifacts are complete
+    before a run ends, e.g. before reading them back.
+
+    Parameters
+    ----------
+    timeout: (float, optional). Defaults to None.
+        The maximum number of seconds to wait. Waits indefinitely by default.
+
+    Raises
+    ------
+    TimeoutError
+        If the uploads did not complete within the timeout.
+    ArtifactTransferError
+        If any of the uploads queued since the previous call failed.
+    """
+    if ArtifactUploadQueue._instance is not None:
+        ArtifactUploadQueue._instance.flush(timeout)
+
+
+def install_end_run_flush():
+    """
+    Makes `mlflow.end_run` wait for the artifacts logged asynchronously, so a run cannot
+    end successfully with missing artifacts.
+
+    Both `mlflow.end_run` and `mlflow.tracking.fluent.end_run` are wrapped, since the
+    `with mlflow.start_run()` blocks end the run through the latter. When an upload failed,
+    a run ending successfully is marked as failed and the `ArtifactTransferError` is
+    raised, while the failure of a run already ending as failed or killed is only logged.
+    The function is wrapped once, so it may be called any number of times.
+    """
+    import mlflow
+    from mlflow.entities import RunStatus
+    from mlflow.tracking import fluent
+
+    finished = RunStatus.to_string(RunStatus.FINISHED)
+    with _end_run_lock:
+        end_run = fluent.end_run
+        if getattr(end_run, "_oci_mlflow_flush", False):
+            return
+
+        @functools.wraps(end_run)
+        def end_run_after_uploads(status: str = finished):
+            try:
+                wait_for_artifact_uploads()
+            except ArtifactTransferError as ex:
+                if status != finished:
+                    logger.error(str(ex))
+                else:
+                    end_run(RunStatus.to_string(RunStatus.FAILED))
+                    raise
+            return end_run(status)
+
+        end_run_after_uploads._oci_mlflow_flush = True
+        fluent.end_run = end_run_after_uploads
+        if getattr(mlflow, "end_run", None) is end_run:
+            mlflow.end_run = end_run_after_uploads
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*--
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, List, Union
+
+from mlflow.entities import FileInfo
+
+from oci_mlflow.artifact_index import DeleteSummary
+from oci_mlflow.artifact_upload import (
+    DEFAULT_UPLOAD_RETRIES,
+    UPLOAD_RETRIES,
+    ArtifactUploader,
+)
+from oci_mlflow.env import get_env_bool, get_env_int
+from oci_mlflow.object_storage_utils import ArtifactTransferError
+from oci_mlflow.oci_object_storage import SYNC_ARTIFACTS, OCIObjectStorageArtifactRepository
+
+ASYNC_MAX_WORKERS = "OCI_MLFLOW_ASYNC_MAX_WORKERS"
+ASYNC_MAX_CONCURRENCY = "OCI_MLFLOW_ASYNC_MAX_CONCURRENCY"
+DEFAULT_ASYNC_MAX_WORKERS = 32
+
+
+class AsyncOCIObjectStorageArtifactRepository:
+    """
+    Asyncio interface of the OCI Object Storage artifact repository.
+
+    The OCI SDK has no asyncio transport, so the operations run on a bounded thread pool
+    shared by all the repositories of the process, reusing the pooled Object Storage
+    clients and the cached filesystems of `OCIObjectStorageArtifactRepository`. Any number
+    of operations can be awaited on one event loop, while at most `max_concurrency` of
+    them are queued on the pool and `OCI_MLFLOW_ASYNC_MAX_WORKERS` run at a time. The files
+    of a directory are uploaded by operations of their own, so they share the same bounds.
+
+    Attributes
+    ----------
+    artifact_uri: str
+        The artifact location URI.
+    repository: OCIObjectStorageArtifactRepository
+        The synchronous repository performing the operations.
+    max_concurrency: int
+        The maximum number of operations queued on the thread pool by this repository,
+        per event loop.
+    """
+
+    _executor_lock = threading.Lock()
+    _executor = None
+
+    def __init__(self, artifact_uri: str, max_concurrency: int = None):
+        """Initializes `AsyncOCIObjectStorageArtifactRepository` instance.
+
+        Parameters
+        ----------
+        artifact_uri: str
+            The artifact location URI, e.g. oci://<bucket>@<namespace>/<path>.
+        max_concurrency: (int, optional). Defaults to `OCI_MLFLOW_ASYNC_MAX_CONCURRENCY`, or
+            the number of threads of the pool, `OCI_MLFLOW_ASYNC_MAX_WORKERS` or 32.
+            The maximum number of operations queued on the thread pool by this repository.
+        """
+        self.artifact_uri = artifact_uri
+        self.repository = OCIObjectStorageArtifactRepository(artifact_uri)
+        self.max_concurrency = max_concurrency or get_env_int(
+            ASYNC_MAX_CONCURRENCY, get_env_int(ASYNC_MAX_WORKERS, DEFAULT_ASYNC_MAX_WORKERS)
+        )
+        # The semaphores are bound to the loop they are first used on, one per loop.
+        self._semaphores_lock = threading.Lock()
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """Gets the thread pool shared by all the asynchronous repositories."""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=get_env_int(ASYNC_MAX_WORKERS, DEFAULT_ASYNC_MAX_WORKERS),
+                    thread_name_prefix="oci-mlflow-async",
+                )
+            return cls._executor
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """Runs a synchronous repository operation on the shared thread pool."""
+        loop = asyncio.get_running_loop()
+        with self._semaphores_lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        async with semaphore:
+            return await loop.run_in_executor(
+                self._get_executor(), functools.partial(func, *args, **kwargs)
+            )
+
+    async def log_artifact(self, local_file: str, artifact_path: str = None):
+        """
+        Logs a local file as an artifact, optionally taking an ``artifact_path`` to place it in
+        within the run's artifacts.
+
+        Parameters
+        ----------
+        local_file:str
+            Path to artifact to log.
+        artifact_path:str
+            Directory within the run's artifact directory in which to log the artifact.
+        """
+        await self._run(self.repository.log_artifact, local_file, artifact_path)
+
+    async def log_artifacts(self, local_dir: str, artifact_path: str = None):
+        """
+        Logs the files in the specified local directory as artifacts, optionally taking
+        an ``artifact_path`` to place them in within the run's artifacts. Each file is
+        uploaded by an operation of the shared thread pool, rather than by a thread pool
+        of its own. The synchronized, archived and queued directories are logged by the
+        repository in a single operation.
+
+        Parameters
+        ----------
+        local_dir:str
+            Directory of local artifacts to log.
+        artifact_path:str
+            Directory within the run's artifact directory in which to log the artifacts.
+
+        Raises
+        ------
+        ArtifactTransferError
+            If any of the files could not be uploaded.
+        """
+        repository = self.repository
+        if get_env_bool(SYNC_ARTIFACTS) or repository._is_async():
+            await self._run(repository.log_artifacts, local_dir, artifact_path)
+            return
+        dest_path, files = await self._run(
+            repository._local_artifact_files, local_dir, artifact_path
+        )
+        if repository._is_archived(files):
+            await self._run(repository.log_artifacts_archive, local_dir, artifact_path)
+            return
+        if not files:
+            return
+        retries = get_env_int(UPLOAD_RETRIES, DEFAULT_UPLOAD_RETRIES, allow_zero=True)
+        try:
+            uploader = await self._run(ArtifactUploader)
+            results = await asyncio.gather(
+                *(
+                    self._run(uploader._upload_with_retry, local_file, file_dest_path, retries)
+                    for local_file, file_dest_path in files
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            repository._invalidate_index(dest_path)
+        failures = {
+            local_file: result
+            for (local_file, _), result in zip(files, results)
+            if isinstance(result, Exception)
+        }
+        if failures:
+            raise ArtifactTransferError("upload", failures, len(files))
+
+    async def log_artifact_data(
+        self, data: Union[str, bytes, bytearray, memoryview, BinaryIO], artifact_file: str
+    ):
+        """
+        Logs in-memory data or the content of a file-like object as an artifact.
+
+        Parameters
+        ----------
+        data: Union[str, bytes, bytearray, memoryview, BinaryIO]
+            The artifact content. Strings are encoded as UTF-8.
+        artifact_file: str
+            The run-relative artifact file path in posixpath format, e.g. "dir/file.json".
+        """
+        await self._run(self.repository.log_artifact_data, data, artifact_file)
+
+    async def list_artifacts(self, path: str = "") -> List[FileInfo]:
+        """
+        Return all the artifacts for this run_id directly under path.
+
+        Parameters
+        ----------
+        path:str
+            Relative source path that contains desired artifacts
+
+        Returns
+        -------
+        List[FileInfo]
+            List of artifacts as FileInfo listed directly under path.
+        """
+        return await self._run(self.repository.list_artifacts, path)
+
+    async def download_artifacts(self, artifact_path: str, dst_path: str = None) -> str:
+        """
+        Download an artifact file or directory to a local directory.
+
+        Parameters
+        ----------
+        artifact_path: str
+            Relative source path to the desired artifacts.
+        dst_path: (str, optional). Defaults to None.
+            Absolute path of the local filesystem destination directory. A new
+            uniquely-named directory is created if unspecified.
+
+        Returns
+        -------
+        str
+            Absolute path of the local filesystem location containing the desired artifacts.
+        """
+        return await self._run(self.repository.download_artifacts, artifact_path, dst_path)
+
+    async def delete_artifacts(self, artifact_path: str = None) -> DeleteSummary:
+        """
+        Delete the artifacts at the specified location.
+
+        Parameters
+        ----------
+        artifact_path: (str, optional). Defaults to None.
+            Path of the artifact to delete. The whole artifact directory is deleted if not provided.
+
+        Returns
+        -------
+        DeleteSummary
+            The number of objects and bytes found and deleted.
+        """
+        return await self._run(self.repository.bulk_delete_artifacts, artifact_path)
@@ -4,14 +4,29 @@
 # Copyright (c) 2023 Oracle and/or its affiliates.
 # Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
 
+from typing import Dict
+
 from ads.common.auth import default_signer
 from mlflow.tracking.request_auth.abstract_request_auth_provider import RequestAuthProvider
 
+from oci_mlflow.env import get_env_bool
+from oci_mlflow.http_session import HTTP_POOLING, install_session_pool
+from oci_mlflow.signer_cache import SignerCache, auth_settings
+
 OCI_REQUEST_AUTH = "OCI_REQUEST_AUTH"
 
 
 class OCIMLFlowAuthRequestProvider(RequestAuthProvider):
-    
+
+    def __init__(self):
+        """
+        Initializes the request auth provider, installing the pooled HTTP sessions of the
+        tracking requests when `OCI_MLFLOW_HTTP_POOLING` is set.
+        """
+        super().__init__()
+        if get_env_bool(HTTP_POOLING):
+            install_session_pool()
+
     def get_name(self):
         """
         Get the name of the request auth provider.
@@ -24,6 +39,22 @@ class OCIMLFlowAuthRequestProvider(RequestAuthProvider):
         """
         Generate oci signer based on oci environment variable.
 
+        The signer is cached per auth type and profile, and its security token is renewed
+        in the background before it expires, see `oci_mlflow.signer_cache.SignerCache`.
+
         :return: OCI MLFlow signer
         """
-        return default_signer()["signer"]
+        return SignerCache.get(self._cache_key(), lambda: default_signer())["signer"]
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the signer cache counters of the request auth provider.
+
+        :return: dict of the cache hits, misses, token refreshes and failed refreshes
+        """
+        return SignerCache.stats(self._cache_key())
+
+    @staticmethod
+    def _cache_key():
+        """Get the signer cache key of the current auth settings."""
+        return (OCI_REQUEST_AUTH, *auth_settings())
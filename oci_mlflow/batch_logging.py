@@ -0,0 +1,350 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+"""
+Client-side buffering of the run metrics, params and tags.
+
+Every `mlflow.log_metric` call is a separate, signed request to the tracking server.
+`BatchLogger` buffers the logged values and sends them with `log-batch` requests, when
+enough values are buffered or every `OCI_MLFLOW_BATCH_FLUSH_INTERVAL` seconds, from a
+background thread. The values of a failed batch are put back in the buffers and sent
+again by the next flush, up to `OCI_MLFLOW_BATCH_RETRIES` times. The buffered values are
+flushed when the logger is closed and when the interpreter exits.
+"""
+
+import atexit
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
+from mlflow.utils.validation import (
+    MAX_ENTITIES_PER_BATCH,
+    MAX_METRICS_PER_BATCH,
+    MAX_PARAMS_TAGS_PER_BATCH,
+)
+
+from oci_mlflow import logger
+from oci_mlflow.env import get_env_float, get_env_int
+
+BATCH_SIZE = "OCI_MLFLOW_BATCH_SIZE"
+BATCH_FLUSH_INTERVAL = "OCI_MLFLOW_BATCH_FLUSH_INTERVAL"
+BATCH_RETRIES = "OCI_MLFLOW_BATCH_RETRIES"
+DEFAULT_BATCH_FLUSH_INTERVAL = 5.0
+DEFAULT_BATCH_RETRIES = 3
+
+# The open loggers, flushed at exit.
+_loggers = set()
+
+
+def _split_batches(
+    metrics: List[Metric], params: List[Param], tags: List[RunTag]
+) -> Iterator[Tuple[List[Metric], List[Param], List[RunTag]]]:
+    """
+    Splits the logged values into batches within the limits of the `log-batch` request.
+
+    Parameters
+    ----------
+    metrics: List[Metric]
+        The metrics, in the order they were logged.
+    params: List[Param]
+        The params.
+    tags: List[RunTag]
+        The tags.
+
+    Yields
+    ------
+    Tuple[List[Metric], List[Param], List[RunTag]]
+        The metrics, params and tags of a batch.
+    """
+    params_tags = [(True, param) for param in params] + [(False, tag) for tag in tags]
+    while metrics or params_tags:
+        chunk, params_tags = (
+            params_tags[:MAX_PARAMS_TAGS_PER_BATCH],
+            params_tags[MAX_PARAMS_TAGS_PER_BATCH:],
+        )
+        count = min(MAX_METRICS_PER_BATCH, MAX_ENTITIES_PER_BATCH - len(chunk))
+        batch_metrics, metrics = metrics[:count], metrics[count:]
+        yield (
+            batch_metrics,
+            [entity for is_param, entity in chunk if is_param],
+            [entity for is_param, entity in chunk if not is_param],
+        )
+
+
+class BatchLogger:
+    """
+    Buffers the metrics, params and tags of a run and logs them in batches.
+
+    Attributes
+    ----------
+    run_id: str
+        The ID of the run the values are logged to.
+    batch_size: int
+        The number of buffered values triggering a flush.
+    flush_interval: float
+        The maximum number of seconds a value stays buffered.
+    retries: int
+        The number of times a failed batch is sent again before its values are dropped.
+
+    Examples
+    --------
+    >>> with mlflow.start_run(), BatchLogger() as batch_logger:
+    ...     for step in range(100000):
+    ...         batch_logger.log_metric("loss", compute_loss(), step=step)
+    """
+
+    def __init__(
+        self,
+        run_id: str = None,
+        client: MlflowClient = None,
+        batch_size: int = None,
+        flush_interval: float = None,
+        retries: int = None,
+    ):
+        """Initializes `BatchLogger` instance.
+
+        Parameters
+        ----------
+        run_id: (str, optional). Defaults to the active run.
+            The ID of the run to log the values to.
+        client: (MlflowClient, optional). Defaults to a new `MlflowClient`.
+            The client sending the batches to the tracking server.
+        batch_size: (int, optional). Defaults to `OCI_MLFLOW_BATCH_SIZE` or 1000.
+            The number of buffered values triggering a flush.
+        flush_interval: (float, optional). Defaults to `OCI_MLFLOW_BATCH_FLUSH_INTERVAL` or 5.
+            The maximum number of seconds a value stays buffered.
+        retries: (int, optional). Defaults to `OCI_MLFLOW_BATCH_RETRIES` or 3.
+            The number of times a failed batch is sent again before its values are dropped.
+
+        Raises
+        ------
+        ValueError
+            If no run ID is given and there is no active run.
+        """
+        if run_id is None:
+            import mlflow
+
+            active_run = mlflow.active_run()
+            if active_run is None:
+                raise ValueError("The `run_id` is required when there is no active run.")
+            run_id = active_run.info.run_id
+        self.run_id = run_id
+        self.client = client or MlflowClient()
+        self.batch_size = batch_size or get_env_int(BATCH_SIZE, MAX_METRICS_PER_BATCH)
+        self.flush_interval = flush_interval or get_env_float(
+            BATCH_FLUSH_INTERVAL, DEFAULT_BATCH_FLUSH_INTERVAL
+        )
+        self.retries = (
+            retries
+            if retries is not None
+            else get_env_int(BATCH_RETRIES, DEFAULT_BATCH_RETRIES, allow_zero=True)
+        )
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_requested = threading.Condition(self._lock)
+        self._metrics: List[Metric] = []
+        # The params and tags are keyed by name, the last logged value wins.
+        self._params: Dict[str, Param] = {}
+        self._tags: Dict[str, RunTag] = {}
+        self._error: Optional[Exception] = None
+        # The number of times in a row the first unsent batch failed, guarded by `_flush_lock`.
+        self._attempts = 0
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="oci-mlflow-batch-logger", daemon=True
+        )
+        self._thread.start()
+        _loggers.add(self)
+
+    def __enter__(self) -> "BatchLogger":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """The number of buffered values."""
+        with self._lock:
+            return self._count()
+
+    def log_metric(self, key: str, value: float, step: int = None, timestamp: int = None):
+        """
+        Buffers a metric value.
+
+        Parameters
+        ----------
+        key: str
+            The metric name.
+        value: float
+            The metric value.
+        step: (int, optional). Defaults to 0.
+            The training step of the value.
+        timestamp: (int, optional). Defaults to the current time.
+            The time of the value in milliseconds since the epoch.
+        """
+        metric = Metric(
+            key, float(value), timestamp or int(time.time() * 1000), step or 0
+        )
+        self._add(lambda: self._metrics.append(metric))
+
+    def log_metrics(self, metrics: Dict[str, float], step: int = None):
+        """Buffers metric values logged at the same time, see `log_metric`."""
+        timestamp = int(time.time() * 1000)
+        entities = [
+            Metric(key, float(value), timestamp, step or 0) for key, value in metrics.items()
+        ]
+        self._add(lambda: self._metrics.extend(entities))
+
+    def log_param(self, key: str, value: Any):
+        """Buffers a param, converted to a string."""
+        self.log_params({key: value})
+
+    def log_params(self, params: Dict[str, Any]):
+        """Buffers params, converted to strings."""
+        entities = {key: Param(key, str(value)) for key, value in params.items()}
+        self._add(lambda: self._params.update(entities))
+
+    def set_tag(self, key: str, value: Any):
+        """Buffers a tag, converted to a string."""
+        self.set_tags({key: value})
+
+    def set_tags(self, tags: Dict[str, Any]):
+        """Buffers tags, converted to strings."""
+        entities = {key: RunTag(key, str(value)) for key, value in tags.items()}
+        self._add(lambda: self._tags.update(entities))
+
+    def flush(self):
+        """
+        Logs the buffered values.
+
+        Raises
+        ------
+        MlflowException
+            If a batch could not be logged, or was dropped by an earlier background flush.
+            The values of a batch that was not dropped stay buffered for the next flush.
+        """
+        error = self._flush()
+        with self._lock:
+            dropped, self._error = self._error, None
+        if dropped is not None or error is not None:
+            raise dropped or error
+
+    def close(self):
+        """
+        Stops the background flushes and logs the buffered values, sending the failed
+        batches again until they are logged or dropped.
+        """
+        with self._lock:
+            self._closed = True
+            self._flush_requested.notify()
+        self._thread.join()
+        _loggers.discard(self)
+        while self._flush() is not None:
+            pass
+        self.flush()
+
+    def _add(self, update):
+        """Applies an update of the buffers, requesting a flush once the batch size is reached."""
+        with self._lock:
+            if self._closed:
+                raise ValueError("The batch logger is closed.")
+            update()
+            if self._count() >= self.batch_size:
+                self._flush_requested.notify()
+
+    def _count(self) -> int:
+        """Counts the buffered values, the caller must hold the lock."""
+        return len(self._metrics) + len(self._params) + len(self._tags)
+
+    def _flush(self) -> Optional[Exception]:
+        """
+        Logs the buffered values in batches, in the order they were logged.
+
+        A failed batch and the following ones are put back at the front of the buffers,
+        to be sent by the next flush. Once a batch failed more than `retries` times in a
+        row, its values are dropped and the error is kept for `flush` to raise.
+
+        Returns
+        -------
+        Optional[Exception]
+            The error of the batch put back in the buffers, None if all were sent or dropped.
+        """
+        with self._flush_lock:
+            with self._lock:
+                metrics, self._metrics = self._metrics, []
+                params, self._params = list(self._params.values()), {}
+                tags, self._tags = list(self._tags.values()), {}
+            batches = list(_split_batches(metrics, params, tags))
+            for index, (batch_metrics, batch_params, batch_tags) in enumerate(batches):
+                try:
+                    self.client.log_batch(
+                        self.run_id, metrics=batch_metrics, params=batch_params, tags=batch_tags
+                    )
+                except Exception as ex:
+                    self._attempts += 1
+                    description = (
+                        f"a batch of {len(batch_metrics)} metric(s), {len(batch_params)} "
+                        f"param(s) and {len(batch_tags)} tag(s) to the run {self.run_id}"
+                    )
+                    if self._attempts <= self.retries:
+                        logger.warning(f"Failed to log {description}, will retry: {ex}")
+                        self._requeue(batches[index:])
+                        return ex
+                    logger.warning(
+                        f"Failed to log {description} {self._attempts} times, "
+                        f"the values are dropped: {ex}"
+                    )
+                    with self._lock:
+                        self._error = ex
+                self._attempts = 0
+            return None
+
+    def _requeue(self, batches: List[Tuple[List[Metric], List[Param], List[RunTag]]]):
+        """
+        Puts unsent batches back at the front of the buffers. The params and tags logged
+        since they were taken keep their newer values.
+        """
+        with self._lock:
+            self._metrics = [metric for batch in batches for metric in batch[0]] + self._metrics
+            params = {param.key: param for batch in batches for param in batch[1]}
+            params.update(self._params)
+            self._params = params
+            tags = {tag.key: tag for batch in batches for tag in batch[2]}
+            tags.update(self._tags)
+            self._tags = tags
+
+    def _run(self):
+        """
+        Flushes the buffers every flush interval, or earlier once the batch size is reached.
+        The batch size is checked on every wake-up, so the values added during a flush are
+        not left waiting for the interval. Failed batches are sent again after the interval.
+        """
+        failed = False
+        while True:
+            with self._lock:
+                self._flush_requested.wait_for(
+                    lambda: self._closed or (not failed and self._count() >= self.batch_size),
+                    self.flush_interval,
+                )
+                if self._closed:
+                    # The remaining values are flushed by `close`.
+                    return
+            failed = self._flush() is not None
+
+
+def _flush_at_exit():
+    """Logs the values buffered by the open loggers before the interpreter exits."""
+    for batch_logger in list(_loggers):
+        try:
+            batch_logger.close()
+        except Exception as ex:
+            logger.error(str(ex))
+
+
+atexit.register(_flush_at_exit)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+"""
+Readers of the `OCI_MLFLOW_*` settings from the environment.
+
+Unset or empty variables fall back to the defaults. Malformed values, and negative or
+(unless allowed) zero numbers, raise a `ValueError` naming the variable, so a mistyped
+setting is reported instead of silently replaced by the default.
+"""
+
+import os
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off")
+
+
+def get_env_int(name: str, default: int, allow_zero: bool = False) -> int:
+    """
+    Reads an integer setting from the environment.
+
+    Parameters
+    ----------
+    name: str
+        The environment variable name.
+    default: int
+        The value used when the variable is not set.
+    allow_zero: (bool, optional). Defaults to False.
+        Whether zero is a valid value, e.g. for retry counts and TTLs.
+
+    Returns
+    -------
+    int
+        The setting value.
+
+    Raises
+    ------
+    ValueError
+        If the value is not an integer, is negative, or is zero and zero is not allowed.
+    """
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError as ex:
+        raise ValueError(f"The `{name}` must be an integer, got `{value}`.") from ex
+    _check_range(name, number, allow_zero)
+    return number
+
+
+def get_env_float(name: str, default: float, allow_zero: bool = False) -> float:
+    """
+    Reads a numeric setting, e.g. a number of seconds, from the environment.
+
+    Parameters
+    ----------
+    name: str
+        The environment variable name.
+    default: float
+        The value used when the variable is not set.
+    allow_zero: (bool, optional). Defaults to False.
+        Whether zero is a valid value.
+
+    Returns
+    -------
+    float
+        The setting value.
+
+    Raises
+    ------
+    ValueError
+        If the value is not a finite number, is negative, or is zero and zero is not allowed.
+    """
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        number = float(value)
+    except ValueError as ex:
+        raise ValueError(f"The `{name}` must be a number, got `{value}`.") from ex
+    if number != number or number in (float("inf"), float("-inf")):
+        raise ValueError(f"The `{name}` must be a number, got `{value}`.")
+    _check_range(name, number, allow_zero)
+    return number
+
+
+def get_env_bool(name: str, default: bool = False) -> bool:
+    """
+    Reads a boolean flag from the environment.
+
+    Parameters
+    ----------
+    name: str
+        The environment variable name.
+    default: (bool, optional). Defaults to False.
+        The value used when the variable is not set.
+
+    Returns
+    -------
+    bool
+        True for "1", "true", "yes" or "on", False for "0", "false", "no" or "off",
+        case insensitive.
+
+    Raises
+    ------
+    ValueError
+        If the value is not one of the above.
+    """
+    value = os.environ.get(name, "").strip().lower()
+    if not value:
+        return default
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(
+        f"The `{name}` must be one of {', '.join(TRUE_VALUES + FALSE_VALUES)}, got `{value}`."
+    )
+
+
+def _check_range(name: str, number: float, allow_zero: bool):
+    """Rejects the negative numbers, and zero unless it is allowed."""
+    if number < 0 or (number == 0 and not allow_zero):
+        qualifier = "non-negative" if allow_zero else "positive"
+        raise ValueError(f"The `{name}` must be {qualifier}, got `{number}`.")
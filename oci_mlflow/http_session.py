@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+"""
+Pooled, keep-alive HTTP sessions for the requests to the tracking server.
+
+MLflow sends the tracking requests through a `requests.Session` with the default pool of
+10 connections per host. When more threads log concurrently, the extra connections are
+closed after every request, and each new one pays a TCP and TLS handshake with the API
+Gateway. `install_session_pool` makes MLflow use larger pools, and turns on TCP
+keep-alive so idle connections are not dropped by the network between requests.
+Setting `OCI_MLFLOW_HTTP_POOLING` installs the pools when the OCI request auth provider
+is created.
+"""
+
+import functools
+import inspect
+import socket
+import threading
+from typing import Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from oci_mlflow import logger
+from oci_mlflow.env import get_env_int
+
+HTTP_POOLING = "OCI_MLFLOW_HTTP_POOLING"
+HTTP_POOL_SIZE = "OCI_MLFLOW_HTTP_POOL_SIZE"
+DEFAULT_HTTP_POOL_SIZE = 32
+KEEPALIVE_IDLE_SECONDS = 60
+KEEPALIVE_INTERVAL_SECONDS = 15
+# The cached session factory of `mlflow.utils.request_utils`, and the MLflow versions
+# it is known to be safe to wrap in.
+SESSION_FACTORY = "_cached_get_request_session"
+MIN_MLFLOW_VERSION = "2.8.0"
+
+_lock = threading.Lock()
+_installed: Optional[Callable] = None
+
+
+def keepalive_socket_options() -> list:
+    """Gets the socket options enabling TCP keep-alive, on top of the urllib3 defaults."""
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # The probe timings are not configurable on every platform.
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE_SECONDS))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, KEEPALIVE_INTERVAL_SECONDS))
+    return options
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTP adapter keeping a larger pool of keep-alive connections per host."""
+
+    def __init__(self, pool_size: int = None, **kwargs):
+        """Initializes `PooledHTTPAdapter` instance.
+
+        Parameters
+        ----------
+        pool_size: (int, optional). Defaults to `OCI_MLFLOW_HTTP_POOL_SIZE` or 32.
+            The maximum number of connections kept open per host.
+        kwargs:
+            The additional arguments passed to the `HTTPAdapter`, e.g. `max_retries`.
+        """
+        pool_size = pool_size or get_env_int(HTTP_POOL_SIZE, DEFAULT_HTTP_POOL_SIZE)
+        kwargs.setdefault("pool_connections", pool_size)
+        kwargs.setdefault("pool_maxsize", pool_size)
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", keepalive_socket_options())
+        super().init_poolmanager(*args, **kwargs)
+
+
+def mount_pooled_adapters(session: requests.Session, pool_size: int = None) -> requests.Session:
+    """
+    Replaces the adapters of a session with pooled, keep-alive ones, keeping their retry policy.
+
+    Parameters
+    ----------
+    session: requests.Session
+        The session to tune.
+    pool_size: (int, optional). Defaults to `OCI_MLFLOW_HTTP_POOL_SIZE` or 32.
+        The maximum number of connections kept open per host.
+
+    Returns
+    -------
+    requests.Session
+        The tuned session.
+    """
+    for prefix in ("https://", "http://"):
+        adapter = session.adapters.get(prefix)
+        if isinstance(adapter, PooledHTTPAdapter):
+            continue
+        max_retries = adapter.max_retries if adapter is not None else 0
+        session.mount(prefix, PooledHTTPAdapter(pool_size, max_retries=max_retries))
+    return session
+
+
+def create_session(pool_size: int = None, max_retries=0) -> requests.Session:
+    """
+    Creates a session with pooled, keep-alive connections.
+
+    Parameters
+    ----------
+    pool_size: (int, optional). Defaults to `OCI_MLFLOW_HTTP_POOL_SIZE` or 32.
+        The maximum number of connections kept open per host.
+    max_retries: (int or urllib3.util.Retry, optional). Defaults to 0.
+        The retry policy of the connections.
+
+    Returns
+    -------
+    requests.Session
+        The session.
+    """
+    session = requests.Session()
+    adapter = PooledHTTPAdapter(pool_size, max_retries=max_retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _get_mlflow_session_module():
+    """Gets the MLflow module creating the sessions of the tracking requests."""
+    try:
+        from mlflow.utils import request_utils
+    except ImportError:
+        return None
+    return request_utils
+
+
+def _check_session_factory(module) -> Optional[str]:
+    """
+    Checks that the MLflow session factory can be wrapped.
+
+    Returns
+    -------
+    Optional[str]
+        The reason it cannot be wrapped, None if it can.
+    """
+    import mlflow
+    from packaging.version import InvalidVersion, Version
+
+    try:
+        if Version(mlflow.__version__) < Version(MIN_MLFLOW_VERSION):
+            return f"MLflow {mlflow.__version__} is older than {MIN_MLFLOW_VERSION}"
+    except (AttributeError, InvalidVersion):
+        return "the MLflow version is unknown"
+    factory = getattr(module, SESSION_FACTORY, None)
+    if not callable(factory):
+        return f"MLflow has no `{SESSION_FACTORY}` function"
+    if not callable(getattr(factory, "cache_clear", None)):
+        return "the MLflow sessions are not cached"
+    try:
+        parameters = list(inspect.signature(factory).parameters)
+    except (TypeError, ValueError):
+        parameters = []
+    if parameters[:1] != ["max_retries"]:
+        return f"`{SESSION_FACTORY}` has an unexpected signature"
+    return None
+
+
+def install_session_pool(pool_size: int = None) -> bool:
+    """
+    Makes MLflow send the tracking requests through pooled, keep-alive connections.
+
+    MLflow caches one session per retry policy and process in
+    `mlflow.utils.request_utils._cached_get_request_session`. The adapters of each
+    session are replaced the first time it is returned, keeping its retry policy.
+    The factory is only wrapped if it is the cached function of the supported MLflow
+    versions, and once, so the function may be called any number of times.
+
+    Parameters
+    ----------
+    pool_size: (int, optional). Defaults to `OCI_MLFLOW_HTTP_POOL_SIZE` or 32.
+        The maximum number of connections kept open per host.
+        Size it to the number of threads logging concurrently.
+
+    Returns
+    -------
+    bool
+        True if the pools are installed, False if this MLflow version
+        does not allow it.
+    """
+    global _installed
+    with _lock:
+        if _installed is not None:
+            return True
+        module = _get_mlflow_session_module()
+        installed = getattr(module, SESSION_FACTORY, None)
+        if getattr(installed, "_oci_mlflow_pooled", False):
+            # Installed by an earlier import of this module, e.g. after a reload.
+            _installed = installed.__wrapped__
+            return True
+        reason = (
+            "MLflow has no `mlflow.utils.request_utils` module"
+            if module is None
+            else _check_session_factory(module)
+        )
+        if reason:
+            logger.warning(f"Pooled HTTP sessions are not installed, {reason}.")
+            return False
+        get_request_session = getattr(module, SESSION_FACTORY)
+
+        @functools.wraps(get_request_session)
+        def get_pooled_request_session(*args, **kwargs) -> requests.Session:
+            return mount_pooled_adapters(get_request_session(*args, **kwargs), pool_size)
+
+        get_pooled_request_session.cache_clear = get_request_session.cache_clear
+        get_pooled_request_session._oci_mlflow_pooled = True
+        setattr(module, SESSION_FACTORY, get_pooled_request_session)
+        _installed = get_request_session
+        return True
+
+
+def uninstall_session_pool():
+    """Restores the MLflow sessions replaced by `install_session_pool`."""
+    global _installed
+    with _lock:
+        if _installed is None:
+            return
+        setattr(_get_mlflow_session_module(), SESSION_FACTORY, _installed)
+        _installed = None
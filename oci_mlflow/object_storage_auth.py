@@ -0,0 +1,392 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+"""
+Signers and pooled clients used to reach Object Storage.
+
+The signers are cached per auth settings, or per delegation token path in Data Flow, and
+the Object Storage clients are shared by every caller acting for the same principal. Both
+are recreated when the delegation token file is rotated.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ads.common import auth
+from ads.common.oci_client import OCIClientFactory
+from oci import object_storage
+from oci.auth.signers import InstancePrincipalsDelegationTokenSigner
+
+from oci_mlflow import logger
+from oci_mlflow.env import get_env_float
+from oci_mlflow.signer_cache import SignerCache, auth_settings
+from oci_mlflow.transfer_metrics import TransferMetrics
+
+DEFAULT_DELEGATION_TOKEN_PATH = "/opt/spark/delegation-secrets/delegation.jwt"
+DELEGATION_TOKEN_PATH = "DELEGATION_TOKEN_PATH"
+TOKEN_CHECK_INTERVAL = "OCI_MLFLOW_TOKEN_CHECK_INTERVAL"
+DEFAULT_TOKEN_CHECK_INTERVAL = 1
+
+
+def get_token_path():
+    """
+    Gets delegation token path.
+
+    The Data Flow token file is checked through its `DelegationTokenWatcher`, so the file
+    system is hit at most once per `OCI_MLFLOW_TOKEN_CHECK_INTERVAL`, and the check is
+    shared with the token rotation checks.
+
+    Return
+    ------
+    str
+        The delegation token path.
+    """
+    if DelegationTokenWatcher.get(DEFAULT_DELEGATION_TOKEN_PATH).state() is not None:
+        return DEFAULT_DELEGATION_TOKEN_PATH
+    return os.environ.get(DELEGATION_TOKEN_PATH)
+
+
+class DelegationTokenWatcher:
+    """
+    Watches a delegation token file and keeps the signer created from it.
+
+    The token is read once and read again only when the inode or the modification time
+    of the file changes, which is checked at most every `OCI_MLFLOW_TOKEN_CHECK_INTERVAL`
+    seconds (1 second by default). The signer is then replaced for all the threads at once.
+
+    Attributes
+    ----------
+    token_path: str
+        The delegation token path.
+    """
+
+    _lock = threading.Lock()
+    _watchers: Dict[str, "DelegationTokenWatcher"] = {}
+
+    def __init__(self, token_path: str):
+        """Initializes `DelegationTokenWatcher` instance.
+
+        Parameters
+        ----------
+        token_path: str
+            The delegation token path.
+        """
+        self.token_path = token_path
+        self._state_lock = threading.Lock()
+        self._checked_at = None
+        self._state = None
+        # The (state, signer) pair the signer was created for, replaced as a whole.
+        self._current = (None, None)
+
+    @classmethod
+    def get(cls, token_path: str) -> "DelegationTokenWatcher":
+        """Gets the watcher of a delegation token file, creating it if needed."""
+        with cls._lock:
+            watcher = cls._watchers.get(token_path)
+            if watcher is None:
+                watcher = cls._watchers[token_path] = cls(token_path)
+            return watcher
+
+    @classmethod
+    def clear(cls):
+        """Drops all the watchers, so the tokens are read again."""
+        with cls._lock:
+            cls._watchers.clear()
+
+    def state(self) -> Optional[Tuple[int, int]]:
+        """
+        Gets the (inode, mtime) pair of the token file, checking the file
+        at most once per check interval.
+
+        Returns
+        -------
+        Optional[Tuple[int, int]]
+            The state of the token file, None if the file does not exist.
+        """
+        interval = get_env_float(
+            TOKEN_CHECK_INTERVAL, DEFAULT_TOKEN_CHECK_INTERVAL, allow_zero=True
+        )
+        now = time.monotonic()
+        with self._state_lock:
+            if self._checked_at is None or now - self._checked_at >= interval:
+                self._state = _file_state(self.token_path)
+                self._checked_at = now
+            return self._state
+
+    def signer(self) -> InstancePrincipalsDelegationTokenSigner:
+        """
+        Gets the signer created from the current token, reloading the token if the file changed.
+
+        Returns
+        -------
+        oci.auth.signers.InstancePrincipalsDelegationTokenSigner
+            The delegation token signer.
+        """
+        state = self.state()
+        current_state, signer = self._current
+        if signer is not None and current_state == state:
+            return signer
+        with self._state_lock:
+            if self._current[1] is not None and self._current[0] == state:
+                return self._current[1]
+            logger.debug(f"Loading the delegation token from {self.token_path}.")
+            with open(self.token_path) as fd:
+                delegation_token = fd.read()
+            signer = InstancePrincipalsDelegationTokenSigner(delegation_token=delegation_token)
+            self._current = (state, signer)
+            return signer
+
+
+def token_file_state(token_path: str = None) -> Optional[Tuple[int, int]]:
+    """Returns the (inode, mtime) pair of the delegation token file, see `DelegationTokenWatcher`."""
+    return DelegationTokenWatcher.get(token_path).state() if token_path else None
+
+
+def get_delegation_token_signer(token_path: str):
+    """
+    Generate delegation token signer.
+
+    The token file is only read again when it is rotated, see `DelegationTokenWatcher`.
+
+    Parameters
+    ----------
+    token_path: str
+        The delegation token path.
+
+    Return
+    ------
+    oci.auth.signers.InstancePrincipalsDelegationTokenSigner
+        The delegation token signer.
+
+    """
+    return DelegationTokenWatcher.get(token_path).signer()
+
+
+def get_signer(token_path: str = None, refresh: bool = False):
+    """
+    Generate default_signer. If running in Data Flow, use InstancePrincipalsDelegationTokenSigner.
+    If running locally, use default signer.
+
+    The signers are cached per auth type and profile, or per delegation token path,
+    see `SignerCache`.
+    The security tokens of the cached principal signers are renewed in the background
+    before they expire, and a delegation token signer is recreated when its token file
+    is rotated.
+
+    Parameters
+    ----------
+    token_path: str
+        Defaults to None. The delegation token path.
+    refresh: (bool, optional). Defaults to False.
+        Whether to recreate the signer, e.g. after its credentials were rejected.
+
+    Return
+    ------
+    dict
+        Contains keys - config, signer and client_kwargs.
+
+        - The config contains the config loaded from the configuration loaded from the default location if the default
+          auth mode is API keys, otherwise it is empty dictionary.
+        - The signer contains the signer object created from default auth mode.
+        - client_kwargs contains the `client_kwargs` that was passed in as input parameter.
+
+    """
+
+    def create_signer() -> Dict:
+        with TransferMetrics.measure("sign", token_path or ""):
+            if token_path:
+                auth.set_auth(
+                    signer_callable=get_delegation_token_signer,
+                    signer_kwargs={"token_path": token_path},
+                )
+            return auth.default_signer()
+
+    return SignerCache.get(
+        signer_key(token_path),
+        create_signer,
+        state=token_file_state(token_path),
+        refresh=refresh,
+    )
+
+
+def signer_key(token_path: str = None) -> Tuple:
+    """
+    Builds the key the signers and filesystems are cached by. A delegation token signer
+    is keyed by the `auth.set_auth` arguments it is created with, rather than by the ADS
+    auth settings, which creating it changes.
+    """
+    if token_path:
+        return ("delegation_token", get_delegation_token_signer, token_path)
+    return auth_settings()
+
+
+def _file_state(path: str) -> Optional[Tuple[int, int]]:
+    """Returns the (inode, mtime) pair of a file, used to detect rotated tokens."""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def _signer_identity(auth: Dict, token_path: str = None) -> Tuple:
+    """
+    Builds a key identifying the principal and region a signer acts for.
+
+    Parameters
+    ----------
+    auth: Dict
+        The signer dictionary returned by `get_signer`.
+    token_path: (str, optional). Defaults to None.
+        The delegation token path.
+
+    Returns
+    -------
+    Tuple
+        The identity key.
+    """
+    config = auth.get("config") or {}
+    signer = auth.get("signer")
+    return (
+        type(signer).__name__,
+        config.get("tenancy"),
+        config.get("user"),
+        config.get("fingerprint"),
+        config.get("key_file"),
+        config.get("security_token_file"),
+        config.get("region") or getattr(signer, "region", None),
+        token_path,
+    )
+
+
+def _token_state(auth: Dict, token_path: str = None) -> Tuple:
+    """Returns the state of the token files backing a signer, which changes on token rotation."""
+    config = auth.get("config") or {}
+    return (
+        token_file_state(token_path),
+        _file_state(config.get("security_token_file")),
+    )
+
+
+class ObjectStorageClientPool:
+    """
+    Process-wide, thread-safe pool of Object Storage clients and upload managers.
+
+    Clients are shared by every caller authenticated as the same principal in the same region,
+    so the TLS sessions are reused across uploads. An entry is rebuilt once the delegation or
+    security token file backing its signer is rotated, or when it is explicitly invalidated.
+    """
+
+    _lock = threading.Lock()
+    _clients: Dict[Tuple, Tuple[Tuple, object_storage.ObjectStorageClient]] = {}
+    _upload_managers: Dict[Tuple, object_storage.UploadManager] = {}
+
+    @classmethod
+    def get_client(
+        cls, auth: Dict, token_path: str = None
+    ) -> object_storage.ObjectStorageClient:
+        """
+        Gets the Object Storage client for the given signer, creating it if needed.
+
+        Parameters
+        ----------
+        auth: Dict
+            The signer dictionary returned by `get_signer`.
+        token_path: (str, optional). Defaults to None.
+            The delegation token path.
+
+        Returns
+        -------
+        oci.object_storage.ObjectStorageClient
+            The shared Object Storage client.
+        """
+        identity = _signer_identity(auth, token_path)
+        state = _token_state(auth, token_path)
+        with cls._lock:
+            cached = cls._clients.get(identity)
+            if cached and cached[0] == state:
+                return cached[1]
+            if cached:
+                logger.debug(f"Token rotated, recreating Object Storage client for {identity}.")
+            client = OCIClientFactory(**auth).object_storage
+            cls._clients[identity] = (state, client)
+            for key in [key for key in cls._upload_managers if key[0] == identity]:
+                del cls._upload_managers[key]
+            return client
+
+    @classmethod
+    def get_upload_manager(
+        cls, auth: Dict, token_path: str = None, **kwargs
+    ) -> object_storage.UploadManager:
+        """
+        Gets the upload manager for the given signer, creating it if needed.
+
+        Parameters
+        ----------
+        auth: Dict
+            The signer dictionary returned by `get_signer`.
+        token_path: (str, optional). Defaults to None.
+            The delegation token path.
+        kwargs:
+            The additional arguments passed to the `UploadManager`.
+
+        Returns
+        -------
+        oci.object_storage.UploadManager
+            The shared upload manager.
+        """
+        client = cls.get_client(auth, token_path)
+        key = (_signer_identity(auth, token_path), tuple(sorted(kwargs.items())))
+        with cls._lock:
+            upload_manager = cls._upload_managers.get(key)
+            if upload_manager is None or upload_manager.object_storage_client is not client:
+                upload_manager = object_storage.UploadManager(client, **kwargs)
+                cls._upload_managers[key] = upload_manager
+            return upload_manager
+
+    @classmethod
+    def invalidate(cls, auth: Dict = None, token_path: str = None):
+        """
+        Drops the pooled clients for the given signer, or all of them if no signer is given.
+
+        Parameters
+        ----------
+        auth: (Dict, optional). Defaults to None.
+            The signer dictionary returned by `get_signer`.
+        token_path: (str, optional). Defaults to None.
+            The delegation token path.
+        """
+        with cls._lock:
+            if auth is None:
+                cls._clients.clear()
+                cls._upload_managers.clear()
+                return
+            cls._drop([_signer_identity(auth, token_path)])
+
+    @classmethod
+    def invalidate_principal(cls, auth: Dict):
+        """
+        Drops the pooled clients of the principal a signer acts for, whatever their token path.
+
+        Parameters
+        ----------
+        auth: Dict
+            The signer dictionary returned by `get_signer`.
+        """
+        # The token path is the last element of the identity.
+        principal = _signer_identity(auth)[:-1]
+        with cls._lock:
+            cls._drop([identity for identity in cls._clients if identity[:-1] == principal])
+
+    @classmethod
+    def _drop(cls, identities: List[Tuple]):
+        """Drops the clients and upload managers of identities. Must be called with the lock held."""
+        for identity in identities:
+            cls._clients.pop(identity, None)
+            for key in [key for key in cls._upload_managers if key[0] == identity]:
+                del cls._upload_managers[key]
@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+"""
+Object Storage request helpers shared by the artifact transfers.
+
+The transient failures of the requests are retried with exponential backoff, the batches
+of transfers run on a bounded pool of workers, and their failures are collected into an
+`ArtifactTransferError`.
+"""
+
+import base64
+import hashlib
+import http.client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+import urllib3
+from oci import object_storage
+from oci.exceptions import RequestException as OCIRequestException
+from oci.exceptions import ServiceError
+
+from oci_mlflow import logger
+from oci_mlflow.transfer_metrics import TransferMetrics
+
+OCI_SCHEME = "oci"
+MEBIBYTE = 1024 * 1024
+DEFAULT_DELETE_RETRIES = 3
+OBJECT_FIELDS = "name,size,etag,md5"
+HASH_CHUNK_SIZE = MEBIBYTE
+RETRY_BACKOFF_SECONDS = 0.5
+# The transport failures worth retrying, see `_is_retryable`.
+TRANSIENT_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    http.client.HTTPException,
+    requests.exceptions.RequestException,
+    urllib3.exceptions.HTTPError,
+    OCIRequestException,
+)
+
+
+class ArtifactTransferError(Exception):
+    """Raised when one or more artifacts fail to transfer.
+
+    Attributes
+    ----------
+    failures: Dict[str, Exception]
+        The failed artifact paths mapped to the last error raised for them.
+    total: int
+        The total number of artifacts in the transfer.
+    """
+
+    def __init__(self, operation: str, failures: Dict[str, Exception], total: int):
+        self.failures = failures
+        self.total = total
+        details = "\n".join(f"  {path}: {error}" for path, error in failures.items())
+        super().__init__(
+            f"Failed to {operation} {len(failures)} of {total} artifact(s):\n{details}"
+        )
+
+
+def is_auth_error(error: Exception) -> bool:
+    """Checks whether the error, or any error it was raised from, is a 401 from OCI."""
+    while error is not None:
+        if isinstance(error, ServiceError) and error.status == 401:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Checks whether a failed transfer is worth retrying. Only throttling, server errors and
+    transport failures are retried, any other error is raised right away.
+    """
+    if isinstance(error, ServiceError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+def call_with_retry(
+    func: Callable[[], Any],
+    retries: int,
+    description: str,
+    reauthenticate: Callable[[], None] = None,
+) -> Any:
+    """
+    Calls a function, retrying transient failures with exponential backoff.
+
+    Parameters
+    ----------
+    func: Callable[[], Any]
+        The function to call.
+    retries: int
+        The number of times a failed call is retried.
+    description: str
+        The description of the call, used in the log messages.
+    reauthenticate: (Callable[[], None], optional). Defaults to None.
+        The function refreshing the credentials. When provided, a call rejected
+        with 401 is retried once after refreshing the credentials.
+
+    Returns
+    -------
+    Any
+        The result of the function.
+    """
+    attempt = 0
+    reauthenticated = False
+    while True:
+        try:
+            return func()
+        except Exception as ex:
+            if reauthenticate and is_auth_error(ex) and not reauthenticated:
+                logger.debug(f"Credentials rejected, re-authenticating: {ex}")
+                TransferMetrics.count_retry()
+                reauthenticate()
+                reauthenticated = True
+                continue
+            if attempt >= retries or not _is_retryable(ex):
+                raise
+            delay = RETRY_BACKOFF_SECONDS * 2**attempt
+            attempt += 1
+            TransferMetrics.count_retry()
+            logger.debug(
+                f"Retrying {description} in {delay}s (attempt {attempt} of {retries}): {ex}"
+            )
+            time.sleep(delay)
+
+
+def run_parallel(
+    func: Callable[..., Any],
+    items: Iterable[Tuple[str, Tuple]],
+    max_workers: int,
+    operation: str,
+    callback: Callable[[str, Optional[Exception]], None] = None,
+):
+    """
+    Runs a transfer for every item on a bounded pool of threads. The items are consumed
+    lazily, with at most twice `max_workers` transfers pending at a time, so they can be
+    streamed from a paginated listing.
+
+    Parameters
+    ----------
+    func: Callable[..., Any]
+        The function transferring an item, called with the item arguments.
+    items: Iterable[Tuple[str, Tuple]]
+        The (name, arguments) pairs of the items, the name identifies the item in the errors.
+    max_workers: int
+        The maximum number of items transferred in parallel.
+    operation: str
+        The name of the transfer, e.g. "upload", used in the error messages.
+    callback: (Callable[[str, Optional[Exception]], None], optional). Defaults to None.
+        The function called with the name of each transferred item and its error, if any.
+
+    Raises
+    ------
+    ArtifactTransferError
+        If any of the items could not be transferred.
+    """
+    max_workers = max(1, max_workers)
+    failures = {}
+    lock = threading.Lock()
+    pending = threading.BoundedSemaphore(max_workers * 2)
+    total = 0
+
+    def on_done(future, name: str):
+        pending.release()
+        error = future.exception()
+        with lock:
+            if error:
+                logger.debug(f"Failed to {operation} {name}: {error}")
+                failures[name] = error
+            if callback:
+                callback(name, error)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for name, args in items:
+            pending.acquire()
+            total += 1
+            future = executor.submit(func, *args)
+            future.add_done_callback(lambda f, name=name: on_done(f, name))
+    if failures:
+        raise ArtifactTransferError(operation, failures, total)
+
+
+def file_md5(file_path: str) -> str:
+    """
+    Computes the MD5 digest of a file, in the base64 form Object Storage reports it.
+
+    Parameters
+    ----------
+    file_path: str
+        The file path.
+
+    Returns
+    -------
+    str
+        The base64 encoded MD5 digest.
+    """
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            md5.update(chunk)
+    return base64.b64encode(md5.digest()).decode("ascii")
+
+
+def delete_object(
+    client: object_storage.ObjectStorageClient,
+    namespace_name: str,
+    bucket_name: str,
+    object_name: str,
+):
+    """Deletes an object, retrying transient failures and ignoring objects which are already gone."""
+
+    def delete():
+        try:
+            client.delete_object(namespace_name, bucket_name, object_name)
+        except ServiceError as ex:
+            if ex.status != 404:
+                raise
+
+    with TransferMetrics.measure("delete", object_name):
+        call_with_retry(
+            delete, retries=DEFAULT_DELETE_RETRIES, description=f"deletion of {object_name}"
+        )
+
+
+def parse_os_uri(uri: str):
+    """
+    Parse an OCI object storage URI, returning tuple (bucket, namespace, path).
+
+    Parameters
+    ----------
+    uri: str
+        The OCI Object Storage URI.
+
+    Returns
+    -------
+    Tuple
+        The (bucket, ns, type)
+
+    Raise
+    -----
+    Exception
+        If provided URI is not an OCI OS bucket URI.
+    """
+    parsed = urlparse(uri)
+    if parsed.scheme.lower() != OCI_SCHEME:
+        raise Exception("Not an OCI object storage URI: %s" % uri)
+    path = parsed.path
+
+    if path.startswith("/"):
+        path = path[1:]
+
+    bucket, ns = parsed.netloc.split("@")
+
+    return bucket, ns, path
+
+
+def iter_objects(
+    client: object_storage.ObjectStorageClient, uri: str, fields: str = OBJECT_FIELDS
+) -> Iterator[object_storage.models.ObjectSummary]:
+    """
+    Streams the objects stored under an OCI Object Storage URI using a flat, paginated listing.
+
+    Parameters
+    ----------
+    client: oci.object_storage.ObjectStorageClient
+        The Object Storage client.
+    uri: str
+        The OCI Object Storage URI of a file or a directory.
+    fields: (str, optional). Defaults to `name,size,etag,md5`.
+        The object fields to include in the listing.
+
+    Yields
+    ------
+    oci.object_storage.models.ObjectSummary
+        The object stored at the URI itself, or under it.
+    """
+    bucket_name, namespace_name, prefix = parse_os_uri(uri)
+    prefix = prefix.rstrip("/")
+    start = None
+    while True:
+        with TransferMetrics.measure("list", uri):
+            response = client.list_objects(
+                namespace_name, bucket_name, prefix=prefix, start=start, fields=fields
+            )
+        for obj in response.data.objects:
+            if not prefix or obj.name == prefix or obj.name.startswith(prefix + "/"):
+                yield obj
+        start = response.data.next_start_with
+        if not start:
+            break
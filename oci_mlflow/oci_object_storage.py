@@ -4,175 +4,719 @@
 # Copyright (c) 2023 Oracle and/or its affiliates.
 # Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
 
+import gzip
+import json
+import mmap
 import os
-from typing import List
+import posixpath
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import fsspec
-from ads.common import auth
-from ads.common.oci_client import OCIClientFactory
 from mlflow.entities import FileInfo
+from mlflow.exceptions import MlflowException
+from mlflow.protos.databricks_pb2 import INVALID_PARAMETER_VALUE, RESOURCE_DOES_NOT_EXIST
 from mlflow.store.artifact.artifact_repo import ArtifactRepository
 from mlflow.utils.file_utils import relative_path_to_artifact_path
 from oci import object_storage
-from oci.auth.signers import InstancePrincipalsDelegationTokenSigner
-from ocifs import OCIFileSystem
+from oci.exceptions import ServiceError
 
 from oci_mlflow import logger
+from oci_mlflow.artifact_archive import (
+    ARCHIVE_MANIFEST_DIR,
+    MemberReader,
+    archive_paths,
+    dump_manifest,
+    is_archive_path,
+    manifest_path,
+    new_archive_id,
+    read_manifest,
+    write_tar,
+)
+from oci_mlflow.artifact_cache import ArtifactCache
+from oci_mlflow.artifact_index import (
+    ArchiveCatalog,
+    ArtifactIndex,
+    DeleteSummary,
+    SyncSummary,
+    is_unchanged,
+)
+from oci_mlflow.artifact_upload import (
+    ENCODING_METADATA_KEY,
+    GZIP_ENCODING,
+    GZIP_MAGIC,
+    ArtifactUploader,
+    ArtifactUploadQueue,
+    wait_for_artifact_uploads,  # noqa: F401
+)
+from oci_mlflow.env import get_env_bool, get_env_int
+from oci_mlflow.object_storage_auth import (
+    DEFAULT_DELEGATION_TOKEN_PATH,  # noqa: F401
+    DELEGATION_TOKEN_PATH,  # noqa: F401
+    DelegationTokenWatcher,  # noqa: F401
+    ObjectStorageClientPool,
+    get_delegation_token_signer,  # noqa: F401
+    get_signer,
+    get_token_path,
+    signer_key,
+    token_file_state,
+)
+from oci_mlflow.object_storage_utils import (
+    HASH_CHUNK_SIZE,
+    MEBIBYTE,
+    OCI_SCHEME,
+    ArtifactTransferError,  # noqa: F401
+    call_with_retry,
+    delete_object,
+    file_md5,
+    is_auth_error,
+    iter_objects,
+    parse_os_uri,
+    run_parallel,
+)
+from oci_mlflow.signer_cache import SignerCache
+from oci_mlflow.transfer_metrics import TransferMetrics
 
-OCI_SCHEME = "oci"
 OCI_PREFIX = f"{OCI_SCHEME}://"
-DEFAULT_DELEGATION_TOKEN_PATH = "/opt/spark/delegation-secrets/delegation.jwt"
-DELEGATION_TOKEN_PATH = "DELEGATION_TOKEN_PATH"
 
+DELETE_CONCURRENCY = "OCI_MLFLOW_DELETE_CONCURRENCY"
+DOWNLOAD_CONCURRENCY = "OCI_MLFLOW_DOWNLOAD_CONCURRENCY"
+DOWNLOAD_PART_SIZE = "OCI_MLFLOW_DOWNLOAD_PART_SIZE"
+DOWNLOAD_PARALLELISM = "OCI_MLFLOW_DOWNLOAD_PARALLELISM"
+MULTIPART_DOWNLOAD_THRESHOLD = "OCI_MLFLOW_MULTIPART_DOWNLOAD_THRESHOLD"
+FS_CACHE_TTL = "OCI_MLFLOW_FS_CACHE_TTL"
+LIST_RECURSIVE = "OCI_MLFLOW_LIST_RECURSIVE"
+ARTIFACT_INDEX_TTL = "OCI_MLFLOW_ARTIFACT_INDEX_TTL"
+ASYNC_ARTIFACT_LOGGING = "OCI_MLFLOW_ASYNC_ARTIFACT_LOGGING"
+SYNC_ARTIFACTS = "OCI_MLFLOW_SYNC_ARTIFACTS"
+SYNC_DELETE = "OCI_MLFLOW_SYNC_DELETE"
+ARCHIVE_ARTIFACTS = "OCI_MLFLOW_ARCHIVE_ARTIFACTS"
+ARCHIVE_MIN_FILES = "OCI_MLFLOW_ARCHIVE_MIN_FILES"
+DEFAULT_DELETE_CONCURRENCY = 16
+DEFAULT_DOWNLOAD_CONCURRENCY = 8
+DEFAULT_DOWNLOAD_PART_SIZE = 16 * MEBIBYTE
+DEFAULT_DOWNLOAD_PARALLELISM = 8
+DEFAULT_MULTIPART_DOWNLOAD_THRESHOLD = 128 * MEBIBYTE
+DEFAULT_DOWNLOAD_RETRIES = 3
+PARTIAL_DOWNLOAD_SUFFIX = ".oci-partial"
+DEFAULT_FS_CACHE_TTL = 3600
+DEFAULT_ARTIFACT_INDEX_TTL = 60
+DEFAULT_ARCHIVE_MIN_FILES = 1000
+# The largest gap between two archive members downloaded with a single ranged request.
+MAX_MEMBER_GAP = 64 * 1024
+# The number of archive catalogs kept in memory, the least recently used are dropped first.
+MAX_ARCHIVE_CATALOGS = 64
 
-def parse_os_uri(uri: str):
-    """
-    Parse an OCI object storage URI, returning tuple (bucket, namespace, path).
 
-    Parameters
-    ----------
-    uri: str
-        The OCI Object Storage URI.
+_pwrite_lock = threading.Lock()
 
-    Returns
-    -------
-    Tuple
-        The (bucket, ns, type)
 
-    Raise
-    -----
-    Exception
-        If provided URI is not an OCI OS bucket URI.
-    """
-    parsed = urlparse(uri)
-    if parsed.scheme.lower() != OCI_SCHEME:
-        raise Exception("Not an OCI object storage URI: %s" % uri)
-    path = parsed.path
+def _pwrite(fd: int, data: bytes, offset: int):
+    """Writes the whole buffer at the given offset of a file, without moving a shared cursor."""
+    view = memoryview(data)
+    if not hasattr(os, "pwrite"):
+        with _pwrite_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            while view:
+                view = view[os.write(fd, view) :]
+        return
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
 
-    if path.startswith("/"):
-        path = path[1:]
 
-    bucket, ns = parsed.netloc.split("@")
+def _is_gzip_encoded(client: object_storage.ObjectStorageClient, uri: str) -> bool:
+    """Checks the object metadata for the gzip encoding applied on upload."""
+    bucket_name, namespace_name, object_name = parse_os_uri(uri)
+    headers = client.head_object(namespace_name, bucket_name, object_name).headers
+    return headers.get(f"opc-meta-{ENCODING_METADATA_KEY}") == GZIP_ENCODING
 
-    return bucket, ns, path
 
+class DecodedArtifactFile(gzip.GzipFile):
+    """Decompressing reader of an artifact compressed on upload, closing the object file with it."""
 
-def get_token_path():
-    """
-    Gets delegation token path.
+    def __init__(self, fileobj: BinaryIO):
+        """Initializes `DecodedArtifactFile` instance.
 
-    Return
-    ------
-    str
-        The delegation token path.
-    """
-    token_path = (
-        DEFAULT_DELEGATION_TOKEN_PATH
-        if os.path.exists(DEFAULT_DELEGATION_TOKEN_PATH)
-        else os.environ.get(DELEGATION_TOKEN_PATH)
-    )
-    return token_path
+        Parameters
+        ----------
+        fileobj: BinaryIO
+            The opened, compressed object.
+        """
+        super().__init__(fileobj=fileobj, mode="rb")
+        self._object_file = fileobj
 
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._object_file.close()
 
-def get_delegation_token_signer(token_path: str):
+
+def _open_decoded(client: object_storage.ObjectStorageClient, uri: str, fileobj: BinaryIO):
     """
-    Generate delegation token signer.
+    Wraps an opened artifact to decompress it on read if it was compressed on upload.
+    Like `_decode_artifact`, only the objects starting with the gzip magic number
+    are checked against the object metadata.
 
     Parameters
     ----------
-    token_path: str
-        The delegation token path.
-
-    Return
-    ------
-    oci.auth.signers.InstancePrincipalsDelegationTokenSigner
-        The delegation token signer.
+    client: oci.object_storage.ObjectStorageClient
+        The Object Storage client.
+    uri: str
+        The OCI Object Storage URI of the artifact.
+    fileobj: BinaryIO
+        The opened, seekable artifact.
 
+    Returns
+    -------
+    BinaryIO
+        The artifact file object, or its decompressing reader.
     """
-    with open(token_path) as fd:
-        delegation_token = fd.read()
-    signer = InstancePrincipalsDelegationTokenSigner(delegation_token=delegation_token)
-    return signer
+    magic = fileobj.read(len(GZIP_MAGIC))
+    fileobj.seek(0)
+    if magic != GZIP_MAGIC or not _is_gzip_encoded(client, uri):
+        return fileobj
+    return DecodedArtifactFile(fileobj)
 
 
-def get_signer(token_path: str = None):
+def _decode_artifact(
+    client: object_storage.ObjectStorageClient, uri: str, local_path: str
+) -> bool:
     """
-    Generate default_signer. If running in Data Flow, use InstancePrincipalsDelegationTokenSigner.
-    If running locally, use default signer.
+    Decompresses a downloaded artifact in place if it was compressed on upload.
+    Only files starting with the gzip magic number are checked against the object metadata,
+    so the other downloads need no extra request.
 
     Parameters
     ----------
-    token_path: str
-        Defaults to None. The delegation token path.
+    client: oci.object_storage.ObjectStorageClient
+        The Object Storage client.
+    uri: str
+        The OCI Object Storage URI of the artifact.
+    local_path: str
+        The path of the downloaded artifact.
 
-    Return
-    ------
-    dict
-        Contains keys - config, signer and client_kwargs.
+    Returns
+    -------
+    bool
+        True if the artifact was decompressed.
+    """
+    try:
+        with open(local_path, "rb") as f:
+            if f.read(len(GZIP_MAGIC)) != GZIP_MAGIC:
+                return False
+    except FileNotFoundError:
+        return False
+    if not _is_gzip_encoded(client, uri):
+        return False
+    tmp_path = local_path + ".decoded"
+    try:
+        with gzip.open(local_path, "rb") as src, open(tmp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, HASH_CHUNK_SIZE)
+        os.replace(tmp_path, local_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
 
-        - The config contains the config loaded from the configuration loaded from the default location if the default
-          auth mode is API keys, otherwise it is empty dictionary.
-        - The signer contains the signer object created from default auth mode.
-        - client_kwargs contains the `client_kwargs` that was passed in as input parameter.
 
+def _get_object_range(
+    client: object_storage.ObjectStorageClient,
+    namespace_name: str,
+    bucket_name: str,
+    object_name: str,
+    start: int,
+    end: int,
+) -> bytes:
     """
-    if token_path:
-        auth.set_auth(
-            signer_callable=get_delegation_token_signer,
-            signer_kwargs={"token_path": token_path},
-        )
-    return auth.default_signer()
+    Reads a byte range of an object with a single ranged `GetObject` request.
+
+    Parameters
+    ----------
+    client: oci.object_storage.ObjectStorageClient
+        The Object Storage client.
+    namespace_name: str
+        The Object Storage namespace.
+    bucket_name: str
+        The bucket name.
+    object_name: str
+        The object name.
+    start: int
+        The offset of the first byte to read.
+    end: int
+        The offset after the last byte to read.
+
+    Returns
+    -------
+    bytes
+        The content of the range.
+    """
+    response = client.get_object(
+        namespace_name, bucket_name, object_name, range=f"bytes={start}-{end - 1}"
+    )
+    return response.data.content
 
 
-class ArtifactUploader:
+def _member_spans(
+    members: Dict[str, Tuple[str, int, int]], part_size: int
+) -> List[Tuple[str, int, int, List[Tuple[str, int, int]]]]:
     """
-    The class helper to upload model artifacts.
+    Groups archive members into byte ranges of their archive, each read with one request.
 
-    Attributes
+    The members of an archive are sorted by offset, and neighbours at most `MAX_MEMBER_GAP`
+    bytes apart are merged while the range stays within the part size. The gaps hold the
+    tar headers of the members, so downloading a whole archived directory reads the archive
+    in `part_size` ranges instead of making one request per member.
+
+    Parameters
     ----------
-    upload_manager: UploadManager
-        The uploadManager simplifies interaction with the Object Storage service.
+    members: Dict[str, Tuple[str, int, int]]
+        The member paths mapped to their (archive path, data offset, size).
+    part_size: int
+        The maximum size of a merged range.
+
+    Returns
+    -------
+    List[Tuple[str, int, int, List[Tuple[str, int, int]]]]
+        The (archive path, start, end, members) ranges, with the (member path, data offset,
+        size) of their members.
     """
+    by_archive = {}
+    for member_path, (archive, offset, size) in members.items():
+        by_archive.setdefault(archive, []).append((member_path, offset, size))
+    spans = []
+    for archive, archive_members in by_archive.items():
+        archive_members.sort(key=lambda member: member[1])
+        span = None
+        for member_path, offset, size in archive_members:
+            if (
+                span is not None
+                and offset - span[2] <= MAX_MEMBER_GAP
+                and offset + size - span[1] <= part_size
+            ):
+                span[2] = offset + size
+                span[3].append((member_path, offset, size))
+            else:
+                span = [archive, offset, offset + size, [(member_path, offset, size)]]
+                spans.append(span)
+    return [tuple(span) for span in spans]
 
-    def __init__(self):
-        """Initializes `ArtifactUploader` instance."""
-        self.upload_manager = object_storage.UploadManager(
-            OCIClientFactory(**get_signer(token_path=get_token_path())).object_storage
-        )
 
-    def upload(self, file_path: str, dst_path: str):
-        """Uploads model artifacts.
+def _on_signer_recreated(auth: Dict):
+    """Drops the clients and filesystems holding a signer recreated by `SignerCache.refresh`."""
+    ObjectStorageClientPool.invalidate_principal(auth)
+    OCIObjectStorageArtifactRepository.clear_fs_cache()
 
-        Parameters
-        ----------
-        file_path: str
-            The source file path.
-        dst_path: str
-            The destination path.
-        """
-        bucket_name, namespace_name, object_name = parse_os_uri(dst_path)
-        logger.debug(f"{bucket_name=}, {namespace_name=}, {object_name=}")
-        response = self.upload_manager.upload_file(
-            namespace_name=namespace_name,
-            bucket_name=bucket_name,
-            object_name=object_name,
-            file_path=file_path,
-        )
-        logger.debug(response)
+
+SignerCache.add_listener(_on_signer_recreated)
 
 
 class OCIObjectStorageArtifactRepository(ArtifactRepository):
     """MLFlow Plugin implementation for storing artifacts to OCI Object Storage."""
 
-    def _download_file(self, remote_file_path, local_path):
+    # The filesystems are shared by all repository instances, since MLflow creates
+    # a new repository for every artifact request of the tracking server.
+    _fs_lock = threading.Lock()
+    _fs_cache: Dict[Tuple, Tuple[float, Tuple, fsspec.AbstractFileSystem]] = {}
+    _index_lock = threading.Lock()
+    _index_cache: Dict[str, ArtifactIndex] = {}
+    _archive_lock = threading.Lock()
+    _archive_cache: "OrderedDict[str, ArchiveCatalog]" = OrderedDict()
+
+    def _download_file(
+        self, remote_file_path, local_path, size: int = None, etag: str = None
+    ):
         if not remote_file_path.startswith(self.artifact_uri):
             full_path = os.path.join(self.artifact_uri, remote_file_path)
         else:
             full_path = remote_file_path
-        fs: OCIFileSystem = self.get_fs()
-        logger.info(f"{full_path}, {remote_file_path}")
-        fs.download(full_path, str(local_path))
+        logger.debug(f"{full_path}, {remote_file_path}")
+        local_path = str(local_path)
+        threshold = get_env_int(
+            MULTIPART_DOWNLOAD_THRESHOLD, DEFAULT_MULTIPART_DOWNLOAD_THRESHOLD, allow_zero=True
+        )
+        cache = ArtifactCache.from_env()
+
+        def fetch(fs, info: Dict, path: str):
+            event = TransferMetrics.current()
+            event.bytes = info.get("size") or 0
+            if event.bytes >= threshold:
+                self._download_ranges(full_path, path, info)
+            else:
+                event.parts = 1
+                fs.download(full_path, path)
+            _decode_artifact(self._get_client(), full_path, path)
+
+        def download(fs):
+            info = {"size": size, "etag": etag}
+            if size is None or size >= threshold or (cache and not etag):
+                info = fs.info(full_path)
+            if cache and info.get("etag"):
+                if not cache.get(full_path, info["etag"], local_path):
+                    cache.put(
+                        full_path,
+                        info["etag"],
+                        lambda path: fetch(fs, info, path),
+                        local_path,
+                    )
+                return
+            fetch(fs, info, local_path)
+
+        with TransferMetrics.measure("download", full_path):
+            self._with_fs(download)
+
+    def _download_ranges(self, full_path: str, local_path: str, info: Dict):
+        """
+        Downloads a large object as byte ranges fetched in parallel and written into
+        a preallocated file. The completed ranges are recorded in a journal next to the
+        partial file, so an interrupted download resumes where it stopped as long as
+        the object did not change in the meantime.
+
+        Each range is a single ranged `GetObject` request, sized from the object details
+        already fetched, without the metadata requests and read-ahead of the filesystem.
+
+        Parameters
+        ----------
+        full_path: str
+            The URI of the object.
+        local_path: str
+            The local destination path.
+        info: Dict
+            The object details returned by the filesystem.
+        """
+        size = info["size"]
+        part_size = get_env_int(DOWNLOAD_PART_SIZE, DEFAULT_DOWNLOAD_PART_SIZE)
+        parallelism = get_env_int(DOWNLOAD_PARALLELISM, DEFAULT_DOWNLOAD_PARALLELISM)
+        partial_path = local_path + PARTIAL_DOWNLOAD_SUFFIX
+        journal_path = partial_path + ".json"
+        journal = {
+            "etag": info.get("etag"),
+            "size": size,
+            "part_size": part_size,
+            "done": [],
+        }
+
+        event = TransferMetrics.current()
+        done = set()
+        if journal["etag"] and os.path.exists(partial_path) and os.path.exists(journal_path):
+            try:
+                with open(journal_path) as f:
+                    saved = json.load(f)
+                if all(saved.get(key) == journal[key] for key in ("etag", "size", "part_size")):
+                    done = set(saved.get("done", []))
+            except (OSError, ValueError):
+                pass
+        if done:
+            logger.debug(f"Resuming download of {full_path}, {len(done)} part(s) already done.")
+
+        lock = threading.Lock()
+
+        def save_journal(offset: int):
+            with lock:
+                done.add(offset)
+                journal["done"] = sorted(done)
+                with open(journal_path + ".tmp", "w") as f:
+                    json.dump(journal, f)
+                os.replace(journal_path + ".tmp", journal_path)
+
+        bucket_name, namespace_name, object_name = parse_os_uri(full_path)
+        clients = {"client": self._get_client()}
+
+        def reauthenticate():
+            clients["client"] = self._get_client(refresh=True)
+
+        fd = os.open(partial_path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0))
+        try:
+            os.ftruncate(fd, size)
+
+            def fetch(offset: int):
+                end = min(offset + part_size, size)
+                data = _get_object_range(
+                    clients["client"], namespace_name, bucket_name, object_name, offset, end
+                )
+                if len(data) != end - offset:
+                    # The connection was closed before the whole range was received.
+                    raise ConnectionError(
+                        f"Expected {end - offset} bytes at offset {offset} of {full_path}, "
+                        f"got {len(data)}."
+                    )
+                _pwrite(fd, data, offset)
+                save_journal(offset)
+
+            offsets = [offset for offset in range(0, size, part_size) if offset not in done]
+            if event is not None:
+                event.parts = len(offsets)
+                event.bytes = sum(min(part_size, size - offset) for offset in offsets)
+
+            def fetch_with_retry(offset: int):
+                with TransferMetrics.attach(event):
+                    call_with_retry(
+                        lambda: fetch(offset),
+                        retries=DEFAULT_DOWNLOAD_RETRIES,
+                        description=f"download of {full_path} at offset {offset}",
+                        reauthenticate=reauthenticate,
+                    )
+
+            run_parallel(
+                fetch_with_retry,
+                ((f"{full_path} at offset {offset}", (offset,)) for offset in offsets),
+                max_workers=min(parallelism, len(offsets)),
+                operation="download",
+            )
+        finally:
+            os.close(fd)
+
+        os.replace(partial_path, local_path)
+        os.remove(journal_path)
+
+    def download_artifacts(self, artifact_path: str, dst_path: str = None) -> str:
+        """
+        Download an artifact file or directory to a local directory if applicable, and return a
+        local path for it. The artifact location is listed once with a flat, paginated listing
+        and the files are downloaded concurrently.
+
+        Parameters
+        ----------
+        artifact_path: str
+            Relative source path to the desired artifacts.
+        dst_path: (str, optional). Defaults to None.
+            Absolute path of the local filesystem destination directory to which to
+            download the specified artifacts. This directory must already exist.
+            If unspecified, the artifacts will either be downloaded to a new
+            uniquely-named directory on the local filesystem.
+
+        Returns
+        -------
+        str
+            Absolute path of the local filesystem location containing the desired artifacts.
+
+        Raises
+        ------
+        ArtifactTransferError
+            If any of the files could not be downloaded.
+        """
+        self._wait_for_uploads()
+        if dst_path:
+            dst_path = os.path.abspath(dst_path)
+            if not os.path.exists(dst_path):
+                raise MlflowException(
+                    message=(
+                        "The destination path for downloaded artifacts does not"
+                        f" exist! Destination path: {dst_path}"
+                    ),
+                    error_code=RESOURCE_DOES_NOT_EXIST,
+                )
+            elif not os.path.isdir(dst_path):
+                raise MlflowException(
+                    message=(
+                        "The destination path for downloaded artifacts must be a directory!"
+                        f" Destination path: {dst_path}"
+                    ),
+                    error_code=INVALID_PARAMETER_VALUE,
+                )
+        else:
+            dst_path = tempfile.mkdtemp()
+
+        full_path = self.artifact_uri
+        if artifact_path:
+            full_path = os.path.join(self.artifact_uri, artifact_path)
+        _, _, root_prefix = parse_os_uri(self.artifact_uri)
+        root_prefix = root_prefix.rstrip("/")
+
+        files = []
+        archived = False
+        for obj in self._iter_objects(full_path):
+            if obj.name.endswith("/"):
+                continue
+            remote_file_path = obj.name[len(root_prefix) + 1 :] if root_prefix else obj.name
+            if is_archive_path(remote_file_path):
+                archived = True
+                continue
+            local_path = os.path.join(dst_path, *remote_file_path.split("/"))
+            files.append((remote_file_path, local_path, obj.size, obj.etag))
+
+        # The archive catalog is only read when archives are stored under the path, or when
+        # nothing is, since the path may then be inside an archived directory.
+        members = {}
+        if archived or not files:
+            # The stored files take precedence over the archive members of the same path.
+            stored = {file[0] for file in files}
+            members = {
+                member_path: member
+                for member_path, member in self._get_archive_catalog()
+                .files(artifact_path or "")
+                .items()
+                if member_path not in stored
+            }
+
+        if not files and not members:
+            # Nothing is stored under the path, let MLflow report it the usual way.
+            return super().download_artifacts(artifact_path, dst_path)
+
+        if files:
+            self._download_files(files)
+        if members:
+            self._download_members(members, dst_path)
+        return os.path.join(dst_path, artifact_path)
+
+    def _download_files(
+        self, files: List[Tuple[str, str, int, str]], max_workers: int = None
+    ):
+        """
+        Downloads files concurrently using a bounded pool of workers.
+
+        Parameters
+        ----------
+        files: List[Tuple[str, str, int, str]]
+            The list of (remote file path, local path, size, ETag) tuples.
+        max_workers: (int, optional). Defaults to `OCI_MLFLOW_DOWNLOAD_CONCURRENCY` or 8.
+            The maximum number of files downloaded in parallel.
+
+        Raises
+        ------
+        ArtifactTransferError
+            If any of the files could not be downloaded.
+        """
+        if max_workers is None:
+            max_workers = get_env_int(DOWNLOAD_CONCURRENCY, DEFAULT_DOWNLOAD_CONCURRENCY)
+
+        def download(remote_file_path: str, local_path: str, size: int, etag: str):
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            self._download_file(remote_file_path, local_path, size=size, etag=etag)
+
+        run_parallel(
+            download,
+            ((file[0], file) for file in files),
+            max_workers=min(max_workers, len(files)),
+            operation="download",
+        )
+
+    def open_artifact_mmap(self, artifact_path: str, dst_path: str = None) -> mmap.mmap:
+        """
+        Downloads an artifact file and maps it into memory read-only, so loaders can
+        page in the parts they use instead of reading the whole file. With the artifact
+        cache configured, a cached artifact is mapped without being downloaded or copied.
+        Artifacts compressed on upload are decompressed, and the members of archived
+        directories are read from their archive.
+
+        Parameters
+        ----------
+        artifact_path: str
+            The artifact file path, relative to the run artifacts root.
+        dst_path: (str, optional). Defaults to None.
+            The local directory to download the artifact to. By default, the artifact is
+            downloaded to a temporary directory and the file is removed once mapped, the
+            mapping keeping its content alive.
+
+        Returns
+        -------
+        mmap.mmap
+            The read-only memory map of the artifact. Close it to release the memory.
+
+        Examples
+        --------
+        >>> buffer = repo.open_artifact_mmap("model/model.safetensors")
+        >>> tensors = safetensors.numpy.load(buffer)
+        """
+        if not artifact_path or artifact_path.endswith("/"):
+            raise ValueError("`artifact_path` must be a file path.")
+        keep = dst_path is not None
+        dst_path = os.path.abspath(dst_path) if keep else tempfile.mkdtemp()
+        local_path = os.path.join(dst_path, *artifact_path.strip("/").split("/"))
+        try:
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            try:
+                self._download_file(artifact_path, local_path)
+            except FileNotFoundError:
+                member_path = artifact_path.strip("/")
+                member = self._get_archive_catalog().members.get(member_path)
+                if member is None:
+                    raise
+                self._download_members({member_path: member}, dst_path)
+            with open(local_path, "rb") as f:
+                if not os.fstat(f.fileno()).st_size:
+                    raise ValueError(
+                        f"The artifact `{artifact_path}` is empty and cannot be mapped."
+                    )
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            if not keep:
+                self._remove_download_dir(dst_path, artifact_path)
+        return buffer
+
+    @staticmethod
+    def _remove_download_dir(dst_path: str, artifact_path: str):
+        """Removes the temporary directory of a mapped artifact."""
+        try:
+            shutil.rmtree(dst_path)
+        except OSError:
+            # Files mapped into memory cannot be removed on Windows.
+            logger.debug(f"Could not remove {dst_path} while {artifact_path} is mapped.")
+
+    def open_artifact(
+        self, artifact_path: str, block_size: int = None, cache_type: str = "blockcache"
+    ):
+        """
+        Opens an artifact file for lazy reading. Only the blocks that are read are fetched,
+        with ranged requests, and kept in a bounded cache, which suits formats with an
+        index of their content such as safetensors, npz or zip.
+        Artifacts compressed on upload are decompressed as they are read, and the members
+        of archived directories are read from their archive.
+
+        Parameters
+        ----------
+        artifact_path: str
+            The artifact file path, relative to the run artifacts root.
+        block_size: (int, optional). Defaults to `OCI_MLFLOW_DOWNLOAD_PART_SIZE` or 16 MiB.
+            The size of the fetched blocks in bytes.
+        cache_type: (str, optional). Defaults to "blockcache".
+            The fsspec cache of the fetched blocks, e.g. "blockcache" or "readahead".
+
+        Returns
+        -------
+        BinaryIO
+            The read-only, seekable file object. Close it to release the cached blocks.
+
+        Examples
+        --------
+        >>> with repo.open_artifact("data/features.npz") as f:
+        ...     features = numpy.load(f)["train"]
+        """
+        if not artifact_path or artifact_path.endswith("/"):
+            raise ValueError("`artifact_path` must be a file path.")
+        root = self.artifact_uri.rstrip("/") + "/"
+        member_path = artifact_path.strip("/")
+        if block_size is None:
+            block_size = get_env_int(DOWNLOAD_PART_SIZE, DEFAULT_DOWNLOAD_PART_SIZE)
+
+        def open_object(path: str, must_exist: bool = True):
+            def open_file(fs):
+                try:
+                    return fs.open(path, "rb", block_size=block_size, cache_type=cache_type)
+                except FileNotFoundError:
+                    if must_exist:
+                        raise
+                    return None
+
+            return self._with_fs(open_file)
+
+        # The stored files take precedence over the archive members of the same path.
+        fileobj = open_object(root + member_path, must_exist=False)
+        if fileobj is not None:
+            return _open_decoded(self._get_client(), root + member_path, fileobj)
+        member = self._get_archive_catalog().members.get(member_path)
+        if member is None:
+            raise FileNotFoundError(root + member_path)
+        archive, offset, size = member
+        return MemberReader(open_object(root + archive), offset, size)
 
     def log_artifact(self, local_file: str, artifact_path: str = None):
         """
@@ -194,7 +738,38 @@ class OCIObjectStorageArtifactRepository(ArtifactRepository):
             raise ValueError("`artifact_path` must not be whitespace string.")
         artifact_path = artifact_path.rstrip("/") + "/" if artifact_path else ""
         dest_path = self.artifact_uri.rstrip("/") + "/" + artifact_path + os.path.basename(local_file)
+        if self._is_async():
+            ArtifactUploadQueue.get_instance().submit_file(
+                local_file, dest_path, callback=lambda: self._invalidate_index(dest_path)
+            )
+            return
         ArtifactUploader().upload(local_file, dest_path)
+        self._invalidate_index(dest_path)
+
+    def log_artifact_data(
+        self, data: Union[str, bytes, bytearray, memoryview, BinaryIO], artifact_file: str
+    ):
+        """
+        Logs in-memory data or the content of a file-like object as an artifact,
+        without writing it to a local file first.
+
+        Parameters
+        ----------
+        data: Union[str, bytes, bytearray, memoryview, BinaryIO]
+            The artifact content. Strings are encoded as UTF-8.
+        artifact_file: str
+            The run-relative artifact file path in posixpath format, e.g. "dir/file.json".
+        """
+        if not artifact_file or artifact_file.isspace() or artifact_file.endswith("/"):
+            raise ValueError("`artifact_file` must be a file path.")
+        dest_path = self.artifact_uri.rstrip("/") + "/" + artifact_file.lstrip("/")
+        if self._is_async():
+            ArtifactUploadQueue.get_instance().submit_data(
+                data, dest_path, callback=lambda: self._invalidate_index(dest_path)
+            )
+            return
+        ArtifactUploader().upload_stream(data, dest_path)
+        self._invalidate_index(dest_path)
 
     def log_artifacts(self, local_dir: str, artifact_path: str = None):
         """
@@ -208,7 +783,43 @@ class OCIObjectStorageArtifactRepository(ArtifactRepository):
         artifact_path:str
             Directory within the run's artifact directory in which to log the artifacts.
         """
-        artifact_uploader = ArtifactUploader()
+        if get_env_bool(SYNC_ARTIFACTS):
+            self.sync_artifacts(local_dir, artifact_path)
+            return
+        dest_path, files = self._local_artifact_files(local_dir, artifact_path)
+        if self._is_archived(files):
+            self.log_artifacts_archive(local_dir, artifact_path)
+            return
+        if self._is_async():
+            upload_queue = ArtifactUploadQueue.get_instance()
+            for local_file, file_dest_path in files:
+                upload_queue.submit_file(
+                    local_file, file_dest_path, callback=lambda: self._invalidate_index(dest_path)
+                )
+            return
+        try:
+            ArtifactUploader().upload_files(files)
+        finally:
+            self._invalidate_index(dest_path)
+
+    def _local_artifact_files(
+        self, local_dir: str, artifact_path: str = None
+    ) -> Tuple[str, List[Tuple[str, str]]]:
+        """
+        Lists the files of a local directory with the destination paths they are logged to.
+
+        Parameters
+        ----------
+        local_dir: str
+            Directory of local artifacts to log.
+        artifact_path: (str, optional). Defaults to None.
+            Directory within the run's artifact directory in which to log the artifacts.
+
+        Returns
+        -------
+        Tuple[str, List[Tuple[str, str]]]
+            The destination directory URI, and the (local file path, destination path) pairs.
+        """
         # Since the object storage path should contain "/", the code below needs to use concatenation "+" instead of 
         # os.path.join(). The latter can introduce "\" in Windows which can't be recognized by object storage as a valid prefix. 
         # `artifact_path` must not be space character like " " or "   ".
@@ -218,29 +829,586 @@ class OCIObjectStorageArtifactRepository(ArtifactRepository):
         dest_path = self.artifact_uri.rstrip("/") + "/" + artifact_path
         local_dir = os.path.abspath(local_dir)
 
+        files = []
         for root, _, filenames in os.walk(local_dir):
             upload_path = dest_path
             if root != local_dir:
                 rel_path = os.path.relpath(root, local_dir)
                 rel_path = relative_path_to_artifact_path(rel_path)
-                upload_path = dest_path + rel_path
+                upload_path = dest_path + rel_path + "/"
+            for f in filenames:
+                files.append((os.path.join(root, f), upload_path + f))
+        return dest_path, files
+
+    @staticmethod
+    def _is_archived(files: List[Tuple[str, str]]) -> bool:
+        """Checks whether a directory of files is logged as an archive, see `log_artifacts_archive`."""
+        return get_env_bool(ARCHIVE_ARTIFACTS) and len(files) >= get_env_int(
+            ARCHIVE_MIN_FILES, DEFAULT_ARCHIVE_MIN_FILES, allow_zero=True
+        )
+
+    def log_artifacts_archive(self, local_dir: str, artifact_path: str = None) -> str:
+        """
+        Logs the files of a local directory as a single tar archive, together with an index
+        of the member offsets. The tar stream is uploaded while it is written, without a local
+        copy. The members are listed and downloaded like regular artifacts, each member being
+        read with ranged requests. The archive is registered with a manifest object of its own,
+        so concurrent writers, in this process or others, never overwrite each other.
+
+        Parameters
+        ----------
+        local_dir: str
+            Directory of local artifacts to log.
+        artifact_path: (str, optional). Defaults to None.
+            Directory within the run's artifact directory in which to log the artifacts.
+
+        Returns
+        -------
+        str
+            The archive object path, relative to the run artifacts root.
+        """
+        if isinstance(artifact_path, str) and artifact_path.isspace():
+            raise ValueError("`artifact_path` must not be whitespace string.")
+        artifact_path = (artifact_path or "").strip("/")
+        archive_id = new_archive_id()
+        archive_path, index_path = archive_paths(artifact_path, archive_id)
+        root = self.artifact_uri.rstrip("/") + "/"
+        artifact_uploader = ArtifactUploader()
+
+        read_fd, write_fd = os.pipe()
+        result = {}
+
+        def write():
+            try:
+                with os.fdopen(write_fd, "wb") as f:
+                    result["members"] = write_tar(os.path.abspath(local_dir), f)
+            except BaseException as ex:
+                result["error"] = ex
+
+        writer = threading.Thread(target=write, daemon=True)
+        writer.start()
+        try:
+            with os.fdopen(read_fd, "rb") as stream:
+                artifact_uploader.upload_stream(stream, root + archive_path)
+        finally:
+            # Closing the pipe stops the writer if the upload failed.
+            writer.join()
+        if "error" in result:
+            # The upload completed with a truncated archive, which must not be kept.
+            bucket_name, namespace_name, object_name = parse_os_uri(root + archive_path)
+            try:
+                delete_object(self._get_client(), namespace_name, bucket_name, object_name)
+            except Exception as ex:
+                logger.debug(f"Failed to delete the truncated archive {archive_path}: {ex}")
+            raise result["error"]
+
+        artifact_uploader.upload_stream(json.dumps(result["members"]), root + index_path)
+        # The manifest is written last, so the archives it lists are complete.
+        artifact_uploader.upload_stream(
+            dump_manifest({"path": artifact_path, "archive": archive_path, "index": index_path}),
+            root + manifest_path(archive_id),
+        )
+        with self._archive_lock:
+            self._archive_cache.pop(self.artifact_uri, None)
+        self._invalidate_index(root + artifact_path)
+        logger.debug(f"Logged {len(result['members'])} file(s) as {archive_path}.")
+        return archive_path
+
+    def _read_artifact(self, path: str) -> Optional[bytes]:
+        """Reads an artifact into memory, returning None if it does not exist."""
+        uri = self.artifact_uri.rstrip("/") + "/" + path
+
+        def read(fs):
+            try:
+                return fs.cat_file(uri)
+            except FileNotFoundError:
+                return None
+
+        return self._with_fs(read)
+
+    def _read_archive_manifests(self) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        Reads the manifests of the archives logged under the run artifacts root.
+
+        Returns
+        -------
+        List[Tuple[str, Dict[str, str]]]
+            The manifest paths and contents, in the order the archives were logged.
+        """
+        manifest_dir = self.artifact_uri.rstrip("/") + "/" + ARCHIVE_MANIFEST_DIR
+
+        def list_manifests(fs):
+            try:
+                return fs.ls(manifest_dir, detail=False)
+            except FileNotFoundError:
+                return []
+
+        manifests = []
+        for name in sorted(posixpath.basename(name) for name in self._with_fs(list_manifests)):
+            if not name.endswith(".json"):
+                continue
+            path = f"{ARCHIVE_MANIFEST_DIR}/{name}"
+            content = self._read_artifact(path)
+            if content is not None:
+                manifests.append((path, read_manifest(content)))
+        return manifests
+
+    def _get_archive_catalog(self) -> ArchiveCatalog:
+        """
+        Gets the members of the archives logged under the run artifacts root. The catalog
+        is shared by all repository instances and expires after `OCI_MLFLOW_ARTIFACT_INDEX_TTL`
+        seconds, and only the `MAX_ARCHIVE_CATALOGS` most recently used runs are kept. It is
+        loaded whether or not `OCI_MLFLOW_ARCHIVE_ARTIFACTS` is set, since the archives may
+        have been logged by another process.
+
+        Returns
+        -------
+        ArchiveCatalog
+            The catalog, empty if no archive was logged.
+        """
+        ttl = get_env_int(ARTIFACT_INDEX_TTL, DEFAULT_ARTIFACT_INDEX_TTL, allow_zero=True)
+        with self._archive_lock:
+            catalog = self._archive_cache.get(self.artifact_uri)
+            if catalog and time.monotonic() - catalog.created_at < ttl:
+                self._archive_cache.move_to_end(self.artifact_uri)
+                return catalog
+
+        catalog = ArchiveCatalog()
+        for _, archive in self._read_archive_manifests():
+            index = self._read_artifact(archive["index"])
+            if index is None:
+                # The archive was deleted.
+                continue
+            catalog.add(archive["path"], archive["archive"], json.loads(index))
+        with self._archive_lock:
+            self._archive_cache[self.artifact_uri] = catalog
+            self._archive_cache.move_to_end(self.artifact_uri)
+            while len(self._archive_cache) > MAX_ARCHIVE_CATALOGS:
+                self._archive_cache.popitem(last=False)
+        return catalog
+
+    def _with_archive_members(
+        self, path: str, infos: List[FileInfo], recursive: bool = False
+    ) -> List[FileInfo]:
+        """
+        Adds the archive members to a listing, hiding the archive bookkeeping objects. The
+        archive catalog is only read when the listing holds archives, or when nothing is
+        stored under the path, which may then be inside an archived directory.
+        """
+        if infos and not any(is_archive_path(info.path) for info in infos):
+            return sorted(infos, key=lambda f: f.path)
+        catalog = self._get_archive_catalog()
+        infos = [info for info in infos if not is_archive_path(info.path)]
+        path = path.strip("/")
+        members = catalog.index.files(path) if recursive else catalog.index.list(path)
+        listed = {info.path for info in infos}
+        infos.extend(info for info in members if info.path not in listed)
+        return sorted(infos, key=lambda f: f.path)
+
+    def _download_members(self, members: Dict[str, Tuple[str, int, int]], dst_path: str):
+        """
+        Downloads archive members concurrently with ranged `GetObject` requests of at most
+        `OCI_MLFLOW_DOWNLOAD_PART_SIZE` bytes. Neighbouring small members share a request,
+        see `_member_spans`, and larger members are read in several.
+
+        Parameters
+        ----------
+        members: Dict[str, Tuple[str, int, int]]
+            The member paths mapped to their (archive path, data offset, size).
+        dst_path: str
+            The local destination directory.
+
+        Raises
+        ------
+        ArtifactTransferError
+            If any of the members could not be downloaded.
+        """
+        part_size = get_env_int(DOWNLOAD_PART_SIZE, DEFAULT_DOWNLOAD_PART_SIZE)
+        root = self.artifact_uri.rstrip("/") + "/"
+        clients = {"client": self._get_client()}
+
+        def reauthenticate():
+            clients["client"] = self._get_client(refresh=True)
+
+        def download(archive: str, start: int, end: int, span: List[Tuple[str, int, int]]):
+            bucket_name, namespace_name, object_name = parse_os_uri(root + archive)
+
+            def read(range_start: int, range_end: int) -> bytes:
+                return call_with_retry(
+                    lambda: _get_object_range(
+                        clients["client"],
+                        namespace_name,
+                        bucket_name,
+                        object_name,
+                        range_start,
+                        range_end,
+                    ),
+                    retries=DEFAULT_DOWNLOAD_RETRIES,
+                    description=f"download of {archive}",
+                    reauthenticate=reauthenticate,
+                )
+
+            def write(member_path: str, chunks: Iterator[bytes]):
+                local_path = os.path.join(dst_path, *member_path.split("/"))
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                tmp_path = local_path + PARTIAL_DOWNLOAD_SUFFIX
+                with open(tmp_path, "wb") as f:
+                    for chunk in chunks:
+                        f.write(chunk)
+                os.replace(tmp_path, local_path)
+
+            if len(span) == 1:
+                member_path, offset, size = span[0]
+                with TransferMetrics.measure("download", root + member_path, bytes=size) as event:
+                    parts = range(offset, offset + size, part_size)
+                    event.parts = len(parts)
+                    write(
+                        member_path,
+                        (read(part, min(part + part_size, offset + size)) for part in parts),
+                    )
+                return
+            with TransferMetrics.measure("download", root + archive, bytes=end - start, parts=1):
+                data = memoryview(read(start, end))
+            for member_path, offset, size in span:
+                write(member_path, [data[offset - start : offset - start + size]])
+
+        spans = {span[3][0][0]: span for span in _member_spans(members, part_size)}
+        max_workers = get_env_int(DOWNLOAD_CONCURRENCY, DEFAULT_DOWNLOAD_CONCURRENCY)
+        try:
+            run_parallel(
+                download,
+                spans.items(),
+                max_workers=min(max_workers, len(spans)),
+                operation="download",
+            )
+        except ArtifactTransferError as ex:
+            # Report the members of the failed ranges.
+            failures = {
+                member_path: error
+                for name, error in ex.failures.items()
+                for member_path, _, _ in spans[name][3]
+            }
+            raise ArtifactTransferError("download", failures, len(members)) from ex
+
+    def _prune_archives(self, artifact_path: str = None):
+        """Deletes the manifests of the archives stored under a deleted path."""
+        with self._archive_lock:
+            self._archive_cache.pop(self.artifact_uri, None)
+        path = (artifact_path or "").strip("/")
+        if not path:
+            # Deleting the root deletes the manifests as well.
+            return
+        root = self.artifact_uri.rstrip("/") + "/"
+        client = None
+        for manifest, archive in self._read_archive_manifests():
+            if archive["archive"].startswith(path + "/"):
+                client = client or self._get_client()
+                bucket_name, namespace_name, object_name = parse_os_uri(root + manifest)
+                delete_object(client, namespace_name, bucket_name, object_name)
+
+    def sync_artifacts(
+        self,
+        local_dir: str,
+        artifact_path: str = None,
+        delete: bool = None,
+        max_workers: int = None,
+    ) -> SyncSummary:
+        """
+        Incrementally syncs a local directory to the artifacts. The destination is listed
+        once and only the new or changed files are uploaded. A file is unchanged when the
+        stored object has the same size and MD5, read from the listing or, for multipart
+        and compressed uploads, from the object metadata.
+
+        Parameters
+        ----------
+        local_dir: str
+            Directory of local artifacts to sync.
+        artifact_path: (str, optional). Defaults to None.
+            Directory within the run's artifact directory in which to sync the artifacts.
+        delete: (bool, optional). Defaults to `OCI_MLFLOW_SYNC_DELETE` or False.
+            Whether to delete the stored artifacts whose files are gone locally.
+        max_workers: (int, optional). Defaults to `OCI_MLFLOW_UPLOAD_CONCURRENCY` or 8.
+            The maximum number of files uploaded in parallel.
+
+        Returns
+        -------
+        SyncSummary
+            The number of files uploaded, skipped and deleted.
+
+        Raises
+        ------
+        ArtifactTransferError
+            If any of the files could not be uploaded or deleted.
+        """
+        if isinstance(artifact_path, str) and artifact_path.isspace():
+            raise ValueError("`artifact_path` must not be whitespace string.")
+        if delete is None:
+            delete = get_env_bool(SYNC_DELETE)
+        artifact_path = artifact_path.rstrip("/") + "/" if artifact_path else ""
+        dest_path = self.artifact_uri.rstrip("/") + "/" + artifact_path
+        bucket_name, namespace_name, prefix = parse_os_uri(dest_path)
+        local_dir = os.path.abspath(local_dir)
+
+        # The archive bookkeeping objects have no local counterpart and are never deleted.
+        remote = {
+            obj.name[len(prefix):]: obj
+            for obj in self._iter_objects(dest_path)
+            if obj.name.startswith(prefix)
+            and not obj.name.endswith("/")
+            and not is_archive_path(artifact_path + obj.name[len(prefix):])
+        }
+        # The MD5 is recorded on every upload, so the multipart uploads are skipped next time.
+        artifact_uploader = ArtifactUploader(record_md5=True)
+        summary = SyncSummary()
+        files = []
+        md5s = {}
+        for root, _, filenames in os.walk(local_dir):
+            rel_dir = ""
+            if root != local_dir:
+                rel_dir = relative_path_to_artifact_path(os.path.relpath(root, local_dir)) + "/"
             for f in filenames:
-                artifact_uploader.upload(
-                    file_path=os.path.join(root, f),
-                    dst_path=upload_path + f
+                local_file = os.path.join(root, f)
+                obj = remote.pop(rel_dir + f, None)
+                if obj is not None:
+                    size = os.path.getsize(local_file)
+                    # The listing reports the compressed size, the metadata has the original
+                    # one, and the MD5 of the multipart uploads.
+                    compressible = artifact_uploader.is_compressible(local_file)
+                    if obj.size == size or compressible:
+                        md5s[local_file] = md5 = file_md5(local_file)
+                        unchanged = is_unchanged(obj, size, md5)
+                        if unchanged is None or (not unchanged and compressible):
+                            unchanged = artifact_uploader._is_uploaded(
+                                size, namespace_name, bucket_name, obj.name, md5
+                            )
+                        if unchanged:
+                            summary.skipped += 1
+                            continue
+                files.append((local_file, dest_path + rel_dir + f))
+
+        try:
+            artifact_uploader.upload_files(files, max_workers=max_workers, md5s=md5s)
+            summary.uploaded = len(files)
+            if delete and remote:
+                client = self._get_client()
+
+                def on_deleted(name: str, error: Optional[Exception]):
+                    if error is None:
+                        summary.deleted += 1
+
+                run_parallel(
+                    delete_object,
+                    (
+                        (obj.name, (client, namespace_name, bucket_name, obj.name))
+                        for obj in remote.values()
+                    ),
+                    max_workers=get_env_int(DELETE_CONCURRENCY, DEFAULT_DELETE_CONCURRENCY),
+                    operation="delete",
+                    callback=on_deleted,
                 )
+        finally:
+            self._invalidate_index(dest_path)
+
+        logger.debug(
+            f"Synced {local_dir} to {dest_path}: {summary.uploaded} uploaded, "
+            f"{summary.skipped} skipped, {summary.deleted} deleted."
+        )
+        return summary
+
+    @staticmethod
+    def _is_async() -> bool:
+        """Whether the artifacts are logged asynchronously, see `OCI_MLFLOW_ASYNC_ARTIFACT_LOGGING`."""
+        return get_env_bool(ASYNC_ARTIFACT_LOGGING)
 
-    def get_fs(self):
+    @staticmethod
+    def _wait_for_uploads():
+        """Waits for the asynchronous uploads, so reads observe the artifacts logged before."""
+        if ArtifactUploadQueue._instance is not None:
+            ArtifactUploadQueue._instance.wait()
+
+    def get_fs(self, refresh: bool = False):
         """
         Gets fssepc filesystem based on the uri scheme.
+
+        The filesystem is cached per auth type and profile, or per delegation token path, for
+        `OCI_MLFLOW_FS_CACHE_TTL` seconds (1 hour by default), and is recreated earlier when
+        the delegation token backing its signer is rotated or its signer is recreated. The
+        filesystem of a rotated token replaces the previous one in the cache.
+
+        Parameters
+        ----------
+        refresh: (bool, optional). Defaults to False.
+            Whether to recreate the filesystem with a freshly resolved signer.
         """
-        self.fs = fsspec.filesystem(
-            urlparse(self.artifact_uri).scheme,
-            **get_signer(token_path=get_token_path()),
-        )  # FileSystem class corresponding to the URI scheme.
+        scheme = urlparse(self.artifact_uri).scheme
+        token_path = get_token_path()
+        key = (scheme, *signer_key(token_path))
+        state = token_file_state(token_path)
+        ttl = get_env_int(FS_CACHE_TTL, DEFAULT_FS_CACHE_TTL, allow_zero=True)
+        with self._fs_lock:
+            cached = self._fs_cache.get(key)
+            if (
+                not refresh
+                and cached
+                and cached[1] == state
+                and time.monotonic() - cached[0] < ttl
+            ):
+                self.fs = cached[2]
+                return self.fs
+            self.fs = fsspec.filesystem(
+                scheme,
+                skip_instance_cache=True,
+                **get_signer(token_path=token_path, refresh=refresh),
+            )  # FileSystem class corresponding to the URI scheme.
+            self._fs_cache[key] = (time.monotonic(), state, self.fs)
 
         return self.fs
 
+    @classmethod
+    def clear_fs_cache(cls):
+        """Drops the cached filesystems, so the next operation re-resolves the signer."""
+        with cls._fs_lock:
+            cls._fs_cache.clear()
+
+    def _with_fs(self, operation: Callable[[fsspec.AbstractFileSystem], Any]) -> Any:
+        """
+        Runs an operation on the cached filesystem. If the credentials of the cached
+        filesystem were rejected, the filesystem is re-signed and the operation is retried once.
+
+        The listings cached by the filesystem are dropped first, since artifacts are
+        uploaded through the `UploadManager` and the filesystem does not see those writes.
+
+        Parameters
+        ----------
+        operation: Callable[[fsspec.AbstractFileSystem], Any]
+            The operation to run.
+
+        Returns
+        -------
+        Any
+            The result of the operation.
+        """
+        fs = self.get_fs()
+        fs.invalidate_cache()
+        try:
+            return operation(fs)
+        except Exception as ex:
+            if not is_auth_error(ex):
+                raise
+            logger.debug(f"Credentials rejected, re-signing the filesystem: {ex}")
+            return operation(self.get_fs(refresh=True))
+
+    def _get_client(self, refresh: bool = False) -> object_storage.ObjectStorageClient:
+        """Gets the pooled Object Storage client, optionally replacing it with a re-signed one."""
+        token_path = get_token_path()
+        auth = get_signer(token_path=token_path, refresh=refresh)
+        if refresh:
+            ObjectStorageClientPool.invalidate(auth, token_path)
+        return ObjectStorageClientPool.get_client(auth, token_path)
+
+    def _iter_objects(self, uri: str) -> Iterator[object_storage.models.ObjectSummary]:
+        """Streams the objects under the URI, re-signing once if the credentials were rejected."""
+        yielded = False
+        try:
+            for obj in iter_objects(self._get_client(), uri):
+                yielded = True
+                yield obj
+        except ServiceError as ex:
+            if yielded or not is_auth_error(ex):
+                raise
+            logger.debug(f"Credentials rejected, re-signing the client: {ex}")
+            yield from iter_objects(self._get_client(refresh=True), uri)
+
+    def _get_index(self, dest_path: str) -> ArtifactIndex:
+        """
+        Gets the directory index covering the given path. Indexes are shared by all
+        repository instances and expire after `OCI_MLFLOW_ARTIFACT_INDEX_TTL` seconds,
+        since artifacts may also be written by other processes.
+
+        Parameters
+        ----------
+        dest_path: str
+            The URI of the listed directory. A new index is built from a single flat
+            listing of this directory when no cached index covers it.
+
+        Returns
+        -------
+        ArtifactIndex
+            The directory index.
+        """
+        ttl = get_env_int(ARTIFACT_INDEX_TTL, DEFAULT_ARTIFACT_INDEX_TTL, allow_zero=True)
+        dest_path = dest_path.rstrip("/")
+        with self._index_lock:
+            now = time.monotonic()
+            for root, index in list(self._index_cache.items()):
+                if now - index.created_at >= ttl:
+                    del self._index_cache[root]
+                elif dest_path == root or dest_path.startswith(root + "/"):
+                    return index
+
+        index = ArtifactIndex(dest_path)
+        _, _, prefix = parse_os_uri(dest_path)
+        prefix = prefix.rstrip("/")
+        for obj in self._iter_objects(dest_path):
+            path = obj.name[len(prefix) :] if prefix else obj.name
+            if path.strip("/"):
+                index.add(path, obj.size or 0, is_dir=obj.name.endswith("/"))
+        logger.debug(f"Indexed the artifacts of {dest_path}.")
+
+        with self._index_lock:
+            self._index_cache[dest_path] = index
+        return index
+
+    def _invalidate_index(self, dest_path: str):
+        """Drops the cached indexes affected by a write to the given path."""
+        dest_path = dest_path.rstrip("/")
+        with self._index_lock:
+            for root in list(self._index_cache):
+                if (
+                    root == dest_path
+                    or root.startswith(dest_path + "/")
+                    or dest_path.startswith(root + "/")
+                ):
+                    del self._index_cache[root]
+
+    def _list_from_index(self, dest_path: str, recursive: bool = False) -> List[FileInfo]:
+        """Lists the artifacts under a directory using the cached directory index."""
+        index = self._get_index(dest_path)
+        sub_path = posixpath.relpath(dest_path.rstrip("/"), index.root)
+        infos = index.files(sub_path) if recursive else index.list(sub_path)
+        return [
+            FileInfo(
+                posixpath.relpath(posixpath.join(index.root, info.path), self.artifact_uri),
+                info.is_dir,
+                info.file_size,
+            )
+            for info in infos
+        ]
+
+    def list_artifacts_recursive(self, path: str = "") -> List[FileInfo]:
+        """
+        Return all the files for this run_id under path, recursively. The whole directory
+        is fetched with a single paginated listing and kept in an in-memory index, which
+        also answers the following `list_artifacts` calls until an artifact is written.
+
+        Parameters
+        ----------
+        path:str
+            Relative source path that contains desired artifacts
+
+        Returns
+        -------
+        List[FileInfo]
+            List of files as FileInfo listed under path.
+        """
+        dest_path = self.artifact_uri
+        if path:
+            dest_path = os.path.join(dest_path, path)
+        self._wait_for_uploads()
+        with TransferMetrics.measure("list", dest_path):
+            infos = self._list_from_index(dest_path, recursive=True)
+        return self._with_archive_members(path, infos, recursive=True)
+
     def list_artifacts(self, path: str = "") -> List[FileInfo]:
         """
         Return all the artifacts for this run_id directly under path. If path is a file, returns
@@ -262,24 +1430,40 @@ class OCIObjectStorageArtifactRepository(ArtifactRepository):
             dest_path = os.path.join(dest_path, path)
 
         logger.debug(f"{path=}, {self.artifact_uri=}, {dest_path=}")
+        self._wait_for_uploads()
 
-        fs = self.get_fs()
-        files = (
-            os.path.relpath(f"{OCI_PREFIX}{f}", self.artifact_uri)
-            for f in fs.glob(f"{dest_path}/*")
-        )
+        if get_env_bool(LIST_RECURSIVE):
+            with TransferMetrics.measure("list", dest_path):
+                infos = self._list_from_index(dest_path)
+            return self._with_archive_members(path, infos)
+
+        # A single delimiter based listing returns both the sub-directories (prefixes)
+        # and the files with their sizes, no extra requests are needed per entry.
+        def list_dir(fs):
+            try:
+                entries = fs.ls(dest_path, detail=True)
+            except FileNotFoundError:
+                return []
+            listed_path = os.path.relpath(dest_path, self.artifact_uri)
+            infos = []
+            for entry in entries:
+                file = os.path.relpath(
+                    f"{OCI_PREFIX}{entry['name'].rstrip('/')}", self.artifact_uri
+                )
+                if file == listed_path:
+                    continue
+                file_isdir = entry.get("type") == "directory"
+                size = 0 if file_isdir else entry.get("size") or 0
+                infos.append(FileInfo(file, file_isdir, size))
+            return infos
 
-        for file in files:
-            file_isdir = fs.isdir(os.path.join(self.artifact_uri, file))
-            size = 0
-            if not file_isdir:
-                size = fs.info(os.path.join(self.artifact_uri, file)).get("size", 0)
-            result.append(FileInfo(file, file_isdir, size))
+        with TransferMetrics.measure("list", dest_path):
+            result.extend(self._with_fs(list_dir))
 
         logger.debug(f"{result=}")
 
         result.sort(key=lambda f: f.path)
-        return result
+        return self._with_archive_members(path, result)
 
     def delete_artifacts(self, artifact_path: str = None):
         """
@@ -291,11 +1475,88 @@ class OCIObjectStorageArtifactRepository(ArtifactRepository):
         ----------
         artifact_path: str
             Path of the artifact to delete.
+
+        Raises
+        ------
+        ArtifactTransferError
+            If any of the artifacts could not be deleted.
+        """
+        self.bulk_delete_artifacts(artifact_path)
+
+    def bulk_delete_artifacts(
+        self,
+        artifact_path: str = None,
+        dry_run: bool = False,
+        max_workers: int = None,
+        progress_callback: Callable[[DeleteSummary], None] = None,
+    ) -> DeleteSummary:
+        """
+        Deletes the artifacts at the specified location with bounded concurrency.
+        The objects are streamed page by page from a flat listing of the location
+        and deleted while the listing is still in progress.
+
+        Parameters
+        ----------
+        artifact_path: (str, optional). Defaults to None.
+            Path of the artifact to delete. The whole artifact directory is deleted if not provided.
+        dry_run: (bool, optional). Defaults to False.
+            Whether to only count the objects and bytes which would be deleted.
+        max_workers: (int, optional). Defaults to `OCI_MLFLOW_DELETE_CONCURRENCY` or 16.
+            The maximum number of objects deleted in parallel.
+        progress_callback: (Callable[[DeleteSummary], None], optional). Defaults to None.
+            The function called with the running summary after each processed object.
+
+        Returns
+        -------
+        DeleteSummary
+            The number of objects and bytes found and deleted.
+
+        Raises
+        ------
+        ArtifactTransferError
+            If any of the objects could not be deleted.
         """
         dest_path = self.artifact_uri
         if artifact_path:
             dest_path = os.path.join(self.artifact_uri, artifact_path)
-        fs = self.get_fs()
-        files = fs.ls(dest_path, refresh=True)
-        for to_delete_obj in files:
-            fs.delete(to_delete_obj)
+        if max_workers is None:
+            max_workers = get_env_int(DELETE_CONCURRENCY, DEFAULT_DELETE_CONCURRENCY)
+        bucket_name, namespace_name, _ = parse_os_uri(dest_path)
+        client = self._get_client()
+        summary = DeleteSummary()
+        lock = threading.Lock()
+
+        def listed() -> Iterator[Tuple[str, Tuple]]:
+            for obj in self._iter_objects(dest_path):
+                with lock:
+                    summary.objects += 1
+                    summary.bytes += obj.size or 0
+                if dry_run:
+                    if progress_callback:
+                        progress_callback(summary)
+                    continue
+                yield obj.name, (client, namespace_name, bucket_name, obj.name)
+
+        def on_deleted(name: str, error: Optional[Exception]):
+            with lock:
+                if error:
+                    summary.failures[name] = error
+                else:
+                    summary.deleted += 1
+                if progress_callback:
+                    progress_callback(summary)
+
+        try:
+            run_parallel(
+                delete_object, listed(), max_workers, operation="delete", callback=on_deleted
+            )
+        finally:
+            if not dry_run:
+                self._invalidate_index(dest_path)
+                self._prune_archives(artifact_path)
+
+        logger.debug(
+            f"{'Found' if dry_run else 'Deleted'} {summary.objects} object(s), "
+            f"{summary.bytes} byte(s) under {dest_path}."
+        )
+        return summary
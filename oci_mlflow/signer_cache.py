@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+"""
+Process-wide cache of the OCI signers.
+
+Creating a signer loads the OCI config or, for resource and instance principals, requests
+a security token from the identity service, which is too slow to repeat for every request.
+The cached signers are shared by all threads. A daemon thread renews the security tokens
+of the principal signers `OCI_MLFLOW_SIGNER_REFRESH_MARGIN` seconds (5 minutes by default)
+before they expire, so requests never wait for a token.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from ads.common import auth
+
+from oci_mlflow import logger
+from oci_mlflow.env import get_env_float
+
+SIGNER_REFRESH_MARGIN = "OCI_MLFLOW_SIGNER_REFRESH_MARGIN"
+SIGNER_REFRESH_INTERVAL = "OCI_MLFLOW_SIGNER_REFRESH_INTERVAL"
+DEFAULT_SIGNER_REFRESH_MARGIN = 300
+DEFAULT_SIGNER_REFRESH_INTERVAL = 30
+
+
+def auth_settings() -> Tuple:
+    """
+    Gets the ADS auth settings the default signer is created from.
+
+    Returns
+    -------
+    Tuple
+        The auth type, the OCI config location and the OCI config profile.
+    """
+    state = auth.AuthState() if hasattr(auth, "AuthState") else None
+    return (
+        getattr(state, "oci_iam_type", None) or os.environ.get("OCI_IAM_TYPE"),
+        getattr(state, "oci_config_path", None) or os.environ.get("OCI_CONFIG_LOCATION"),
+        getattr(state, "oci_key_profile", None) or os.environ.get("OCI_CONFIG_PROFILE"),
+    )
+
+
+def _jwt_expiry(token: str) -> Optional[float]:
+    """Reads the expiry time of a JWT, without verifying it."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def token_expiry(signer) -> Optional[float]:
+    """
+    Gets the expiry time of the security token held by a signer.
+
+    Parameters
+    ----------
+    signer:
+        The OCI signer.
+
+    Returns
+    -------
+    Optional[float]
+        The expiry time in seconds since the epoch, None if the signer
+        does not hold a security token, e.g. for API keys.
+    """
+    # The instance principal, resource principal and delegation token signers keep the
+    # token in a `SecurityTokenContainer` of their federation client.
+    for holder in (getattr(signer, "federation_client", None), signer):
+        if holder is None:
+            continue
+        for name in ("security_token", "_security_token"):
+            token = getattr(holder, name, None)
+            if token is None:
+                continue
+            claims = getattr(token, "jwt", None)
+            if isinstance(claims, dict) and "exp" in claims:
+                return float(claims["exp"])
+            expiry = _jwt_expiry(getattr(token, "security_token", token))
+            if expiry is not None:
+                return expiry
+    return None
+
+
+@dataclass
+class CachedSigner:
+    """Class representing a cached signer.
+
+    Attributes
+    ----------
+    auth: Dict
+        The signer dictionary, with the config, signer and client_kwargs keys.
+    factory: Callable[[], Dict]
+        The function creating the signer dictionary.
+    state: Hashable
+        The state of the files backing the signer, the entry is recreated when it changes.
+    expires_at: Optional[float]
+        The expiry time of the signer security token, None if unknown.
+    """
+
+    auth: Dict
+    factory: Callable[[], Dict]
+    state: Hashable = None
+    expires_at: Optional[float] = None
+
+
+class SignerCache:
+    """
+    Process-wide, thread-safe cache of the signers, keyed by the auth settings they were
+    created from.
+
+    Examples
+    --------
+    >>> auth = SignerCache.get(("resource_principal", None), lambda: default_signer())
+    >>> SignerCache.stats()
+    {'hits': 0, 'misses': 1, 'refreshes': 0, 'refresh_errors': 0}
+    """
+
+    _lock = threading.Lock()
+    _entries: Dict[Hashable, CachedSigner] = {}
+    # The counters, keyed by (signer key, counter name).
+    _stats = Counter()
+    _refresher: Optional[threading.Thread] = None
+    _listeners: List[Callable[[Dict], None]] = []
+
+    @classmethod
+    def get(
+        cls,
+        key: Hashable,
+        factory: Callable[[], Dict],
+        state: Hashable = None,
+        refresh: bool = False,
+    ) -> Dict:
+        """
+        Gets the cached signer dictionary, creating it if needed.
+
+        Parameters
+        ----------
+        key: Hashable
+            The auth settings the signer is created from.
+        factory: Callable[[], Dict]
+            The function creating the signer dictionary.
+        state: (Hashable, optional). Defaults to None.
+            The state of the files backing the signer, e.g. the delegation token
+            modification time. The signer is recreated when it changes.
+        refresh: (bool, optional). Defaults to False.
+            Whether to recreate the signer, e.g. after its credentials were rejected.
+
+        Returns
+        -------
+        Dict
+            The signer dictionary, shared by all the callers.
+        """
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is not None and entry.state == state and not refresh:
+                cls._stats[key, "hits"] += 1
+                return entry.auth
+            cls._stats[key, "misses"] += 1
+        # The signer is created outside of the lock, concurrent misses of the same key
+        # may create it twice, the last one wins.
+        auth = factory()
+        entry = CachedSigner(
+            auth=auth,
+            factory=factory,
+            state=state,
+            expires_at=token_expiry(auth.get("signer")),
+        )
+        with cls._lock:
+            cls._entries[key] = entry
+            if entry.expires_at is not None:
+                cls._start_refresher()
+        return auth
+
+    @classmethod
+    def refresh(cls, force: bool = False) -> int:
+        """
+        Renews the security tokens of the cached signers close to their expiry.
+
+        Principal signers renew their token in place, so the clients already created
+        with them keep working. The other signers are recreated, and the listeners are
+        called with the replaced signer dictionary, see `add_listener`.
+
+        Parameters
+        ----------
+        force: (bool, optional). Defaults to False.
+            Whether to renew all the tokens, regardless of their expiry.
+
+        Returns
+        -------
+        int
+            The number of renewed signers.
+        """
+        margin = get_env_float(
+            SIGNER_REFRESH_MARGIN, DEFAULT_SIGNER_REFRESH_MARGIN, allow_zero=True
+        )
+        deadline = time.time() + margin
+        with cls._lock:
+            due = [
+                (key, entry)
+                for key, entry in cls._entries.items()
+                if entry.expires_at is not None and (force or entry.expires_at <= deadline)
+            ]
+        refreshed = 0
+        for key, entry in due:
+            try:
+                signer = entry.auth.get("signer")
+                if callable(getattr(signer, "refresh_security_token", None)):
+                    signer.refresh_security_token()
+                    auth = entry.auth
+                else:
+                    auth = entry.factory()
+                expires_at = token_expiry(auth.get("signer"))
+            except Exception as ex:
+                logger.warning(f"Failed to refresh the OCI signer security token: {ex}")
+                with cls._lock:
+                    cls._stats[key, "refresh_errors"] += 1
+                continue
+            with cls._lock:
+                if cls._entries.get(key) is entry:
+                    cls._entries[key] = CachedSigner(auth, entry.factory, entry.state, expires_at)
+                cls._stats[key, "refreshes"] += 1
+                listeners = list(cls._listeners) if auth is not entry.auth else []
+            for listener in listeners:
+                try:
+                    listener(entry.auth)
+                except Exception as ex:
+                    logger.warning(f"Failed to release the replaced OCI signer: {ex}")
+            refreshed += 1
+        return refreshed
+
+    @classmethod
+    def add_listener(cls, listener: Callable[[Dict], None]):
+        """
+        Registers a function called with the replaced signer dictionary whenever `refresh`
+        recreates a signer, so the clients created with the replaced signer can be dropped.
+
+        Parameters
+        ----------
+        listener: Callable[[Dict], None]
+            The function to call.
+        """
+        with cls._lock:
+            if listener not in cls._listeners:
+                cls._listeners.append(listener)
+
+    @classmethod
+    def stats(cls, key: Hashable = None) -> Dict[str, int]:
+        """
+        Gets the number of cache hits, misses, token refreshes and failed refreshes.
+
+        Parameters
+        ----------
+        key: (Hashable, optional). Defaults to None.
+            The key of the signer to get the counters of. The counters of all
+            the signers are summed up by default.
+
+        Returns
+        -------
+        Dict[str, int]
+            The counter names mapped to their values.
+        """
+        totals = Counter()
+        with cls._lock:
+            for (counter_key, name), value in cls._stats.items():
+                if key is None or counter_key == key:
+                    totals[name] += value
+        return {name: totals[name] for name in ("hits", "misses", "refreshes", "refresh_errors")}
+
+    @classmethod
+    def clear(cls):
+        """Drops the cached signers and resets the counters, e.g. after changing the auth settings."""
+        with cls._lock:
+            cls._entries.clear()
+            cls._stats.clear()
+
+    @classmethod
+    def _start_refresher(cls):
+        """Starts the background refresh thread, if not running. Must be called with the lock held."""
+        if cls._refresher is not None and cls._refresher.is_alive():
+            return
+        cls._refresher = threading.Thread(
+            target=cls._refresh_loop, name="oci-mlflow-signer-refresh", daemon=True
+        )
+        cls._refresher.start()
+
+    @classmethod
+    def _refresh_loop(cls):
+        """Periodically renews the tokens close to their expiry."""
+        while True:
+            time.sleep(get_env_float(SIGNER_REFRESH_INTERVAL, DEFAULT_SIGNER_REFRESH_INTERVAL))
+            try:
+                cls.refresh()
+            except Exception as ex:
+                logger.debug(f"OCI signer refresh failed: {ex}")
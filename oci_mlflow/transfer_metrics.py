@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+from oci_mlflow import logger
+from oci_mlflow.env import get_env_bool
+
+TRANSFER_METRICS_SUMMARY = "OCI_MLFLOW_TRANSFER_METRICS_SUMMARY"
+OPENTELEMETRY = "OCI_MLFLOW_OPENTELEMETRY"
+INSTRUMENTATION_NAME = "oci.mlflow"
+
+
+@dataclass
+class TransferEvent:
+    """Class representing a measured artifact operation.
+
+    Attributes
+    ----------
+    operation: str
+        The operation, one of "upload", "download", "list", "delete" and "sign".
+    path: str
+        The URI or the path the operation applies to.
+    start: float
+        The wall clock start time in seconds since the epoch.
+    seconds: float
+        The duration of the operation, including its retries.
+    bytes: int
+        The number of payload bytes transferred.
+    parts: int
+        The number of requests the payload was split into.
+    retries: int
+        The number of retried attempts.
+    error: Optional[Exception]
+        The error the operation failed with, None if it succeeded.
+    """
+
+    operation: str
+    path: str
+    start: float = 0.0
+    seconds: float = 0.0
+    bytes: int = 0
+    parts: int = 0
+    retries: int = 0
+    error: Optional[Exception] = None
+
+    @property
+    def throughput(self) -> float:
+        """The payload throughput in bytes per second."""
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+
+class TransferMetrics:
+    """
+    Registry of the artifact transfer measurements.
+
+    Every measured operation is aggregated per operation type for the `summary` and passed
+    to the registered callbacks. Setting `OCI_MLFLOW_OPENTELEMETRY` exports the events as
+    OpenTelemetry spans and metrics, and setting `OCI_MLFLOW_TRANSFER_METRICS_SUMMARY`
+    logs the summary when the interpreter exits.
+
+    Examples
+    --------
+    >>> TransferMetrics.register_callback(lambda event: print(event.operation, event.seconds))
+    >>> mlflow.log_artifacts("outputs")
+    >>> print(TransferMetrics.format_summary())
+    """
+
+    _lock = threading.Lock()
+    _local = threading.local()
+    _callbacks: List[Callable[[TransferEvent], None]] = []
+    _stats: Dict[str, Dict[str, float]] = {}
+    _configured = False
+
+    @classmethod
+    def register_callback(cls, callback: Callable[[TransferEvent], None]):
+        """Registers a function called with every measured operation.
+
+        Parameters
+        ----------
+        callback: Callable[[TransferEvent], None]
+            The function to call. It runs on the thread performing the operation
+            and must not raise.
+        """
+        with cls._lock:
+            if callback not in cls._callbacks:
+                cls._callbacks = cls._callbacks + [callback]
+
+    @classmethod
+    def unregister_callback(cls, callback: Callable[[TransferEvent], None]):
+        """Unregisters a function registered with `register_callback`."""
+        with cls._lock:
+            cls._callbacks = [cb for cb in cls._callbacks if cb != callback]
+
+    @classmethod
+    @contextmanager
+    def measure(cls, operation: str, path: str = "", **kwargs) -> Iterator[TransferEvent]:
+        """Measures an operation, recording it when the block exits.
+
+        Measurements of the same operation nested on the same thread, like an upload
+        attempt within its retry loop, are merged into the outermost one.
+
+        Parameters
+        ----------
+        operation: str
+            The operation name.
+        path: (str, optional). Defaults to "".
+            The URI or the path the operation applies to.
+        kwargs:
+            The initial `TransferEvent` attributes, e.g. `bytes` or `parts`.
+
+        Yields
+        ------
+        TransferEvent
+            The event, to update with the details known during the operation.
+        """
+        current = getattr(cls._local, "event", None)
+        if current is not None and current.operation == operation:
+            yield current
+            return
+        event = TransferEvent(operation=operation, path=path, start=time.time(), **kwargs)
+        cls._local.event = event
+        started = time.perf_counter()
+        try:
+            yield event
+        except BaseException as ex:
+            event.error = ex
+            raise
+        finally:
+            event.seconds = time.perf_counter() - started
+            cls._local.event = current
+            cls.record(event)
+
+    @classmethod
+    def current(cls) -> Optional[TransferEvent]:
+        """Gets the event of the operation measured on the current thread, if any."""
+        return getattr(cls._local, "event", None)
+
+    @classmethod
+    @contextmanager
+    def attach(cls, event: Optional[TransferEvent]) -> Iterator[None]:
+        """Attributes the work of the current thread to an operation measured on another thread.
+
+        Parameters
+        ----------
+        event: Optional[TransferEvent]
+            The event returned by `current` on the thread measuring the operation.
+        """
+        previous = getattr(cls._local, "event", None)
+        cls._local.event = event
+        try:
+            yield
+        finally:
+            cls._local.event = previous
+
+    @classmethod
+    def count_retry(cls):
+        """Counts a retried attempt of the operation measured on the current thread."""
+        event = getattr(cls._local, "event", None)
+        if event is not None:
+            with cls._lock:
+                event.retries += 1
+
+    @classmethod
+    def record(cls, event: TransferEvent):
+        """Aggregates an event and passes it to the registered callbacks.
+
+        Parameters
+        ----------
+        event: TransferEvent
+            The measured operation.
+        """
+        if not cls._configured:
+            cls._configure()
+        with cls._lock:
+            stats = cls._stats.setdefault(
+                event.operation,
+                {"count": 0, "errors": 0, "seconds": 0.0, "bytes": 0, "parts": 0, "retries": 0},
+            )
+            stats["count"] += 1
+            stats["errors"] += 1 if event.error else 0
+            stats["seconds"] += event.seconds
+            stats["bytes"] += event.bytes
+            stats["parts"] += event.parts
+            stats["retries"] += event.retries
+            callbacks = cls._callbacks
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as ex:
+                logger.debug(f"Transfer metrics callback failed: {ex}")
+
+    @classmethod
+    def summary(cls) -> Dict[str, Dict[str, float]]:
+        """Gets the totals of the operations measured since the last reset.
+
+        Returns
+        -------
+        Dict[str, Dict[str, float]]
+            The operation names mapped to their count, errors, cumulative seconds, bytes,
+            parts, retries and average throughput in bytes per second.
+        """
+        with cls._lock:
+            result = {operation: dict(stats) for operation, stats in cls._stats.items()}
+        for stats in result.values():
+            stats["throughput"] = stats["bytes"] / stats["seconds"] if stats["seconds"] else 0.0
+        return result
+
+    @classmethod
+    def format_summary(cls) -> str:
+        """Formats the summary as a table, one operation per line."""
+        lines = [
+            f"{'operation':<10} {'count':>8} {'errors':>7} {'seconds':>10} "
+            f"{'MiB':>10} {'parts':>8} {'retries':>8} {'MiB/s':>8}"
+        ]
+        for operation, stats in sorted(cls.summary().items()):
+            lines.append(
+                f"{operation:<10} {stats['count']:>8} {stats['errors']:>7} "
+                f"{stats['seconds']:>10.3f} {stats['bytes'] / 1024**2:>10.1f} "
+                f"{stats['parts']:>8} {stats['retries']:>8} "
+                f"{stats['throughput'] / 1024**2:>8.1f}"
+            )
+        return "\n".join(lines)
+
+    @classmethod
+    def reset(cls):
+        """Clears the aggregated totals, e.g. at the start of a run."""
+        with cls._lock:
+            cls._stats = {}
+
+    @classmethod
+    def enable_opentelemetry(cls):
+        """Exports the measured operations as OpenTelemetry spans and metrics.
+
+        The spans and metrics go to the tracer and meter providers configured
+        in the application.
+
+        Raises
+        ------
+        ImportError
+            If the `opentelemetry-api` package is not installed.
+        """
+        try:
+            from opentelemetry import metrics, trace
+        except ImportError as ex:
+            raise ImportError(
+                "The `opentelemetry-api` package is required to export the transfer "
+                "metrics to OpenTelemetry. Install it with `pip install opentelemetry-api`."
+            ) from ex
+
+        tracer = trace.get_tracer(INSTRUMENTATION_NAME)
+        meter = metrics.get_meter(INSTRUMENTATION_NAME)
+        duration = meter.create_histogram(
+            "oci_mlflow.artifact.duration", unit="s", description="Artifact operation duration."
+        )
+        transferred = meter.create_counter(
+            "oci_mlflow.artifact.bytes", unit="By", description="Artifact payload bytes."
+        )
+        retries = meter.create_counter(
+            "oci_mlflow.artifact.retries", description="Retried artifact operation attempts."
+        )
+
+        def export(event: TransferEvent):
+            attributes = {"operation": event.operation, "error": event.error is not None}
+            duration.record(event.seconds, attributes)
+            if event.bytes:
+                transferred.add(event.bytes, attributes)
+            if event.retries:
+                retries.add(event.retries, attributes)
+            start_ns = int(event.start * 1e9)
+            span = tracer.start_span(
+                f"oci_mlflow.{event.operation}",
+                start_time=start_ns,
+                attributes={
+                    "oci_mlflow.path": event.path,
+                    "oci_mlflow.bytes": event.bytes,
+                    "oci_mlflow.parts": event.parts,
+                    "oci_mlflow.retries": event.retries,
+                },
+            )
+            if event.error is not None:
+                span.record_exception(event.error)
+                span.set_status(trace.Status(trace.StatusCode.ERROR, str(event.error)))
+            span.end(end_time=start_ns + int(event.seconds * 1e9))
+
+        cls.register_callback(export)
+
+    @classmethod
+    def _configure(cls):
+        """Applies the environment settings on the first recorded event."""
+        with cls._lock:
+            if cls._configured:
+                return
+            cls._configured = True
+        if get_env_bool(OPENTELEMETRY):
+            try:
+                cls.enable_opentelemetry()
+            except ImportError as ex:
+                logger.warning(str(ex))
+        if get_env_bool(TRANSFER_METRICS_SUMMARY):
+            atexit.register(lambda: logger.info(f"Artifact transfers:\n{cls.format_summary()}"))
@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+"""
+In-process stand-in for OCI Object Storage, used by the artifact transfer benchmarks.
+
+The stand-in keeps the object sizes only and simulates the cost of every request:
+a fixed round trip latency plus the transfer time of the payload over a link of
+limited bandwidth shared by all the connections. This measures the request
+scheduling of the artifact repository (concurrency, number of requests, ranges)
+rather than the throughput of the local machine.
+"""
+
+import math
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+from types import SimpleNamespace
+
+from oci.exceptions import ServiceError
+
+LIST_PAGE_SIZE = 1000
+
+
+class FakeObjectStorage:
+    """
+    Simulated Object Storage bucket, exposing the client, the upload manager and the
+    filesystem used by the artifact repository.
+
+    Attributes
+    ----------
+    latency: float
+        The round trip latency of a request in seconds.
+    bandwidth: float
+        The bandwidth of the link shared by all the requests in bytes per second.
+        Unlimited if 0.
+    requests: Counter
+        The number of requests made per operation.
+    """
+
+    def __init__(self, bucket: str, namespace: str, latency: float = 0.0, bandwidth: float = 0):
+        self.bucket = bucket
+        self.namespace = namespace
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.requests = Counter()
+        self._objects = {}
+        self._lock = threading.Lock()
+        self._link_free_at = 0.0
+        self.client = FakeObjectStorageClient(self)
+        self.upload_manager = FakeUploadManager(self)
+        self.fs = FakeFileSystem(self)
+
+    def request(self, operation: str, nbytes: int = 0):
+        """Records a request and waits for its simulated latency and transfer time."""
+        with self._lock:
+            self.requests[operation] += 1
+            done_at = time.monotonic() + self.latency
+            if self.bandwidth and nbytes:
+                start = max(time.monotonic(), self._link_free_at)
+                self._link_free_at = start + nbytes / self.bandwidth
+                done_at = max(done_at, self._link_free_at)
+        delay = done_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def put(self, name: str, size: int):
+        with self._lock:
+            self._objects[name] = SimpleNamespace(
+                name=name,
+                size=size,
+                etag=uuid.uuid4().hex,
+                md5=None,
+                time_modified=None,
+            )
+
+    def get(self, name: str) -> SimpleNamespace:
+        with self._lock:
+            obj = self._objects.get(name)
+        if obj is None:
+            raise FileNotFoundError(name)
+        return obj
+
+    def delete(self, name: str) -> bool:
+        with self._lock:
+            return self._objects.pop(name, None) is not None
+
+    def names(self) -> list:
+        with self._lock:
+            return sorted(self._objects)
+
+    def object_name(self, path: str) -> str:
+        """Converts an `oci://bucket@namespace/name` or `bucket@namespace/name` path to the object name."""
+        path = path.split("://", 1)[-1]
+        return path.split("/", 1)[1] if "/" in path else ""
+
+
+class FakeObjectStorageClient:
+    """Subset of `oci.object_storage.ObjectStorageClient` used by the artifact repository."""
+
+    def __init__(self, storage: FakeObjectStorage):
+        self.storage = storage
+
+    def list_objects(self, namespace_name, bucket_name, prefix=None, start=None, fields=None, **kwargs):
+        self.storage.request("list_objects")
+        names = [
+            name
+            for name in self.storage.names()
+            if name.startswith(prefix or "") and (start is None or name >= start)
+        ]
+        page = names[:LIST_PAGE_SIZE]
+        return SimpleNamespace(
+            data=SimpleNamespace(
+                objects=[self.storage.get(name) for name in page],
+                next_start_with=names[LIST_PAGE_SIZE] if len(names) > LIST_PAGE_SIZE else None,
+            )
+        )
+
+    def head_object(self, namespace_name, bucket_name, object_name, **kwargs):
+        self.storage.request("head_object")
+        try:
+            obj = self.storage.get(object_name)
+        except FileNotFoundError:
+            raise ServiceError(404, "ObjectNotFound", {}, f"{object_name} not found")
+        return SimpleNamespace(headers={"content-length": str(obj.size), "etag": obj.etag})
+
+    def get_object(self, namespace_name, bucket_name, object_name, range=None, **kwargs):
+        try:
+            obj = self.storage.get(object_name)
+        except FileNotFoundError:
+            raise ServiceError(404, "ObjectNotFound", {}, f"{object_name} not found")
+        start, end = 0, obj.size
+        if range:
+            first, last = range[len("bytes="):].split("-")
+            start, end = int(first), min(int(last) + 1, obj.size)
+        self.storage.request("get_object", end - start)
+        return SimpleNamespace(data=SimpleNamespace(content=bytes(end - start)))
+
+    def put_object(self, namespace_name, bucket_name, object_name, put_object_body, **kwargs):
+        size = kwargs.get("content_length") or len(put_object_body)
+        self.storage.request("put_object", size)
+        self.storage.put(object_name, size)
+
+    def delete_object(self, namespace_name, bucket_name, object_name, **kwargs):
+        self.storage.request("delete_object")
+        if not self.storage.delete(object_name):
+            raise ServiceError(404, "ObjectNotFound", {}, f"{object_name} not found")
+
+
+class FakeUploadManager:
+    """Subset of `oci.object_storage.UploadManager` used by the artifact repository."""
+
+    def __init__(self, storage: FakeObjectStorage, parallel_process_count: int = 4):
+        self.storage = storage
+        self.object_storage_client = storage.client
+        self.parallel_process_count = parallel_process_count
+
+    def upload_file(self, namespace_name, bucket_name, object_name, file_path, part_size=None, **kwargs):
+        size = os.path.getsize(file_path)
+        parts = max(1, math.ceil(size / part_size)) if part_size else 1
+        if parts == 1:
+            self.storage.request("put_object", size)
+        else:
+            self.storage.request("create_multipart_upload")
+            # The parts are uploaded in waves of `parallel_process_count` concurrent requests.
+            for wave in range(0, parts, self.parallel_process_count):
+                count = min(self.parallel_process_count, parts - wave)
+                threads = [
+                    threading.Thread(
+                        target=self.storage.request,
+                        args=("upload_part", min(part_size, size - (wave + i) * part_size)),
+                    )
+                    for i in range(count)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            self.storage.request("commit_multipart_upload")
+        self.storage.put(object_name, size)
+
+    def upload_stream(self, namespace_name, bucket_name, object_name, stream_ref, **kwargs):
+        size = 0
+        while True:
+            chunk = stream_ref.read(1024 * 1024)
+            if not chunk:
+                break
+            size += len(chunk)
+        self.storage.request("put_object", size)
+        self.storage.put(object_name, size)
+
+
+class FakeFileSystem:
+    """Subset of the `ocifs` filesystem used by the artifact repository."""
+
+    def __init__(self, storage: FakeObjectStorage):
+        self.storage = storage
+
+    def invalidate_cache(self, path=None):
+        pass
+
+    def info(self, path):
+        self.storage.request("head_object")
+        obj = self.storage.get(self.storage.object_name(path))
+        return {"name": path, "size": obj.size, "etag": obj.etag, "type": "file"}
+
+    def ls(self, path, detail=True):
+        self.storage.request("list_objects")
+        prefix = self.storage.object_name(path).rstrip("/")
+        prefix = prefix + "/" if prefix else ""
+        root = f"{self.storage.bucket}@{self.storage.namespace}/"
+        entries = {}
+        for name in self.storage.names():
+            if not name.startswith(prefix):
+                continue
+            child, _, rest = name[len(prefix):].partition("/")
+            if rest:
+                entries.setdefault(child, {"name": root + prefix + child, "size": 0, "type": "directory"})
+            else:
+                entries[child] = {
+                    "name": root + name,
+                    "size": self.storage.get(name).size,
+                    "type": "file",
+                }
+        if not entries:
+            raise FileNotFoundError(path)
+        return list(entries.values())
+
+    def download(self, rpath, lpath, **kwargs):
+        obj = self.storage.get(self.storage.object_name(rpath))
+        self.storage.request("get_object", obj.size)
+        with open(lpath, "wb") as f:
+            f.truncate(obj.size)
+
+    def cat_file(self, path, start=None, end=None, **kwargs):
+        obj = self.storage.get(self.storage.object_name(path))
+        start = start or 0
+        end = obj.size if end is None else min(end, obj.size)
+        self.storage.request("get_object", end - start)
+        return bytes(end - start)
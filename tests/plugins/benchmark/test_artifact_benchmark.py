@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+"""
+Artifact transfer benchmarks of `OCIObjectStorageArtifactRepository`.
+
+The benchmarks are skipped unless `OCI_MLFLOW_BENCHMARK` is set. They log, list,
+download and delete a directory of sparse files against `FakeObjectStorage` and
+write the timings as JSON to `OCI_MLFLOW_BENCHMARK_OUTPUT`, so runs of different
+revisions can be compared. The other settings are:
+
+- `OCI_MLFLOW_BENCHMARK_PROFILES`: comma separated profile names, all by default.
+- `OCI_MLFLOW_BENCHMARK_LATENCY`: the request latency in seconds, 0.02 by default.
+- `OCI_MLFLOW_BENCHMARK_BANDWIDTH`: the shared bandwidth in bytes per second, 1 GiB/s by default.
+
+The downloads are written to the local disk, the large profiles need the matching
+free space.
+
+    OCI_MLFLOW_BENCHMARK=1 OCI_MLFLOW_BENCHMARK_OUTPUT=results.json \\
+        python -m pytest tests/plugins/benchmark -s
+"""
+
+import json
+import os
+import platform
+import time
+from unittest.mock import patch
+
+import pytest
+
+from oci_mlflow.object_storage_auth import ObjectStorageClientPool
+from oci_mlflow.oci_object_storage import OCIObjectStorageArtifactRepository
+from tests.plugins.benchmark.fake_object_storage import FakeObjectStorage
+
+BENCHMARK = "OCI_MLFLOW_BENCHMARK"
+BENCHMARK_OUTPUT = "OCI_MLFLOW_BENCHMARK_OUTPUT"
+BENCHMARK_PROFILES = "OCI_MLFLOW_BENCHMARK_PROFILES"
+BENCHMARK_LATENCY = "OCI_MLFLOW_BENCHMARK_LATENCY"
+BENCHMARK_BANDWIDTH = "OCI_MLFLOW_BENCHMARK_BANDWIDTH"
+
+KIB = 1024
+MIB = 1024 * KIB
+GIB = 1024 * MIB
+
+# Profile name -> (number of files, file size in bytes).
+PROFILES = {
+    "10k-4KB": (10000, 4 * KIB),
+    "100-100MB": (100, 100 * MIB),
+    "1-5GB": (1, 5 * GIB),
+}
+
+ARTIFACT_URI = "oci://benchmark-bucket@benchmark-namespace/experiment/run/artifacts"
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get(BENCHMARK), reason=f"Set `{BENCHMARK}` to run the benchmarks."
+)
+
+
+def selected_profiles():
+    names = os.environ.get(BENCHMARK_PROFILES)
+    if not names:
+        return list(PROFILES)
+    return [name.strip() for name in names.split(",") if name.strip()]
+
+
+def write_result(result: dict):
+    """Appends a benchmark result to the JSON output file."""
+    output = os.environ.get(BENCHMARK_OUTPUT)
+    if not output:
+        return
+    results = []
+    if os.path.exists(output):
+        with open(output) as f:
+            results = json.load(f)
+    results.append(result)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+@pytest.mark.parametrize("profile", selected_profiles())
+def test_artifact_transfer(profile, tmp_path):
+    """Measures the artifact transfers of a profile."""
+    count, size = PROFILES[profile]
+    latency = float(os.environ.get(BENCHMARK_LATENCY, "0.02"))
+    bandwidth = float(os.environ.get(BENCHMARK_BANDWIDTH, str(GIB)))
+    storage = FakeObjectStorage(
+        "benchmark-bucket", "benchmark-namespace", latency=latency, bandwidth=bandwidth
+    )
+
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    for i in range(count):
+        with open(src_dir / f"file-{i:05d}.bin", "wb") as f:
+            f.truncate(size)
+    dst_dir = tmp_path / "dst"
+    dst_dir.mkdir()
+
+    timings = {}
+    requests = {}
+
+    def measure(operation, func):
+        storage.requests.clear()
+        start = time.perf_counter()
+        result = func()
+        timings[operation] = time.perf_counter() - start
+        requests[operation] = dict(storage.requests)
+        return result
+
+    with patch("oci_mlflow.oci_object_storage.get_signer", return_value={}), patch(
+        "oci_mlflow.artifact_upload.get_signer", return_value={}
+    ), patch.object(
+        ObjectStorageClientPool, "get_client", return_value=storage.client
+    ), patch.object(
+        ObjectStorageClientPool, "get_upload_manager", return_value=storage.upload_manager
+    ), patch.object(
+        OCIObjectStorageArtifactRepository, "get_fs", return_value=storage.fs
+    ):
+        OCIObjectStorageArtifactRepository.clear_fs_cache()
+        repo = OCIObjectStorageArtifactRepository(ARTIFACT_URI)
+        measure("upload", lambda: repo.log_artifacts(str(src_dir), "data"))
+        listed = measure("list", lambda: repo.list_artifacts("data"))
+        local_path = measure("download", lambda: repo.download_artifacts("data", str(dst_dir)))
+        measure("delete", lambda: repo.delete_artifacts("data"))
+
+    assert len(listed) == count
+    assert len(os.listdir(local_path)) == count
+    assert storage.names() == []
+
+    result = {
+        "profile": profile,
+        "files": count,
+        "file_size": size,
+        "latency": latency,
+        "bandwidth": bandwidth,
+        "python": platform.python_version(),
+        "seconds": timings,
+        "throughput_mib_s": {
+            operation: round(count * size / MIB / seconds, 2)
+            for operation, seconds in timings.items()
+            if operation in ("upload", "download") and seconds
+        },
+        "requests": requests,
+    }
+    print(json.dumps(result))
+    write_result(result)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+import io
+
+import pytest
+
+from oci_mlflow.artifact_archive import (
+    ARCHIVE_DIR,
+    ARCHIVE_MANIFEST_DIR,
+    archive_paths,
+    dump_manifest,
+    is_archive_path,
+    manifest_path,
+    new_archive_id,
+    read_manifest,
+    write_tar,
+)
+
+
+class TestArtifactArchive:
+    def test_write_tar(self, tmp_path):
+        """Tests that the index points at the data of every member."""
+        (tmp_path / "sub").mkdir()
+        files = {
+            "a.txt": b"a" * 10,
+            "sub/b.bin": b"b" * 1000,
+            "sub/" + "long-name-" * 20 + ".txt": b"",
+        }
+        for name, content in files.items():
+            (tmp_path / name).write_bytes(content)
+
+        stream = io.BytesIO()
+        members = write_tar(str(tmp_path), stream)
+        data = stream.getvalue()
+
+        assert set(members) == set(files)
+        for name, (offset, size) in members.items():
+            assert data[offset : offset + size] == files[name]
+
+    def test_archive_paths(self):
+        assert archive_paths("", "id") == (f"{ARCHIVE_DIR}/id.tar", f"{ARCHIVE_DIR}/id.json")
+        assert archive_paths("data/", "id") == (
+            f"data/{ARCHIVE_DIR}/id.tar",
+            f"data/{ARCHIVE_DIR}/id.json",
+        )
+        assert is_archive_path(f"data/{ARCHIVE_DIR}/id.tar")
+        assert is_archive_path(manifest_path("id"))
+        assert is_archive_path(ARCHIVE_MANIFEST_DIR)
+        assert not is_archive_path(f"data/{ARCHIVE_MANIFEST_DIR}/id.json")
+        assert not is_archive_path("data/file.txt")
+
+    def test_manifest(self):
+        archive = {"path": "data", "archive": "a.tar", "index": "a.json"}
+        assert read_manifest(dump_manifest(archive)) == archive
+        with pytest.raises(ValueError, match="Unsupported archive manifest version"):
+            read_manifest(b'{"version": 99, "path": "data"}')
+
+    def test_new_archive_id(self):
+        """Tests that the archive identifiers are unique and sort in the order they are logged."""
+        ids = [new_archive_id() for _ in range(100)]
+        assert len(set(ids)) == len(ids)
+        assert [archive_id.split("-")[0] for archive_id in ids] == sorted(
+            archive_id.split("-")[0] for archive_id in ids
+        )
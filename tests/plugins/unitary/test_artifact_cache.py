@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from oci_mlflow.artifact_cache import (
+    ARTIFACT_CACHE_DIR,
+    ARTIFACT_CACHE_SIZE,
+    ArtifactCache,
+)
+
+URI = "oci://my-bucket@my-namespace/my-artifact-path/model.pkl"
+
+
+class TestArtifactCache:
+    def setup_method(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ArtifactCache(os.path.join(self.tmp_dir.name, "cache"), max_size=10)
+        ArtifactCache._sizes.clear()
+
+    def teardown_method(self):
+        self.tmp_dir.cleanup()
+
+    def _fetch(self, content: bytes):
+        def fetch(path):
+            with open(path, "wb") as f:
+                f.write(content)
+
+        return MagicMock(side_effect=fetch)
+
+    def _read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_from_env_disabled(self):
+        """Tests that the cache is disabled unless a directory is configured."""
+        assert ArtifactCache.from_env() is None
+
+    def test_from_env(self):
+        """Tests configuring the cache from the environment."""
+        cache_dir = os.path.join(self.tmp_dir.name, "env-cache")
+        with patch.dict(os.environ, {ARTIFACT_CACHE_DIR: cache_dir, ARTIFACT_CACHE_SIZE: "42"}):
+            cache = ArtifactCache.from_env()
+        assert cache.cache_dir == cache_dir
+        assert cache.max_size == 42
+        assert os.path.isdir(cache_dir)
+
+    def test_put_and_get(self):
+        """Tests that a cached object version is installed without fetching it again."""
+        first = os.path.join(self.tmp_dir.name, "first.pkl")
+        second = os.path.join(self.tmp_dir.name, "second.pkl")
+        fetch = self._fetch(b"model")
+
+        assert not self.cache.get(URI, "etag-1", first)
+        self.cache.put(URI, "etag-1", fetch, first)
+        assert self.cache.get(URI, "etag-1", second)
+
+        fetch.assert_called_once()
+        assert self._read(first) == self._read(second) == b"model"
+        assert os.stat(second).st_ino == os.stat(self.cache.entry_path(URI, "etag-1")).st_ino
+
+    def test_get_other_etag(self):
+        """Tests that a changed object is not served from the cache."""
+        self.cache.put(URI, "etag-1", self._fetch(b"old"), os.path.join(self.tmp_dir.name, "a"))
+        assert not self.cache.get(URI, "etag-2", os.path.join(self.tmp_dir.name, "b"))
+
+    def test_put_failure(self):
+        """Tests that a failed fetch leaves neither an entry nor temporary files behind."""
+        fetch = MagicMock(side_effect=IOError("connection reset"))
+        with pytest.raises(IOError):
+            self.cache.put(URI, "etag-1", fetch, os.path.join(self.tmp_dir.name, "a"))
+        entry_dir = os.path.dirname(self.cache.entry_path(URI, "etag-1"))
+        assert os.listdir(entry_dir) == []
+
+    def test_evict_least_recently_used(self):
+        """Tests that the least recently used entries are evicted over the size cap."""
+        self.cache.put(URI, "etag-1", self._fetch(b"1234"), os.path.join(self.tmp_dir.name, "a"))
+        self.cache.put(URI, "etag-2", self._fetch(b"5678"), os.path.join(self.tmp_dir.name, "b"))
+        first_entry = self.cache.entry_path(URI, "etag-1")
+        os.utime(first_entry, (1, 1))
+        assert self.cache.get(URI, "etag-1", os.path.join(self.tmp_dir.name, "c"))
+        os.utime(self.cache.entry_path(URI, "etag-2"), (1, 1))
+
+        self.cache.put(URI, "etag-3", self._fetch(b"9012"), os.path.join(self.tmp_dir.name, "d"))
+
+        assert os.path.exists(first_entry)
+        assert not os.path.exists(self.cache.entry_path(URI, "etag-2"))
+        assert os.path.exists(self.cache.entry_path(URI, "etag-3"))
+
+    def test_evict_only_over_size_cap(self):
+        """Tests that the cache directory is only walked to index it and over the size cap."""
+        evict = ArtifactCache.evict
+        with patch.object(ArtifactCache, "evict", autospec=True, side_effect=evict) as evict:
+            for etag in ("etag-1", "etag-2", "etag-3"):
+                local_path = os.path.join(self.tmp_dir.name, etag)
+                self.cache.put(URI, etag, self._fetch(b"1234"), local_path)
+        assert evict.call_count == 2
+        assert ArtifactCache._sizes[self.cache.cache_dir] == 8
+        assert not os.path.exists(self.cache.entry_path(URI, "etag-1"))
+
+    def test_get_evicted_entry(self):
+        """Tests that an entry evicted before it is installed is a cache miss."""
+        self.cache.put(URI, "etag-1", self._fetch(b"model"), os.path.join(self.tmp_dir.name, "a"))
+        with patch("oci_mlflow.artifact_cache.os.link", side_effect=FileNotFoundError):
+            assert not self.cache.get(URI, "etag-1", os.path.join(self.tmp_dir.name, "b"))
+        assert not os.path.exists(os.path.join(self.tmp_dir.name, "b"))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+from mlflow.entities import FileInfo
+
+from oci_mlflow.artifact_index import ArtifactIndex
+
+
+class TestArtifactIndex:
+    def test_list(self):
+        """Tests listing the children of the indexed directories."""
+        index = ArtifactIndex("oci://my-bucket@my-namespace/run")
+        index.add("model/MLmodel", 10)
+        index.add("model/data/weights.bin", 20)
+        index.add("empty/", is_dir=True)
+
+        assert index.list() == [
+            FileInfo("empty", True, 0),
+            FileInfo("model", True, 0),
+        ]
+        assert index.list("model") == [
+            FileInfo("model/MLmodel", False, 10),
+            FileInfo("model/data", True, 0),
+        ]
+        assert index.list("model/MLmodel") == []
+        assert index.list("missing") == []
+
+    def test_files(self):
+        """Tests listing all the files under a directory."""
+        index = ArtifactIndex("oci://my-bucket@my-namespace/run")
+        index.add("model/MLmodel", 10)
+        index.add("model/data/weights.bin", 20)
+        index.add("metrics.json", 5)
+
+        assert index.files("model") == [
+            FileInfo("model/MLmodel", False, 10),
+            FileInfo("model/data/weights.bin", False, 20),
+        ]
+        assert len(index.files()) == 3
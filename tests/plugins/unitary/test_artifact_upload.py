@@ -0,0 +1,430 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+import base64
+import gzip
+import hashlib
+import io
+import os
+import threading
+from unittest.mock import MagicMock, create_autospec, patch
+
+import mlflow
+import pytest
+from mlflow.tracking import fluent
+from oci import object_storage
+from oci.exceptions import ServiceError
+
+from oci_mlflow import artifact_upload, oci_object_storage
+from oci_mlflow.artifact_upload import (
+    ArtifactUploader,
+    ArtifactUploadQueue,
+    GzipReader,
+    install_end_run_flush,
+    wait_for_artifact_uploads,
+)
+from oci_mlflow.object_storage_utils import ArtifactTransferError, file_md5
+from oci_mlflow.oci_object_storage import OCIObjectStorageArtifactRepository
+from oci_mlflow.transfer_metrics import TransferMetrics
+
+
+class TestArtifactUploader:
+    def test_init(self):
+        """Ensures the ArtifactUploader instance can be initialized."""
+        artifact_uploader = ArtifactUploader()
+        assert isinstance(
+            artifact_uploader.upload_manager, object_storage.UploadManager
+        )
+
+    @patch.object(object_storage.UploadManager, "upload_file")
+    def test_upload(self, mock_upload_file):
+        """Tests uploading model artifacts."""
+        artifact_uploader = ArtifactUploader()
+
+        local_file = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "test_files", "test.txt"
+        )
+        dest_path = "oci://my-bucket@my-namespace/my-artifact-path/logs/test.txt"
+        artifact_uploader.upload(local_file, dest_path)
+
+        mock_upload_file.assert_called_with(
+            namespace_name="my-namespace",
+            bucket_name="my-bucket",
+            object_name="my-artifact-path/logs/test.txt",
+            file_path=local_file,
+            part_size=max(os.path.getsize(local_file), 1),
+        )
+
+    @patch.object(ArtifactUploader, "__init__", return_value=None)
+    def test_upload_kwargs(self, _):
+        """Tests choosing the multipart settings by file size."""
+        artifact_uploader = ArtifactUploader()
+        artifact_uploader.part_size = None
+        artifact_uploader.multipart_threshold = 100
+
+        with patch("os.path.getsize", return_value=50):
+            assert artifact_uploader._upload_kwargs("small.bin") == {"part_size": 50}
+        with patch("os.path.getsize", return_value=10 * 1024**3):
+            assert artifact_uploader._upload_kwargs("large.bin") == {
+                "part_size": artifact_upload.DEFAULT_UPLOAD_PART_SIZE
+            }
+        with patch("os.path.getsize", return_value=5 * 1024**4):
+            part_size = artifact_uploader._upload_kwargs("huge.bin")["part_size"]
+            assert 5 * 1024**4 / part_size <= artifact_upload.MAX_UPLOAD_PARTS
+
+        artifact_uploader.part_size = 8 * 1024**2
+        with patch("os.path.getsize", return_value=10 * 1024**3):
+            assert artifact_uploader._upload_kwargs("large.bin") == {"part_size": 8 * 1024**2}
+
+    def _deduplicating_uploader(self):
+        with patch.object(ArtifactUploader, "__init__", return_value=None):
+            artifact_uploader = ArtifactUploader()
+        artifact_uploader.upload_manager = MagicMock()
+        artifact_uploader.part_size = None
+        artifact_uploader.multipart_threshold = artifact_upload.DEFAULT_MULTIPART_UPLOAD_THRESHOLD
+        artifact_uploader.deduplicate = True
+        artifact_uploader.record_md5 = False
+        artifact_uploader.compress = False
+        return artifact_uploader
+
+    def test_upload_skips_identical_object(self):
+        """Tests that a file already stored at the destination is not uploaded again."""
+        artifact_uploader = self._deduplicating_uploader()
+        local_file = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "test_files", "test.txt"
+        )
+        client = artifact_uploader.upload_manager.object_storage_client
+        client.head_object.return_value = MagicMock(
+            headers={
+                "content-length": str(os.path.getsize(local_file)),
+                "content-md5": file_md5(local_file),
+            }
+        )
+
+        assert not artifact_uploader.upload(
+            local_file, "oci://my-bucket@my-namespace/my-artifact-path/test.txt"
+        )
+        artifact_uploader.upload_manager.upload_file.assert_not_called()
+
+    def test_upload_changed_object(self):
+        """Tests that changed and missing objects are uploaded along with their MD5."""
+        artifact_uploader = self._deduplicating_uploader()
+        local_file = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "test_files", "test.txt"
+        )
+        client = artifact_uploader.upload_manager.object_storage_client
+        client.head_object.side_effect = [
+            MagicMock(
+                headers={
+                    "content-length": str(os.path.getsize(local_file)),
+                    "opc-multipart-md5": "stale-md5-1",
+                }
+            ),
+            ServiceError(404, "ObjectNotFound", {}, "not found"),
+        ]
+        dest_path = "oci://my-bucket@my-namespace/my-artifact-path/test.txt"
+
+        assert artifact_uploader.upload(local_file, dest_path)
+        assert artifact_uploader.upload(local_file, dest_path)
+        assert artifact_uploader.upload_manager.upload_file.call_count == 2
+        assert artifact_uploader.upload_manager.upload_file.call_args.kwargs["metadata"] == {
+            artifact_upload.MD5_METADATA_KEY: file_md5(local_file)
+        }
+
+    def test_upload_stream_buffer(self):
+        """Tests uploading an in-memory buffer with a single PUT."""
+        artifact_uploader = self._deduplicating_uploader()
+        artifact_uploader.deduplicate = False
+        data = b'{"key": "value"}'
+
+        assert artifact_uploader.upload_stream(
+            memoryview(data), "oci://my-bucket@my-namespace/my-artifact-path/data.json"
+        )
+        client = artifact_uploader.upload_manager.object_storage_client
+        args, kwargs = client.put_object.call_args
+        assert args == ("my-namespace", "my-bucket", "my-artifact-path/data.json", data)
+        assert kwargs["content_length"] == len(data)
+        assert kwargs["content_md5"] == base64.b64encode(hashlib.md5(data).digest()).decode()
+        artifact_uploader.upload_manager.upload_stream.assert_not_called()
+
+    def test_upload_stream_small_file_object(self):
+        """Tests uploading a file-like object ending within the threshold with a single PUT."""
+        artifact_uploader = self._deduplicating_uploader()
+        artifact_uploader.deduplicate = False
+
+        assert artifact_uploader.upload_stream(
+            io.BytesIO(b"content"), "oci://my-bucket@my-namespace/my-artifact-path/data.bin"
+        )
+        client = artifact_uploader.upload_manager.object_storage_client
+        args, kwargs = client.put_object.call_args
+        assert args == ("my-namespace", "my-bucket", "my-artifact-path/data.bin", b"content")
+        assert kwargs["content_length"] == len(b"content")
+        artifact_uploader.upload_manager.upload_stream.assert_not_called()
+
+    def test_upload_stream_file_object(self):
+        """Tests uploading a file-like object over the threshold with a multipart upload."""
+        artifact_uploader = self._deduplicating_uploader()
+        artifact_uploader.multipart_threshold = 4
+        uploaded = {}
+
+        def upload_stream(namespace_name, bucket_name, object_name, stream, part_size):
+            uploaded[object_name] = [stream.read(3), stream.read()]
+
+        artifact_uploader.upload_manager.upload_stream.side_effect = upload_stream
+
+        assert artifact_uploader.upload_stream(
+            io.BytesIO(b"content"), "oci://my-bucket@my-namespace/my-artifact-path/data.bin"
+        )
+        # The bytes read to check the size are uploaded first.
+        assert uploaded == {"my-artifact-path/data.bin": [b"con", b"tent"]}
+        assert artifact_uploader.upload_manager.upload_stream.call_args.kwargs == {
+            "part_size": artifact_upload.DEFAULT_UPLOAD_PART_SIZE
+        }
+        artifact_uploader.upload_manager.object_storage_client.put_object.assert_not_called()
+
+    def test_upload_stream_skips_identical_object(self):
+        """Tests that buffers already stored at the destination are not uploaded."""
+        artifact_uploader = self._deduplicating_uploader()
+        data = "text"
+        client = artifact_uploader.upload_manager.object_storage_client
+        client.head_object.return_value = MagicMock(
+            headers={
+                "content-length": "4",
+                "content-md5": base64.b64encode(hashlib.md5(b"text").digest()).decode(),
+            }
+        )
+
+        assert not artifact_uploader.upload_stream(
+            data, "oci://my-bucket@my-namespace/my-artifact-path/data.txt"
+        )
+        client.put_object.assert_not_called()
+
+    @patch.dict(os.environ, {artifact_upload.COMPRESS_MIN_SIZE: "10"})
+    def test_upload_compressed(self, tmp_path):
+        """Tests that eligible files are compressed on the fly and marked in the metadata."""
+        artifact_uploader = self._deduplicating_uploader()
+        artifact_uploader.deduplicate = False
+        artifact_uploader.compress = True
+        local_file = tmp_path / "metrics.json"
+        content = b'{"loss": 0.1}\n' * 1000
+        local_file.write_bytes(content)
+        client = artifact_uploader.upload_manager.object_storage_client
+
+        assert artifact_uploader.is_compressible(str(local_file))
+        assert not artifact_uploader.is_compressible(str(tmp_path / "model.pkl"))
+        assert artifact_uploader.upload(str(local_file), "oci://my-bucket@my-namespace/m.json")
+
+        args, kwargs = client.put_object.call_args
+        assert gzip.decompress(args[3]) == content
+        assert kwargs["content_length"] == len(args[3]) < len(content)
+        assert kwargs["opc_meta"] == {
+            artifact_upload.ENCODING_METADATA_KEY: "gzip",
+            artifact_upload.SIZE_METADATA_KEY: str(len(content)),
+            artifact_upload.MD5_METADATA_KEY: file_md5(str(local_file)),
+        }
+        artifact_uploader.upload_manager.upload_file.assert_not_called()
+
+        # Files above the multipart threshold are streamed through the compressor.
+        artifact_uploader.multipart_threshold = 100
+        uploaded = {}
+
+        def upload_stream(namespace_name, bucket_name, object_name, stream, **kwargs):
+            uploaded[object_name] = stream.read()
+
+        artifact_uploader.upload_manager.upload_stream.side_effect = upload_stream
+        artifact_uploader.upload(str(local_file), "oci://my-bucket@my-namespace/big.json")
+        assert gzip.decompress(uploaded["big.json"]) == content
+
+    @patch.dict(
+        os.environ,
+        {
+            artifact_upload.UPLOAD_PART_SIZE: "1048576",
+            artifact_upload.UPLOAD_PARALLEL_PROCESS_COUNT: "6",
+            artifact_upload.MULTIPART_UPLOAD_THRESHOLD: "2097152",
+        },
+    )
+    @patch("oci_mlflow.artifact_upload.ObjectStorageClientPool.get_upload_manager")
+    @patch("oci_mlflow.artifact_upload.get_signer")
+    def test_init_from_environment(self, mock_get_signer, mock_get_upload_manager):
+        """Tests reading the multipart settings from the environment."""
+        artifact_uploader = ArtifactUploader()
+        assert artifact_uploader.part_size == 1048576
+        assert artifact_uploader.parallel_process_count == 6
+        assert artifact_uploader.multipart_threshold == 2097152
+        assert mock_get_upload_manager.call_args.kwargs == {
+            "allow_parallel_uploads": True,
+            "parallel_process_count": 6,
+        }
+
+    @patch("oci_mlflow.object_storage_utils.time.sleep")
+    @patch.object(ArtifactUploader, "upload")
+    @patch.object(ArtifactUploader, "__init__", return_value=None)
+    def test_upload_files_retries_transient_errors(self, _, mock_upload, mock_sleep):
+        """Tests that transient failures are retried with backoff."""
+        mock_upload.side_effect = [
+            ServiceError(503, "ServiceUnavailable", {}, "unavailable"),
+            None,
+        ]
+        ArtifactUploader().upload_files(
+            [("test_files/test.txt", "oci://my-bucket@my-namespace/test.txt")],
+            retries=2,
+        )
+        assert mock_upload.call_count == 2
+        mock_sleep.assert_called_once()
+
+    @patch("oci_mlflow.object_storage_utils.time.sleep")
+    @patch.object(ArtifactUploader, "upload")
+    @patch.object(ArtifactUploader, "__init__", return_value=None)
+    def test_upload_files_reports_failures(self, _, mock_upload, mock_sleep):
+        """Tests that all failed uploads are aggregated into one error."""
+
+        def upload(file_path, dst_path, md5=None):
+            if file_path.endswith("bad.txt"):
+                raise FileNotFoundError(file_path)
+
+        mock_upload.side_effect = upload
+        files = [
+            ("good.txt", "oci://my-bucket@my-namespace/good.txt"),
+            ("bad.txt", "oci://my-bucket@my-namespace/bad.txt"),
+        ]
+        with pytest.raises(ArtifactTransferError) as exc_info:
+            ArtifactUploader().upload_files(files, max_workers=2, retries=3)
+        assert list(exc_info.value.failures) == ["bad.txt"]
+        assert exc_info.value.total == 2
+        mock_sleep.assert_not_called()
+
+
+class TestCompression:
+    def test_gzip_reader(self, tmp_path):
+        local_file = tmp_path / "data.csv"
+        content = b"a,b,c\n" * 100000
+        local_file.write_bytes(content)
+        with io.BufferedReader(GzipReader(str(local_file))) as stream:
+            assert gzip.decompress(stream.read()) == content
+
+
+class TestArtifactUploadQueue:
+    """Tests the asynchronous artifact logging."""
+
+    @pytest.fixture()
+    def upload_queue(self):
+        upload_queue = ArtifactUploadQueue(max_workers=2, max_pending=2, retries=0)
+        upload_queue._uploader = MagicMock()
+        with patch.object(ArtifactUploadQueue, "_instance", upload_queue):
+            yield upload_queue
+        upload_queue._flush_at_exit()
+
+    @patch.dict(os.environ, {oci_object_storage.ASYNC_ARTIFACT_LOGGING: "true"})
+    def test_log_artifact_async(self, upload_queue, tmp_path):
+        """Tests that queued files are snapshotted, so they can be modified right away."""
+        local_file = tmp_path / "model.pkl"
+        local_file.write_bytes(b"epoch-1")
+        uploaded = {}
+
+        def upload(file_path, dst_path):
+            with open(file_path, "rb") as f:
+                uploaded[dst_path] = f.read()
+
+        upload_queue._uploader.upload.side_effect = upload
+        repo = OCIObjectStorageArtifactRepository(
+            artifact_uri="oci://my-bucket@my-namespace/my-artifact-path"
+        )
+        repo.log_artifact(str(local_file), "checkpoints")
+        repo.log_artifact_data("text", "notes.txt")
+        local_file.write_bytes(b"epoch-2")
+        wait_for_artifact_uploads()
+
+        assert uploaded == {
+            "oci://my-bucket@my-namespace/my-artifact-path/checkpoints/model.pkl": b"epoch-1"
+        }
+        upload_queue._uploader.upload_stream.assert_called_once_with(
+            b"text", "oci://my-bucket@my-namespace/my-artifact-path/notes.txt"
+        )
+        assert upload_queue.pending == 0
+        assert os.listdir(upload_queue._staging_dir) == []
+
+    def test_flush_raises_failures(self, upload_queue, tmp_path):
+        """Tests that failed uploads are raised by the next flush only."""
+        local_file = tmp_path / "model.pkl"
+        local_file.write_bytes(b"content")
+        upload_queue._uploader.upload.side_effect = [ValueError("rejected"), None]
+
+        upload_queue.submit_file(str(local_file), "oci://my-bucket@my-namespace/bad.pkl")
+        with pytest.raises(ArtifactTransferError) as ex:
+            upload_queue.flush()
+        assert ex.value.total == 1
+        assert list(ex.value.failures) == [str(local_file)]
+
+        upload_queue.submit_file(str(local_file), "oci://my-bucket@my-namespace/good.pkl")
+        upload_queue.flush()
+
+    def test_uploads_are_measured_by_destination(self, upload_queue, tmp_path):
+        """Tests that queued files and data are both measured under their destination path."""
+        local_file = tmp_path / "model.pkl"
+        local_file.write_bytes(b"content")
+        events = []
+        TransferMetrics.register_callback(events.append)
+        try:
+            upload_queue.submit_file(str(local_file), "oci://my-bucket@my-namespace/model.pkl")
+            upload_queue.submit_data(b"text", "oci://my-bucket@my-namespace/notes.txt")
+            upload_queue.flush()
+        finally:
+            TransferMetrics.unregister_callback(events.append)
+
+        assert sorted(event.path for event in events) == [
+            "oci://my-bucket@my-namespace/model.pkl",
+            "oci://my-bucket@my-namespace/notes.txt",
+        ]
+
+    def test_submit_blocks_when_queue_is_full(self, upload_queue, tmp_path):
+        """Tests that submissions wait for a free slot once `max_pending` uploads are queued."""
+        local_file = tmp_path / "model.pkl"
+        local_file.write_bytes(b"content")
+        release = threading.Event()
+        upload_queue._uploader.upload.side_effect = lambda *args: release.wait()
+
+        for _ in range(upload_queue.max_pending):
+            upload_queue.submit_file(str(local_file), "oci://my-bucket@my-namespace/a.pkl")
+        blocked = threading.Thread(
+            target=upload_queue.submit_file,
+            args=(str(local_file), "oci://my-bucket@my-namespace/b.pkl"),
+        )
+        blocked.start()
+        blocked.join(0.2)
+        assert blocked.is_alive()
+        assert upload_queue.pending == upload_queue.max_pending
+
+        release.set()
+        blocked.join()
+        upload_queue.flush()
+        assert upload_queue._uploader.upload.call_count == upload_queue.max_pending + 1
+
+    def test_end_run_waits_for_uploads(self, upload_queue, tmp_path):
+        """Tests that ending a run flushes the queue and fails the run on upload errors."""
+        local_file = tmp_path / "model.pkl"
+        local_file.write_bytes(b"content")
+        upload_queue._uploader.upload.side_effect = ValueError("rejected")
+        end_run = create_autospec(fluent.end_run)
+
+        with patch.object(fluent, "end_run", end_run), patch.object(mlflow, "end_run", end_run):
+            install_end_run_flush()
+            install_end_run_flush()
+            assert mlflow.end_run is fluent.end_run
+            assert fluent.end_run.__wrapped__ is end_run
+
+            upload_queue.submit_file(str(local_file), "oci://my-bucket@my-namespace/bad.pkl")
+            with pytest.raises(ArtifactTransferError):
+                mlflow.end_run()
+            end_run.assert_called_once_with("FAILED")
+
+            end_run.reset_mock()
+            upload_queue.submit_file(str(local_file), "oci://my-bucket@my-namespace/bad.pkl")
+            fluent.end_run("KILLED")
+            end_run.assert_called_once_with("KILLED")
+
+            end_run.reset_mock()
+            mlflow.end_run()
+            end_run.assert_called_once_with("FINISHED")
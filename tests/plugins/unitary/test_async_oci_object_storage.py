@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+import asyncio
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from oci_mlflow import async_oci_object_storage
+from oci_mlflow.async_oci_object_storage import AsyncOCIObjectStorageArtifactRepository
+from oci_mlflow.artifact_index import DeleteSummary
+from oci_mlflow.artifact_upload import ArtifactUploader
+from oci_mlflow.object_storage_utils import ArtifactTransferError
+from oci_mlflow.oci_object_storage import OCIObjectStorageArtifactRepository
+
+ARTIFACT_URI = "oci://my-bucket@my-namespace/my-artifact-path"
+
+
+class TestAsyncOCIObjectStorageArtifactRepository:
+    @patch.object(OCIObjectStorageArtifactRepository, "bulk_delete_artifacts")
+    @patch.object(OCIObjectStorageArtifactRepository, "download_artifacts")
+    @patch.object(OCIObjectStorageArtifactRepository, "list_artifacts")
+    @patch.object(OCIObjectStorageArtifactRepository, "log_artifact")
+    def test_operations(
+        self, mock_log_artifact, mock_list_artifacts, mock_download, mock_delete
+    ):
+        """Tests that the operations are delegated to the synchronous repository."""
+        mock_list_artifacts.return_value = []
+        mock_download.return_value = "/tmp/dst/model"
+        mock_delete.return_value = DeleteSummary(objects=1, deleted=1)
+        repo = AsyncOCIObjectStorageArtifactRepository(ARTIFACT_URI)
+
+        async def run():
+            await repo.log_artifact("model.pkl", "model")
+            return await asyncio.gather(
+                repo.list_artifacts("model"),
+                repo.download_artifacts("model", "/tmp/dst"),
+                repo.delete_artifacts("model"),
+            )
+
+        assert asyncio.run(run()) == [
+            [],
+            "/tmp/dst/model",
+            DeleteSummary(objects=1, deleted=1),
+        ]
+        mock_log_artifact.assert_called_once_with("model.pkl", "model")
+        mock_list_artifacts.assert_called_once_with("model")
+        mock_download.assert_called_once_with("model", "/tmp/dst")
+        mock_delete.assert_called_once_with("model")
+
+    @patch.object(OCIObjectStorageArtifactRepository, "log_artifact")
+    def test_max_concurrency(self, mock_log_artifact):
+        """Tests that at most `max_concurrency` operations run at a time."""
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def log_artifact(local_file, artifact_path):
+            with lock:
+                running.append(local_file)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(local_file)
+
+        mock_log_artifact.side_effect = log_artifact
+        repo = AsyncOCIObjectStorageArtifactRepository(ARTIFACT_URI, max_concurrency=2)
+
+        async def run():
+            await asyncio.gather(*(repo.log_artifact(f"{i}.txt") for i in range(10)))
+
+        asyncio.run(run())
+        assert mock_log_artifact.call_count == 10
+        assert max(peak) <= 2
+
+    @patch.object(OCIObjectStorageArtifactRepository, "log_artifact")
+    def test_several_event_loops(self, mock_log_artifact):
+        """Tests that a repository can be used from several event loops."""
+        mock_log_artifact.side_effect = lambda *args: time.sleep(0.01)
+        repo = AsyncOCIObjectStorageArtifactRepository(ARTIFACT_URI, max_concurrency=1)
+
+        async def run():
+            await asyncio.gather(*(repo.log_artifact(f"{i}.txt") for i in range(3)))
+
+        asyncio.run(run())
+        asyncio.run(run())
+        assert mock_log_artifact.call_count == 6
+
+    @patch.dict(os.environ, {async_oci_object_storage.ASYNC_MAX_WORKERS: "4"})
+    def test_max_concurrency_defaults_to_max_workers(self):
+        """Tests that by default no more operations are queued than the pool runs."""
+        assert AsyncOCIObjectStorageArtifactRepository(ARTIFACT_URI).max_concurrency == 4
+
+    @patch.object(ArtifactUploader, "_upload_with_retry")
+    @patch.object(ArtifactUploader, "__init__", return_value=None)
+    def test_log_artifacts_uploads_files_on_shared_pool(self, _, mock_upload, tmp_path):
+        """Tests that the files of a directory are uploaded by operations of the shared pool."""
+        (tmp_path / "sub").mkdir()
+        for name in ("a.txt", "b.txt", "sub/c.txt"):
+            (tmp_path / name).write_text(name)
+        threads = []
+
+        def upload(local_file, dst_path, retries):
+            threads.append(threading.current_thread().name)
+            if local_file.endswith("b.txt"):
+                raise ValueError("rejected")
+
+        mock_upload.side_effect = upload
+        repo = AsyncOCIObjectStorageArtifactRepository(ARTIFACT_URI, max_concurrency=2)
+
+        with pytest.raises(ArtifactTransferError) as ex:
+            asyncio.run(repo.log_artifacts(str(tmp_path), "data"))
+
+        assert sorted(call.args[1] for call in mock_upload.call_args_list) == [
+            f"{ARTIFACT_URI}/data/a.txt",
+            f"{ARTIFACT_URI}/data/b.txt",
+            f"{ARTIFACT_URI}/data/sub/c.txt",
+        ]
+        assert all(name.startswith("oci-mlflow-async") for name in threads)
+        assert list(ex.value.failures) == [str(tmp_path / "b.txt")]
+        assert ex.value.total == 3
@@ -3,11 +3,24 @@
 
 # Copyright (c) 2023 Oracle and/or its affiliates.
 # Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from oci_mlflow.auth_plugin import OCIMLFlowAuthRequestProvider
+from oci_mlflow.signer_cache import SignerCache
 
 
 class TestOCIMLFlowAuth:
+    def setup_method(self):
+        SignerCache.clear()
+
+    @patch("oci_mlflow.auth_plugin.install_session_pool")
+    def test_installs_session_pool(self, mock_install_session_pool):
+        """Tests that the pooled sessions are installed when the provider is created, if enabled."""
+        OCIMLFlowAuthRequestProvider()
+        mock_install_session_pool.assert_not_called()
+        with patch.dict("os.environ", {"OCI_MLFLOW_HTTP_POOLING": "1"}):
+            OCIMLFlowAuthRequestProvider()
+        mock_install_session_pool.assert_called_once_with()
+
     def test_get_name(self):
         provider = OCIMLFlowAuthRequestProvider()
         assert provider.get_name() == "OCI_REQUEST_AUTH"
@@ -22,3 +35,21 @@ class TestOCIMLFlowAuth:
         provider = OCIMLFlowAuthRequestProvider()
         auth = provider.get_auth()
         assert auth == "test_default_signer"
+
+    @patch("oci_mlflow.auth_plugin.default_signer")
+    def test_get_auth_is_cached(self, mock_default_signer):
+        mock_default_signer.return_value = {
+            "config": {},
+            "signer": MagicMock(spec=[]),
+            "client_kwargs": {},
+        }
+        provider = OCIMLFlowAuthRequestProvider()
+        signer = provider.get_auth()
+        assert OCIMLFlowAuthRequestProvider().get_auth() is signer
+        mock_default_signer.assert_called_once()
+        assert provider.get_stats() == {
+            "hits": 1,
+            "misses": 1,
+            "refreshes": 0,
+            "refresh_errors": 0,
+        }
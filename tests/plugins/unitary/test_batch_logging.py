@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from oci_mlflow import batch_logging
+from oci_mlflow.batch_logging import BatchLogger, _split_batches
+
+
+class TestBatchLogger:
+    def setup_method(self):
+        self.client = MagicMock()
+
+    def test_flush(self):
+        """Tests that the buffered values are logged with a single batch."""
+        with BatchLogger("run-1", client=self.client, flush_interval=3600) as batch_logger:
+            batch_logger.log_metric("loss", 0.5, step=1, timestamp=10)
+            batch_logger.log_metrics({"loss": 0.4, "accuracy": 0.9}, step=2)
+            batch_logger.log_param("lr", 0.1)
+            batch_logger.log_param("lr", 0.2)
+            batch_logger.set_tags({"stage": "train"})
+            assert batch_logger.pending == 5
+            self.client.log_batch.assert_not_called()
+
+        self.client.log_batch.assert_called_once()
+        kwargs = self.client.log_batch.call_args.kwargs
+        assert [(m.key, m.value, m.step) for m in kwargs["metrics"]] == [
+            ("loss", 0.5, 1),
+            ("loss", 0.4, 2),
+            ("accuracy", 0.9, 2),
+        ]
+        assert [(p.key, p.value) for p in kwargs["params"]] == [("lr", "0.2")]
+        assert [(t.key, t.value) for t in kwargs["tags"]] == [("stage", "train")]
+        assert batch_logger not in batch_logging._loggers
+        with pytest.raises(ValueError):
+            batch_logger.log_metric("loss", 0.1)
+
+    def test_flush_when_batch_is_full(self):
+        """Tests that the background thread flushes once the batch size is reached."""
+        flushed = threading.Event()
+        self.client.log_batch.side_effect = lambda *args, **kwargs: flushed.set()
+        batch_logger = BatchLogger("run-1", client=self.client, batch_size=3, flush_interval=3600)
+        try:
+            batch_logger.log_metrics({"a": 1, "b": 2, "c": 3})
+            assert flushed.wait(5)
+            assert batch_logger.pending == 0
+        finally:
+            batch_logger.close()
+
+    def test_failed_batches_are_requeued(self):
+        """Tests that a failed batch is sent again by the next flush, before newer values."""
+        self.client.log_batch.side_effect = [RuntimeError("unavailable"), None]
+        batch_logger = BatchLogger("run-1", client=self.client, flush_interval=3600)
+        batch_logger.log_metric("loss", 0.5, step=1)
+        batch_logger.log_param("lr", 0.1)
+        assert isinstance(batch_logger._flush(), RuntimeError)
+        assert batch_logger.pending == 2
+
+        batch_logger.log_metric("loss", 0.4, step=2)
+        batch_logger.log_param("lr", 0.2)
+        batch_logger.close()
+
+        assert self.client.log_batch.call_count == 2
+        kwargs = self.client.log_batch.call_args.kwargs
+        assert [(m.value, m.step) for m in kwargs["metrics"]] == [(0.5, 1), (0.4, 2)]
+        assert [(p.key, p.value) for p in kwargs["params"]] == [("lr", "0.2")]
+
+    def test_failed_batches_are_dropped_after_retries(self):
+        """Tests that a batch failing more than `retries` times is dropped and its error raised."""
+        self.client.log_batch.side_effect = RuntimeError("rejected")
+        batch_logger = BatchLogger("run-1", client=self.client, flush_interval=3600, retries=2)
+        batch_logger.log_metric("loss", 0.5)
+        with pytest.raises(RuntimeError):
+            batch_logger.close()
+        assert self.client.log_batch.call_count == 3
+        assert batch_logger.pending == 0
+
+    def test_flush_when_batch_fills_during_flush(self):
+        """Tests that values added while a flush is in progress trigger the next one."""
+        release = threading.Event()
+        flushed = threading.Semaphore(0)
+
+        def log_batch(*args, **kwargs):
+            release.wait(5)
+            flushed.release()
+
+        self.client.log_batch.side_effect = log_batch
+        batch_logger = BatchLogger("run-1", client=self.client, batch_size=2, flush_interval=3600)
+        try:
+            batch_logger.log_metrics({"a": 1, "b": 2})
+            # Wait for the background flush to take the values before filling the batch again.
+            while batch_logger.pending:
+                time.sleep(0.01)
+            batch_logger.log_metrics({"c": 3, "d": 4})
+            release.set()
+            assert flushed.acquire(timeout=5)
+            assert flushed.acquire(timeout=5)
+            assert batch_logger.pending == 0
+        finally:
+            batch_logger.close()
+
+    @patch("mlflow.active_run", create=True, return_value=None)
+    def test_requires_run(self, _):
+        with pytest.raises(ValueError):
+            BatchLogger(client=self.client)
+
+    @pytest.mark.parametrize(
+        "env",
+        [
+            {batch_logging.BATCH_SIZE: "0"},
+            {batch_logging.BATCH_SIZE: "many"},
+            {batch_logging.BATCH_FLUSH_INTERVAL: "-1"},
+            {batch_logging.BATCH_RETRIES: "-1"},
+        ],
+    )
+    def test_rejects_invalid_settings(self, env):
+        """Tests that malformed, zero and negative settings are rejected."""
+        with patch.dict("os.environ", env):
+            with pytest.raises(ValueError):
+                BatchLogger("run-1", client=self.client)
+
+    def test_split_batches(self):
+        """Tests that the batches stay within the limits of the `log-batch` request."""
+        metrics = [f"metric-{i}" for i in range(2500)]
+        params = [f"param-{i}" for i in range(150)]
+        tags = [f"tag-{i}" for i in range(10)]
+
+        batches = list(_split_batches(metrics, params, tags))
+
+        for batch_metrics, batch_params, batch_tags in batches:
+            assert len(batch_metrics) <= batch_logging.MAX_METRICS_PER_BATCH
+            assert len(batch_params) + len(batch_tags) <= batch_logging.MAX_PARAMS_TAGS_PER_BATCH
+            assert (
+                len(batch_metrics) + len(batch_params) + len(batch_tags)
+                <= batch_logging.MAX_ENTITIES_PER_BATCH
+            )
+        assert sum((batch[0] for batch in batches), []) == metrics
+        assert sum((batch[1] for batch in batches), []) == params
+        assert sum((batch[2] for batch in batches), []) == tags
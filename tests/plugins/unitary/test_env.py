@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from oci_mlflow.env import get_env_bool, get_env_float, get_env_int
+
+SETTING = "OCI_MLFLOW_TEST_SETTING"
+
+
+class TestEnv:
+    @pytest.mark.parametrize(
+        "value, expected", [(None, 7), ("", 7), ("  ", 7), ("42", 42), (" 3 ", 3)]
+    )
+    def test_get_env_int(self, value, expected):
+        """Tests reading integers, falling back to the default when unset."""
+        env = {} if value is None else {SETTING: value}
+        with patch.dict(os.environ, env):
+            assert get_env_int(SETTING, 7) == expected
+
+    @pytest.mark.parametrize("value", ["abc", "1.5", "0", "-1"])
+    def test_get_env_int_rejects_invalid_values(self, value):
+        """Tests that malformed, zero and negative integers are rejected."""
+        with patch.dict(os.environ, {SETTING: value}):
+            with pytest.raises(ValueError, match=SETTING):
+                get_env_int(SETTING, 7)
+
+    def test_get_env_int_chains_parse_errors(self):
+        """Tests that the parse error is kept as the cause of a malformed setting error."""
+        with patch.dict(os.environ, {SETTING: "abc"}):
+            with pytest.raises(ValueError) as exc_info:
+                get_env_int(SETTING, 7)
+        assert isinstance(exc_info.value.__cause__, ValueError)
+
+    def test_get_env_int_allow_zero(self):
+        """Tests that zero is accepted when allowed, but negative values are not."""
+        with patch.dict(os.environ, {SETTING: "0"}):
+            assert get_env_int(SETTING, 7, allow_zero=True) == 0
+        with patch.dict(os.environ, {SETTING: "-1"}):
+            with pytest.raises(ValueError, match="non-negative"):
+                get_env_int(SETTING, 7, allow_zero=True)
+
+    @pytest.mark.parametrize("value", ["abc", "nan", "inf", "0", "-0.5"])
+    def test_get_env_float_rejects_invalid_values(self, value):
+        """Tests that malformed, infinite, zero and negative numbers are rejected."""
+        with patch.dict(os.environ, {SETTING: value}):
+            with pytest.raises(ValueError, match=SETTING):
+                get_env_float(SETTING, 1.0)
+
+    def test_get_env_float(self):
+        """Tests reading numbers."""
+        with patch.dict(os.environ, {SETTING: "0.25"}):
+            assert get_env_float(SETTING, 1.0) == 0.25
+        with patch.dict(os.environ, {SETTING: "0"}):
+            assert get_env_float(SETTING, 1.0, allow_zero=True) == 0
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("1", True), ("TRUE", True), ("yes", True), ("0", False), ("false", False), ("", None)],
+    )
+    def test_get_env_bool(self, value, expected):
+        """Tests reading flags, falling back to the default when unset."""
+        with patch.dict(os.environ, {SETTING: value}):
+            assert get_env_bool(SETTING, default=None) is expected
+
+    def test_get_env_bool_rejects_invalid_values(self):
+        """Tests that unknown flag values are rejected."""
+        with patch.dict(os.environ, {SETTING: "maybe"}):
+            with pytest.raises(ValueError, match=SETTING):
+                get_env_bool(SETTING)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+import functools
+import inspect
+import socket
+from unittest.mock import patch
+
+import pytest
+import requests
+from mlflow.utils import request_utils
+
+from oci_mlflow import http_session
+from oci_mlflow.http_session import (
+    PooledHTTPAdapter,
+    create_session,
+    install_session_pool,
+    uninstall_session_pool,
+)
+
+
+def get_request_session(max_retries: int) -> requests.Session:
+    """Gets a session the way MLflow does for the tracking requests."""
+    arguments = {
+        "max_retries": max_retries,
+        "backoff_factor": 0,
+        "backoff_jitter": 0,
+        "retry_codes": (),
+        "raise_on_status": True,
+        "respect_retry_after_header": True,
+    }
+    parameters = inspect.signature(request_utils._get_request_session).parameters
+    return request_utils._get_request_session(
+        **{name: value for name, value in arguments.items() if name in parameters}
+    )
+
+
+class TestHTTPSession:
+    def setup_method(self):
+        request_utils._cached_get_request_session.cache_clear()
+
+    def teardown_method(self):
+        uninstall_session_pool()
+        request_utils._cached_get_request_session.cache_clear()
+
+    def test_create_session(self):
+        """Tests that sessions keep a pool of keep-alive connections."""
+        session = create_session(pool_size=64, max_retries=3)
+        adapter = session.get_adapter("https://tracking.example.com")
+        assert isinstance(adapter, PooledHTTPAdapter)
+        assert adapter.max_retries.total == 3
+        pool = adapter.poolmanager.connection_from_url("https://tracking.example.com")
+        assert pool.pool.maxsize == 64
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in pool.conn_kw["socket_options"]
+
+    @patch.dict("os.environ", {http_session.HTTP_POOL_SIZE: "48"})
+    def test_install_session_pool(self):
+        """Tests that the MLflow sessions are tuned once, keeping their retry policy."""
+        original = request_utils._cached_get_request_session
+        assert install_session_pool()
+        assert install_session_pool()
+
+        session = get_request_session(5)
+        adapter = session.get_adapter("https://tracking.example.com")
+        assert isinstance(adapter, PooledHTTPAdapter)
+        assert adapter.max_retries.total == 5
+        assert adapter._pool_maxsize == 48
+        assert get_request_session(5) is session
+        assert session.get_adapter("https://tracking.example.com") is adapter
+
+        uninstall_session_pool()
+        assert request_utils._cached_get_request_session is original
+
+    def test_install_session_pool_is_idempotent(self):
+        """Tests that a session factory wrapped by an earlier import is not wrapped again."""
+        original = request_utils._cached_get_request_session
+        assert install_session_pool()
+        wrapped = request_utils._cached_get_request_session
+        http_session._installed = None
+
+        assert install_session_pool()
+        assert request_utils._cached_get_request_session is wrapped
+        uninstall_session_pool()
+        assert request_utils._cached_get_request_session is original
+
+    def test_install_session_pool_skips_old_mlflow(self):
+        """Tests that the MLflow versions older than the supported ones are left untouched."""
+        original = request_utils._cached_get_request_session
+        with patch("mlflow.__version__", "2.7.1"):
+            assert not install_session_pool()
+        assert request_utils._cached_get_request_session is original
+
+    @pytest.mark.parametrize(
+        "factory",
+        [
+            lambda max_retries: requests.Session(),
+            functools.lru_cache()(lambda retries: requests.Session()),
+        ],
+    )
+    def test_install_session_pool_skips_unknown_factory(self, factory):
+        """Tests that unknown MLflow session factories are left untouched."""
+        with patch.object(request_utils, http_session.SESSION_FACTORY, factory):
+            assert not install_session_pool()
+            assert request_utils._cached_get_request_session is factory
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+import os
+import tempfile
+from unittest.mock import MagicMock, Mock, patch
+
+from oci_mlflow import object_storage_auth, oci_object_storage
+from oci_mlflow.object_storage_auth import (
+    DEFAULT_DELEGATION_TOKEN_PATH,
+    DelegationTokenWatcher,
+    ObjectStorageClientPool,
+    get_delegation_token_signer,
+    get_signer,
+    get_token_path,
+)
+from oci_mlflow.signer_cache import SignerCache
+
+
+class TestObjectStorageClientPool:
+    def setup_method(self):
+        ObjectStorageClientPool.invalidate()
+
+    def teardown_method(self):
+        ObjectStorageClientPool.invalidate()
+
+    @patch("oci_mlflow.object_storage_auth.OCIClientFactory")
+    def test_reuses_client_for_same_principal(self, mock_factory):
+        """Tests that signers of the same principal share one client and upload manager."""
+        mock_factory.side_effect = lambda **kwargs: MagicMock()
+        config = {"tenancy": "ocid1.tenancy", "user": "ocid1.user", "region": "us-ashburn-1"}
+        first = {"config": config, "signer": Mock(), "client_kwargs": {}}
+        second = {"config": dict(config), "signer": Mock(), "client_kwargs": {}}
+
+        client = ObjectStorageClientPool.get_client(first)
+        assert ObjectStorageClientPool.get_client(second) is client
+        assert ObjectStorageClientPool.get_upload_manager(
+            first
+        ) is ObjectStorageClientPool.get_upload_manager(second)
+        assert mock_factory.call_count == 1
+
+    @patch.dict(os.environ, {object_storage_auth.TOKEN_CHECK_INTERVAL: "0"})
+    @patch("oci_mlflow.object_storage_auth.OCIClientFactory")
+    def test_recreates_client_when_token_rotates(self, mock_factory):
+        """Tests that a rotated delegation token invalidates the pooled client."""
+        mock_factory.side_effect = lambda **kwargs: MagicMock()
+        auth = {"config": {}, "signer": Mock(), "client_kwargs": {}}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            token_path = os.path.join(tmp_dir, "delegation.jwt")
+            with open(token_path, "w") as f:
+                f.write("token")
+            client = ObjectStorageClientPool.get_client(auth, token_path)
+            assert ObjectStorageClientPool.get_client(auth, token_path) is client
+
+            stat = os.stat(token_path)
+            os.utime(token_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            assert ObjectStorageClientPool.get_client(auth, token_path) is not client
+
+    @patch("oci_mlflow.object_storage_auth.OCIClientFactory")
+    def test_invalidate_recreated_signer(self, mock_factory):
+        """Tests that a signer recreated by the background refresh drops the pooled clients."""
+        mock_factory.side_effect = lambda **kwargs: MagicMock()
+        config = {"tenancy": "ocid1.tenancy", "region": "us-ashburn-1"}
+        auth = {"config": config, "signer": Mock(), "client_kwargs": {}}
+        other = {"config": {"tenancy": "ocid1.other"}, "signer": Mock(), "client_kwargs": {}}
+        client = ObjectStorageClientPool.get_client(auth)
+        other_client = ObjectStorageClientPool.get_client(other)
+
+        oci_object_storage._on_signer_recreated(auth)
+
+        assert ObjectStorageClientPool.get_client(auth) is not client
+        assert ObjectStorageClientPool.get_client(other) is other_client
+
+    @patch("oci_mlflow.object_storage_auth.OCIClientFactory")
+    def test_invalidate(self, mock_factory):
+        """Tests dropping the pooled client of a signer."""
+        mock_factory.side_effect = lambda **kwargs: MagicMock()
+        auth = {"config": {}, "signer": Mock(), "client_kwargs": {}}
+        client = ObjectStorageClientPool.get_client(auth)
+        ObjectStorageClientPool.invalidate(auth)
+        assert ObjectStorageClientPool.get_client(auth) is not client
+
+
+class TestUtils:
+    def setup_method(self):
+        SignerCache.clear()
+        DelegationTokenWatcher.clear()
+
+    @patch("oci_mlflow.object_storage_auth._file_state")
+    def test_get_token_path_in_df(self, mock_file_state):
+        """Tests getting the token path in DF session."""
+        mock_file_state.return_value = (1, 1)
+        assert get_token_path() == DEFAULT_DELEGATION_TOKEN_PATH
+
+    @patch("oci_mlflow.object_storage_auth._file_state")
+    def test_get_token_path_locally(self, mock_file_state):
+        """Tests getting the token path locally."""
+        mock_file_state.return_value = None
+        assert get_token_path() == None
+
+    @patch.dict(os.environ, {object_storage_auth.TOKEN_CHECK_INTERVAL: "3600"})
+    @patch("oci_mlflow.object_storage_auth._file_state")
+    def test_get_token_path_is_cached(self, mock_file_state):
+        """Tests that the token file is checked once per check interval, with the token state."""
+        mock_file_state.return_value = (1, 1)
+        for _ in range(3):
+            token_path = get_token_path()
+            assert object_storage_auth.token_file_state(token_path) == (1, 1)
+        mock_file_state.assert_called_once_with(DEFAULT_DELEGATION_TOKEN_PATH)
+
+    @patch("oci_mlflow.object_storage_auth.get_delegation_token_signer")
+    @patch("ads.common.auth.set_auth")
+    def test_get_signer_in_df(self, mock_set_auth, mock_get_signer):
+        """Tests getting the storage options in DF session."""
+        get_signer(token_path=DEFAULT_DELEGATION_TOKEN_PATH)
+        mock_set_auth.assert_called_once_with(
+            signer_callable=mock_get_signer,
+            signer_kwargs={"token_path": DEFAULT_DELEGATION_TOKEN_PATH},
+        )
+
+    @patch("oci_mlflow.object_storage_auth.get_delegation_token_signer")
+    @patch("ads.common.auth.default_signer")
+    @patch("ads.common.auth.set_auth")
+    def test_get_signer_in_df_is_cached(self, mock_set_auth, mock_default_signer, _, tmp_path):
+        """Tests that the delegation token signer is cached, though creating it changes settings."""
+        settings = ["api_key"]
+        mock_set_auth.side_effect = lambda **kwargs: settings.__setitem__(0, "delegation_token")
+        mock_default_signer.side_effect = lambda: {"config": {}, "signer": object()}
+        token_path = tmp_path / "delegation.jwt"
+        token_path.write_text("token")
+
+        with patch.object(object_storage_auth, "auth_settings", side_effect=lambda: tuple(settings)):
+            auth = get_signer(token_path=str(token_path))
+            assert get_signer(token_path=str(token_path)) is auth
+        assert mock_default_signer.call_count == 1
+
+    @patch("ads.common.auth.default_signer")
+    @patch("ads.common.auth.set_auth")
+    def test_get_signer_locally(self, mock_set_auth, mock_default_signer):
+        """Tests getting the storage options locally."""
+        expected_config = {"config": "value", "signer": "value2"}
+        mock_default_signer.return_value = expected_config
+
+        signer = get_signer(token_path=None)
+        mock_set_auth.assert_not_called()
+        assert signer == expected_config
+
+    @patch("ads.common.auth.default_signer")
+    def test_get_signer_is_cached(self, mock_default_signer):
+        """Tests that signers are reused until refreshed."""
+        mock_default_signer.side_effect = lambda: {"config": {}, "signer": object()}
+
+        auth = get_signer(token_path=None)
+        assert get_signer(token_path=None) is auth
+        assert get_signer(token_path=None, refresh=True) is not auth
+        assert mock_default_signer.call_count == 2
+        assert SignerCache.stats()["hits"] == 1
+
+    @patch.dict(os.environ, {object_storage_auth.TOKEN_CHECK_INTERVAL: "0"})
+    @patch("oci_mlflow.object_storage_auth.get_delegation_token_signer")
+    @patch("ads.common.auth.default_signer")
+    @patch("ads.common.auth.set_auth")
+    def test_get_signer_after_token_rotation(self, _, mock_default_signer, __, tmp_path):
+        """Tests that the signer is recreated when the delegation token file changes."""
+        mock_default_signer.side_effect = lambda: {"config": {}, "signer": object()}
+        token_path = tmp_path / "delegation.jwt"
+        token_path.write_text("token-1")
+
+        auth = get_signer(token_path=str(token_path))
+        assert get_signer(token_path=str(token_path)) is auth
+        os.utime(token_path, ns=(0, 0))
+        assert get_signer(token_path=str(token_path)) is not auth
+
+    @patch("oci_mlflow.object_storage_auth.InstancePrincipalsDelegationTokenSigner")
+    def test_get_delegation_token_signer(self, mock_signer, tmp_path):
+        """Tests that the delegation token is read again only when the file is rotated."""
+        mock_signer.side_effect = lambda delegation_token: Mock(token=delegation_token)
+        token_path = tmp_path / "delegation.jwt"
+        token_path.write_text("token-1")
+
+        with patch.dict(os.environ, {object_storage_auth.TOKEN_CHECK_INTERVAL: "3600"}):
+            signer = get_delegation_token_signer(str(token_path))
+            assert signer.token == "token-1"
+            token_path.write_text("token-2")
+            os.utime(token_path, ns=(0, 0))
+            # The file is not checked again within the check interval.
+            assert get_delegation_token_signer(str(token_path)) is signer
+
+        with patch.dict(os.environ, {object_storage_auth.TOKEN_CHECK_INTERVAL: "0"}):
+            rotated = get_delegation_token_signer(str(token_path))
+            assert rotated.token == "token-2"
+            assert get_delegation_token_signer(str(token_path)) is rotated
+        assert mock_signer.call_count == 2
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+from unittest.mock import MagicMock
+
+import pytest
+from oci.exceptions import ServiceError
+
+from oci_mlflow.object_storage_utils import (
+    OBJECT_FIELDS,
+    ArtifactTransferError,
+    _is_retryable,
+    iter_objects,
+    run_parallel,
+)
+
+
+class DataObject:
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+
+def list_objects_response(objects, next_start_with=None):
+    return MagicMock(data=MagicMock(objects=objects, next_start_with=next_start_with))
+
+
+class TestObjectStorageUtils:
+    def test_iter_objects(self):
+        """Tests streaming the objects of a prefix across pages."""
+        mock_client = MagicMock()
+        mock_client.list_objects.side_effect = [
+            list_objects_response(
+                [DataObject("run/a.txt", 1), DataObject("run-2/b.txt", 2)], "run/c.txt"
+            ),
+            list_objects_response([DataObject("run/c.txt", 3)]),
+        ]
+        objects = list(iter_objects(mock_client, "oci://my-bucket@my-namespace/run/"))
+
+        assert [obj.name for obj in objects] == ["run/a.txt", "run/c.txt"]
+        mock_client.list_objects.assert_called_with(
+            "my-namespace",
+            "my-bucket",
+            prefix="run",
+            start="run/c.txt",
+            fields=OBJECT_FIELDS,
+        )
+
+    @pytest.mark.parametrize(
+        "error, retryable",
+        [
+            (ServiceError(429, "TooManyRequests", {}, "throttled"), True),
+            (ServiceError(500, "InternalServerError", {}, "failed"), True),
+            (ServiceError(404, "ObjectNotFound", {}, "not found"), False),
+            (ConnectionResetError("reset"), True),
+            (TimeoutError("timed out"), True),
+            (FileNotFoundError("missing"), False),
+            (PermissionError("denied"), False),
+            (KeyError("key"), False),
+            (TypeError("bug"), False),
+        ],
+    )
+    def test_is_retryable(self, error, retryable):
+        """Tests that only throttling, server and transport errors are retried."""
+        assert _is_retryable(error) is retryable
+
+    def test_run_parallel(self):
+        """Tests that the failures of the parallel transfers are collected into one error."""
+        done = []
+
+        def transfer(name: str):
+            if name == "bad":
+                raise ValueError(name)
+
+        with pytest.raises(ArtifactTransferError) as exc_info:
+            run_parallel(
+                transfer,
+                ((name, (name,)) for name in ("a", "bad", "b")),
+                max_workers=2,
+                operation="upload",
+                callback=lambda name, error: done.append((name, error is None)),
+            )
+        assert list(exc_info.value.failures) == ["bad"]
+        assert exc_info.value.total == 3
+        assert sorted(done) == [("a", True), ("b", True), ("bad", False)]
@@ -1,7 +1,11 @@
 #!/usr/bin/env python
 # -*- coding: utf-8; -*-
 
+import gzip
+import io
+import json
 import os
+import posixpath
 import tempfile
 from unittest.mock import MagicMock, Mock, patch
 
@@ -9,22 +13,40 @@ from unittest.mock import MagicMock, Mock, patch
 # Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
 import pytest
 from mlflow.entities import FileInfo
+from mlflow.exceptions import MlflowException
 
-from oci_mlflow import oci_object_storage
-from oci_mlflow.oci_object_storage import (
-    ArtifactUploader,
-    OCIObjectStorageArtifactRepository,
-    get_token_path,
-    get_signer,
-    DEFAULT_DELEGATION_TOKEN_PATH,
-)
-from oci import object_storage
+from oci_mlflow import artifact_upload, object_storage_auth, oci_object_storage
+from oci_mlflow.artifact_cache import ARTIFACT_CACHE_DIR
+from oci_mlflow.artifact_index import ArchiveCatalog
+from oci_mlflow.artifact_upload import ArtifactUploader
+from oci_mlflow.object_storage_utils import OBJECT_FIELDS, ArtifactTransferError, file_md5
+from oci_mlflow.oci_object_storage import OCIObjectStorageArtifactRepository
+from oci.exceptions import ServiceError
 
 
 class DataObject:
-    def __init__(self, name, size):
+    def __init__(self, name, size, etag=None, md5=None, time_modified=None):
         self.name = name
         self.size = size
+        self.etag = etag
+        self.md5 = md5
+        self.time_modified = time_modified
+
+
+def list_objects_response(objects, next_start_with=None):
+    return MagicMock(data=MagicMock(objects=objects, next_start_with=next_start_with))
+
+
+def ranged_client(content: bytes) -> MagicMock:
+    """Creates a mock Object Storage client serving the ranged reads of an object."""
+
+    def get_object(namespace_name, bucket_name, object_name, range):
+        start, end = (int(offset) for offset in range[len("bytes=") :].split("-"))
+        return Mock(data=Mock(content=content[start : end + 1]))
+
+    mock_client = MagicMock()
+    mock_client.get_object.side_effect = get_object
+    return mock_client
 
 
 class TestOCIObjectStorageArtifactRepository:
@@ -38,9 +60,13 @@ class TestOCIObjectStorageArtifactRepository:
 
     @pytest.fixture()
     def oci_artifact_repo(self):
-        return OCIObjectStorageArtifactRepository(
+        OCIObjectStorageArtifactRepository._archive_cache.clear()
+        repo = OCIObjectStorageArtifactRepository(
             artifact_uri="oci://my-bucket@my-namespace/my-artifact-path"
         )
+        # No archives are logged, unless the test logs some.
+        repo._read_archive_manifests = MagicMock(return_value=[])
+        return repo
 
     @pytest.fixture
     def mock_fsspec_open(self):
@@ -62,6 +88,7 @@ class TestOCIObjectStorageArtifactRepository:
     def test_download_file(self, oci_artifact_repo):
         mock_fs = MagicMock()
         mock_fs.download.return_value = None
+        mock_fs.info.return_value = {"size": 10}
         oci_artifact_repo.get_fs = MagicMock(return_value=mock_fs)
         with tempfile.TemporaryDirectory() as tmp_dir:
             local_path = os.path.join(tmp_dir, "my_file.txt")
@@ -76,6 +103,145 @@ class TestOCIObjectStorageArtifactRepository:
                 local_path,
             )
 
+    @patch.dict(
+        os.environ,
+        {
+            oci_object_storage.MULTIPART_DOWNLOAD_THRESHOLD: "10",
+            oci_object_storage.DOWNLOAD_PART_SIZE: "4",
+            oci_object_storage.DOWNLOAD_PARALLELISM: "3",
+        },
+    )
+    def test_download_file_in_ranges(self, oci_artifact_repo):
+        """Tests that large objects are fetched as byte ranges."""
+        content = bytes(range(26))
+        mock_fs = MagicMock()
+        mock_fs.info.return_value = {"size": len(content), "etag": "etag-1"}
+        oci_artifact_repo.get_fs = MagicMock(return_value=mock_fs)
+        mock_client = ranged_client(content)
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            local_path = os.path.join(tmp_dir, "weights.bin")
+            oci_artifact_repo._download_file("weights.bin", local_path)
+
+            with open(local_path, "rb") as f:
+                assert f.read() == content
+            assert os.listdir(tmp_dir) == ["weights.bin"]
+        # One metadata request, then exactly one request per range.
+        mock_fs.info.assert_called_once()
+        ranges = [call.kwargs["range"] for call in mock_client.get_object.call_args_list]
+        assert len(ranges) == 7
+        assert set(ranges) == {
+            "bytes=0-3",
+            "bytes=4-7",
+            "bytes=8-11",
+            "bytes=12-15",
+            "bytes=16-19",
+            "bytes=20-23",
+            "bytes=24-25",
+        }
+        mock_client.head_object.assert_not_called()
+        mock_fs.cat_file.assert_not_called()
+        mock_fs.open.assert_not_called()
+        mock_fs.download.assert_not_called()
+
+    @patch.dict(
+        os.environ,
+        {
+            oci_object_storage.MULTIPART_DOWNLOAD_THRESHOLD: "10",
+            oci_object_storage.DOWNLOAD_PART_SIZE: "4",
+        },
+    )
+    def test_download_file_in_ranges_resumes(self, oci_artifact_repo):
+        """Tests that an interrupted ranged download only fetches the missing parts."""
+        content = bytes(range(12))
+        mock_fs = MagicMock()
+        mock_fs.info.return_value = {"size": len(content), "etag": "etag-1"}
+        oci_artifact_repo.get_fs = MagicMock(return_value=mock_fs)
+        mock_client = ranged_client(content)
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            local_path = os.path.join(tmp_dir, "weights.bin")
+            partial_path = local_path + oci_object_storage.PARTIAL_DOWNLOAD_SUFFIX
+            with open(partial_path, "wb") as f:
+                f.write(content[:8] + bytes(4))
+            with open(partial_path + ".json", "w") as f:
+                json.dump({"etag": "etag-1", "size": 12, "part_size": 4, "done": [0, 4]}, f)
+
+            oci_artifact_repo._download_file("weights.bin", local_path)
+
+            with open(local_path, "rb") as f:
+                assert f.read() == content
+        mock_client.get_object.assert_called_once_with(
+            "my-namespace", "my-bucket", "my-artifact-path/weights.bin", range="bytes=8-11"
+        )
+
+    def test_download_file_from_cache(self, oci_artifact_repo):
+        """Tests that repeated downloads of an unchanged object are served from the cache."""
+        mock_fs = MagicMock()
+        mock_fs.info.return_value = {"size": 5, "etag": "etag-1"}
+
+        def download(remote_path, local_path):
+            with open(local_path, "w") as f:
+                f.write("model")
+
+        mock_fs.download.side_effect = download
+        oci_artifact_repo.get_fs = MagicMock(return_value=mock_fs)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_dir = os.path.join(tmp_dir, "cache")
+            with patch.dict(os.environ, {ARTIFACT_CACHE_DIR: cache_dir}):
+                for name in ("first.pkl", "second.pkl"):
+                    local_path = os.path.join(tmp_dir, name)
+                    oci_artifact_repo._download_file("model.pkl", local_path)
+                    with open(local_path) as f:
+                        assert f.read() == "model"
+        mock_fs.download.assert_called_once()
+
+    @patch.object(OCIObjectStorageArtifactRepository, "_download_file")
+    def test_download_artifacts_directory(self, mock_download_file, oci_artifact_repo):
+        """Tests that a directory is listed once and its files are downloaded."""
+        mock_client = MagicMock()
+        mock_client.list_objects.return_value = list_objects_response(
+            [
+                DataObject("my-artifact-path/model/", 0),
+                DataObject("my-artifact-path/model/MLmodel", 10),
+                DataObject("my-artifact-path/model/data/model.pkl", 20),
+            ]
+        )
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            local_path = oci_artifact_repo.download_artifacts("model", tmp_dir)
+
+            assert local_path == os.path.join(tmp_dir, "model")
+            assert os.path.isdir(os.path.join(tmp_dir, "model", "data"))
+            mock_client.list_objects.assert_called_once()
+            assert sorted(call.args for call in mock_download_file.call_args_list) == [
+                ("model/MLmodel", os.path.join(tmp_dir, "model", "MLmodel")),
+                ("model/data/model.pkl", os.path.join(tmp_dir, "model", "data", "model.pkl")),
+            ]
+
+    @patch.object(OCIObjectStorageArtifactRepository, "_download_file")
+    def test_download_artifacts_reports_failures(self, mock_download_file, oci_artifact_repo):
+        """Tests that failed downloads are aggregated into one error."""
+        mock_client = MagicMock()
+        mock_client.list_objects.return_value = list_objects_response(
+            [DataObject("my-artifact-path/a.txt", 1), DataObject("my-artifact-path/b.txt", 1)]
+        )
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+        mock_download_file.side_effect = [None, OSError("disk full")]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with pytest.raises(ArtifactTransferError) as exc_info:
+                oci_artifact_repo.download_artifacts("", tmp_dir)
+        assert len(exc_info.value.failures) == 1
+
+    def test_download_artifacts_to_missing_destination(self, oci_artifact_repo):
+        with pytest.raises(MlflowException):
+            oci_artifact_repo.download_artifacts("model", "/path/does/not/exist")
+
     @patch.object(ArtifactUploader, "upload")
     def test_log_artifact(self, mock_upload_file, oci_artifact_repo):
         local_file = "test_files/test.txt"
@@ -96,6 +262,17 @@ class TestOCIObjectStorageArtifactRepository:
         )
         mock_upload_file.assert_called_once_with(local_file, expected_dest_path)
 
+    @patch.object(ArtifactUploader, "upload_stream")
+    @patch.object(ArtifactUploader, "__init__", return_value=None)
+    def test_log_artifact_data(self, _, mock_upload_stream, oci_artifact_repo):
+        data = b"content"
+        oci_artifact_repo.log_artifact_data(data, "dir/data.bin")
+        mock_upload_stream.assert_called_once_with(
+            data, "oci://my-bucket@my-namespace/my-artifact-path/dir/data.bin"
+        )
+        with pytest.raises(ValueError, match="must be a file path"):
+            oci_artifact_repo.log_artifact_data(data, "dir/")
+
     def test_log_artifact_with_whitespace(self, oci_artifact_repo):
         local_file = "test_files/test.txt"
         artifact_path = "  "
@@ -132,19 +309,668 @@ class TestOCIObjectStorageArtifactRepository:
         oci_artifact_repo.log_artifacts(local_dir, dest_path)
         mock_upload_file.assert_called()
 
-    @patch.object(OCIObjectStorageArtifactRepository, "get_fs")
-    def test_delete_artifacts(self, mock_get_fs, oci_artifact_repo):
-        mock_fs = Mock()
-        mock_get_fs.return_value = mock_fs
-        mock_fs.ls.return_value = ["test/file1", "test/file2", "test/folder/"]
+    @patch.object(ArtifactUploader, "upload")
+    def test_log_artifacts_keeps_sub_folders(self, mock_upload_file, oci_artifact_repo):
+        local_dir = os.path.join(self.curr_dir, "artifacts")
+        oci_artifact_repo.log_artifacts(local_dir, "logs")
+        uploaded = sorted(call.args[1] for call in mock_upload_file.call_args_list)
+        prefix = "oci://my-bucket@my-namespace/my-artifact-path/logs/"
+        assert uploaded == [
+            prefix + "1.txt",
+            prefix + "2.txt",
+            prefix + "sub_folder/3.txt",
+            prefix + "sub_folder/4.txt",
+        ]
+
+    def test_delete_artifacts(self, oci_artifact_repo):
+        mock_client = MagicMock()
+        mock_client.list_objects.return_value = list_objects_response(
+            [
+                DataObject("my-artifact-path/test/file1", 1),
+                DataObject("my-artifact-path/test/file2", 2),
+                DataObject("my-artifact-path/test/folder/file3", 3),
+            ]
+        )
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
         oci_artifact_repo.delete_artifacts("test")
+        mock_client.list_objects.assert_called_once_with(
+            "my-namespace",
+            "my-bucket",
+            prefix="my-artifact-path/test",
+            start=None,
+            fields=OBJECT_FIELDS,
+        )
+        assert mock_client.delete_object.call_count == 3
+        mock_client.delete_object.assert_any_call(
+            "my-namespace", "my-bucket", "my-artifact-path/test/file1"
+        )
+        mock_client.delete_object.assert_any_call(
+            "my-namespace", "my-bucket", "my-artifact-path/test/file2"
+        )
+        mock_client.delete_object.assert_any_call(
+            "my-namespace", "my-bucket", "my-artifact-path/test/folder/file3"
+        )
+
+    def test_bulk_delete_artifacts_dry_run(self, oci_artifact_repo):
+        """Tests that a dry run only counts the objects and bytes."""
+        mock_client = MagicMock()
+        mock_client.list_objects.return_value = list_objects_response(
+            [DataObject("my-artifact-path/a", 10), DataObject("my-artifact-path/b/c", 20)]
+        )
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+        progress = []
+
+        summary = oci_artifact_repo.bulk_delete_artifacts(
+            dry_run=True, progress_callback=lambda s: progress.append(s.objects)
+        )
+
+        assert (summary.objects, summary.bytes, summary.deleted) == (2, 30, 0)
+        assert progress == [1, 2]
+        mock_client.delete_object.assert_not_called()
+
+    def test_bulk_delete_artifacts_reports_failures(self, oci_artifact_repo):
+        """Tests that failed deletions are collected while the others proceed."""
+        mock_client = MagicMock()
+        mock_client.list_objects.return_value = list_objects_response(
+            [DataObject("my-artifact-path/a", 10), DataObject("my-artifact-path/b", 20)]
+        )
+
+        def delete_object(namespace_name, bucket_name, name):
+            if name.endswith("/b"):
+                raise ServiceError(403, "NotAuthorized", {}, "forbidden")
+
+        mock_client.delete_object.side_effect = delete_object
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+
+        with pytest.raises(ArtifactTransferError) as exc_info:
+            oci_artifact_repo.bulk_delete_artifacts(max_workers=2)
+        assert list(exc_info.value.failures) == ["my-artifact-path/b"]
+        assert exc_info.value.total == 2
+
+    @patch.object(ArtifactUploader, "_is_uploaded", return_value=True)
+    @patch.object(ArtifactUploader, "is_compressible", return_value=False)
+    @patch.object(ArtifactUploader, "upload_files")
+    @patch.object(ArtifactUploader, "__init__", return_value=None)
+    def test_sync_artifacts(
+        self, _, mock_upload_files, __, mock_is_uploaded, oci_artifact_repo, tmp_path
+    ):
+        """Tests that only new and changed files are uploaded and gone files deleted."""
+        (tmp_path / "sub").mkdir()
+        for name, content in (
+            ("same.txt", b"same"),
+            ("multipart.bin", b"multipart"),
+            ("changed.txt", b"changed"),
+            ("sub/new.txt", b"new"),
+        ):
+            (tmp_path / name).write_bytes(content)
+        mock_client = MagicMock()
+        mock_client.list_objects.return_value = list_objects_response(
+            [
+                DataObject(
+                    "my-artifact-path/ckpt/same.txt",
+                    4,
+                    md5=file_md5(str(tmp_path / "same.txt")),
+                ),
+                DataObject("my-artifact-path/ckpt/multipart.bin", 9, md5="bXVsdGlwYXJ0-2"),
+                # Same size, different content, whatever the modification times.
+                DataObject(
+                    "my-artifact-path/ckpt/changed.txt",
+                    7,
+                    md5=file_md5(str(tmp_path / "same.txt")),
+                ),
+                DataObject("my-artifact-path/ckpt/gone.txt", 4),
+            ]
+        )
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+
+        summary = oci_artifact_repo.sync_artifacts(str(tmp_path), "ckpt", delete=True)
+
+        assert (summary.uploaded, summary.skipped, summary.deleted) == (2, 2, 1)
+        # Only the multipart upload, without a plain MD5 in the listing, is checked further.
+        mock_is_uploaded.assert_called_once_with(
+            9,
+            "my-namespace",
+            "my-bucket",
+            "my-artifact-path/ckpt/multipart.bin",
+            file_md5(str(tmp_path / "multipart.bin")),
+        )
+        assert sorted(mock_upload_files.call_args.args[0]) == [
+            (
+                str(tmp_path / "changed.txt"),
+                "oci://my-bucket@my-namespace/my-artifact-path/ckpt/changed.txt",
+            ),
+            (
+                str(tmp_path / "sub" / "new.txt"),
+                "oci://my-bucket@my-namespace/my-artifact-path/ckpt/sub/new.txt",
+            ),
+        ]
+        mock_client.delete_object.assert_called_once_with(
+            "my-namespace", "my-bucket", "my-artifact-path/ckpt/gone.txt"
+        )
+
+    @patch.dict(os.environ, {artifact_upload.MULTIPART_UPLOAD_THRESHOLD: "4"})
+    @patch("oci_mlflow.artifact_upload.ObjectStorageClientPool.get_upload_manager")
+    @patch("oci_mlflow.artifact_upload.get_signer")
+    def test_sync_artifacts_skips_unchanged_multipart_uploads(
+        self, _, mock_get_upload_manager, oci_artifact_repo, tmp_path
+    ):
+        """Tests that a second sync of an unchanged multipart-sized file uploads nothing."""
+        (tmp_path / "checkpoint.bin").write_bytes(b"weights" * 10)
+        stored = {}
+
+        def upload_file(namespace_name, bucket_name, object_name, file_path, **kwargs):
+            stored[object_name] = (os.path.getsize(file_path), kwargs.get("metadata") or {})
+
+        def head_object(namespace_name, bucket_name, object_name):
+            size, metadata = stored[object_name]
+            headers = {f"opc-meta-{key}": value for key, value in metadata.items()}
+            return MagicMock(headers={"content-length": str(size), **headers})
+
+        mock_client = MagicMock()
+        # Object Storage lists multipart uploads with a digest of their parts only.
+        mock_client.list_objects.side_effect = lambda *args, **kwargs: list_objects_response(
+            [DataObject(name, size, md5="cGFydHM=-2") for name, (size, _) in stored.items()]
+        )
+        mock_client.head_object.side_effect = head_object
+        mock_get_upload_manager.return_value.object_storage_client = mock_client
+        mock_get_upload_manager.return_value.upload_file.side_effect = upload_file
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+
+        first = oci_artifact_repo.sync_artifacts(str(tmp_path), "ckpt")
+        second = oci_artifact_repo.sync_artifacts(str(tmp_path), "ckpt")
+
+        assert (first.uploaded, first.skipped) == (1, 0)
+        assert (second.uploaded, second.skipped) == (0, 1)
+        assert mock_get_upload_manager.return_value.upload_file.call_count == 1
+
+    @patch.object(ArtifactUploader, "upload_files")
+    @patch.object(ArtifactUploader, "__init__", return_value=None)
+    def test_sync_artifacts_keeps_archives(self, _, __, oci_artifact_repo, tmp_path):
+        """Tests that syncing the root with deletion keeps the archive bookkeeping objects."""
+        mock_client = MagicMock()
+        mock_client.list_objects.return_value = list_objects_response(
+            [
+                DataObject("my-artifact-path/.oci-mlflow-archives/1-a.json", 10),
+                DataObject("my-artifact-path/data/.oci-mlflow-archive/1-a.tar", 10),
+                DataObject("my-artifact-path/data/.oci-mlflow-archive/1-a.json", 10),
+                DataObject("my-artifact-path/gone.txt", 4),
+            ]
+        )
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+
+        summary = oci_artifact_repo.sync_artifacts(str(tmp_path), delete=True)
+
+        assert summary.deleted == 1
+        mock_client.delete_object.assert_called_once_with(
+            "my-namespace", "my-bucket", "my-artifact-path/gone.txt"
+        )
+
+    def test_prune_archives(self, oci_artifact_repo):
+        """Tests that deleting a directory deletes the manifests of the archives under it."""
+        oci_artifact_repo._read_archive_manifests.return_value = [
+            (
+                ".oci-mlflow-archives/1-a.json",
+                {"path": "data", "archive": "data/.oci-mlflow-archive/1-a.tar", "index": ""},
+            ),
+            (
+                ".oci-mlflow-archives/2-b.json",
+                {"path": "other", "archive": "other/.oci-mlflow-archive/2-b.tar", "index": ""},
+            ),
+        ]
+        mock_client = MagicMock()
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+
+        oci_artifact_repo._prune_archives("data")
+
+        mock_client.delete_object.assert_called_once_with(
+            "my-namespace", "my-bucket", "my-artifact-path/.oci-mlflow-archives/1-a.json"
+        )
+
+    @patch.dict(os.environ, {oci_object_storage.SYNC_ARTIFACTS: "1"})
+    @patch.object(OCIObjectStorageArtifactRepository, "sync_artifacts")
+    def test_log_artifacts_sync_mode(self, mock_sync_artifacts, oci_artifact_repo):
+        oci_artifact_repo.log_artifacts("test_files", "ckpt")
+        mock_sync_artifacts.assert_called_once_with("test_files", "ckpt")
+
+    @patch.dict(os.environ, {oci_object_storage.ARCHIVE_ARTIFACTS: "1"})
+    @patch.object(ArtifactUploader, "__init__", return_value=None)
+    def test_archive_artifacts(self, _, oci_artifact_repo, tmp_path):
+        """Tests that archived directories are listed and downloaded member by member."""
+        store = {}
+
+        def upload_stream(uploader, data, dst_path):
+            data = data.read() if hasattr(data, "read") else data
+            store[dst_path] = data.encode() if isinstance(data, str) else bytes(data)
+
+        def cat_file(path, start=None, end=None):
+            if path not in store:
+                raise FileNotFoundError(path)
+            return store[path][start:end]
+
+        src_dir = tmp_path / "src"
+        (src_dir / "sub").mkdir(parents=True)
+        (src_dir / "a.txt").write_bytes(b"a" * 10)
+        (src_dir / "sub" / "b.txt").write_bytes(b"b" * 20)
+        def get_object(namespace_name, bucket_name, object_name, range):
+            start, end = (int(offset) for offset in range[len("bytes=") :].split("-"))
+            data = store[f"oci://{bucket_name}@{namespace_name}/{object_name}"]
+            return Mock(data=Mock(content=data[start : end + 1]))
+
+        def ls(path, detail=True):
+            names = [name for name in store if name.startswith(path.rstrip("/") + "/")]
+            if not names:
+                raise FileNotFoundError(path)
+            names = [name[len("oci://") :] for name in names]
+            if detail:
+                return [
+                    {"name": name, "type": "file", "size": len(store["oci://" + name])}
+                    for name in names
+                ]
+            return names
+
+        mock_fs = MagicMock()
+        mock_fs.cat_file.side_effect = cat_file
+        mock_fs.ls.side_effect = ls
+        oci_artifact_repo.get_fs = MagicMock(return_value=mock_fs)
+        mock_client = MagicMock()
+        mock_client.get_object.side_effect = get_object
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+        oci_artifact_repo._iter_objects = MagicMock(return_value=iter([]))
+        del oci_artifact_repo._read_archive_manifests
+
+        with patch.object(ArtifactUploader, "upload_stream", upload_stream):
+            archive_path = oci_artifact_repo.log_artifacts_archive(str(src_dir), "data")
+
+        root = "oci://my-bucket@my-namespace/my-artifact-path/"
+        archive_id = posixpath.basename(archive_path)[: -len(".tar")]
+        assert archive_path.startswith("data/.oci-mlflow-archive/")
+        assert set(store) == {
+            root + archive_path,
+            root + archive_path[: -len(".tar")] + ".json",
+            root + f".oci-mlflow-archives/{archive_id}.json",
+        }
+        assert oci_artifact_repo.list_artifacts("data") == [
+            FileInfo("data/a.txt", False, 10),
+            FileInfo("data/sub", True, 0),
+        ]
+
+        dst_dir = tmp_path / "dst"
+        dst_dir.mkdir()
+        local_path = oci_artifact_repo.download_artifacts("data/sub", str(dst_dir))
+        assert local_path == str(dst_dir / "data" / "sub")
+        assert (dst_dir / "data" / "sub" / "b.txt").read_bytes() == b"b" * 20
+        assert not (dst_dir / "data" / "a.txt").exists()
+        # The member is read with a single ranged request, not through the filesystem.
+        mock_client.get_object.assert_called_once()
+        assert all(call.kwargs.get("start") is None for call in mock_fs.cat_file.call_args_list)
+
+    def test_archive_catalog_read_lazily(self, oci_artifact_repo):
+        """Tests that the archive catalog is only read for listings holding archives."""
+        plain = [FileInfo("data/a.txt", False, 10)]
+        assert oci_artifact_repo._with_archive_members("data", plain) == plain
+        oci_artifact_repo._read_archive_manifests.assert_not_called()
+
+        archived = plain + [FileInfo("data/.oci-mlflow-archive", True, 0)]
+        assert oci_artifact_repo._with_archive_members("data", archived) == plain
+        assert oci_artifact_repo._with_archive_members("data/sub", []) == []
+        # The catalog is cached between the listings.
+        oci_artifact_repo._read_archive_manifests.assert_called_once()
+
+    @patch.object(oci_object_storage, "MAX_ARCHIVE_CATALOGS", 2)
+    def test_archive_catalog_cache_is_bounded(self, oci_artifact_repo):
+        """Tests that only the most recently used archive catalogs are kept."""
+        repos = [
+            OCIObjectStorageArtifactRepository(
+                artifact_uri=f"oci://my-bucket@my-namespace/my-artifact-path/{run}"
+            )
+            for run in ("a", "b", "c")
+        ]
+        for repo in repos:
+            repo._read_archive_manifests = MagicMock(return_value=[])
+        repos[0]._get_archive_catalog()
+        repos[1]._get_archive_catalog()
+        repos[0]._get_archive_catalog()
+        repos[2]._get_archive_catalog()
+        assert list(OCIObjectStorageArtifactRepository._archive_cache) == [
+            repos[0].artifact_uri,
+            repos[2].artifact_uri,
+        ]
+
+    @patch.dict(os.environ, {oci_object_storage.DOWNLOAD_PART_SIZE: "64"})
+    def test_download_members_merges_ranges(self, oci_artifact_repo, tmp_path):
+        """Tests that neighbouring archive members are downloaded with shared ranged requests."""
+        content = b"--aaaa--bbbb--" + b"c" * 100
+        mock_client = ranged_client(content)
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+        members = {
+            "a.txt": ("data/.oci-mlflow-archive/1-a.tar", 2, 4),
+            "sub/b.txt": ("data/.oci-mlflow-archive/1-a.tar", 8, 4),
+            "c.bin": ("data/.oci-mlflow-archive/1-a.tar", 14, 100),
+        }
+
+        oci_artifact_repo._download_members(members, str(tmp_path))
+
+        assert (tmp_path / "a.txt").read_bytes() == b"aaaa"
+        assert (tmp_path / "sub" / "b.txt").read_bytes() == b"bbbb"
+        assert (tmp_path / "c.bin").read_bytes() == b"c" * 100
+        # The first two members share a request, the large one is read in two parts.
+        assert sorted(call.kwargs["range"] for call in mock_client.get_object.call_args_list) == [
+            "bytes=14-77",
+            "bytes=2-11",
+            "bytes=78-113",
+        ]
+
+    def test_open_artifact_mmap(self, oci_artifact_repo, tmp_path):
+        """Tests that a downloaded artifact is mapped read-only and its temporary copy removed."""
+        local_paths = []
+
+        def download_file(remote_file_path, local_path):
+            local_paths.append(local_path)
+            with open(local_path, "wb") as f:
+                f.write(b"weights")
+
+        with patch.object(oci_artifact_repo, "_download_file", side_effect=download_file):
+            buffer = oci_artifact_repo.open_artifact_mmap("model/model.bin")
+            assert buffer[:] == b"weights"
+            with pytest.raises(TypeError):
+                buffer[0] = 0
+            buffer.close()
+            assert not os.path.exists(os.path.dirname(local_paths[0]))
+
+            buffer = oci_artifact_repo.open_artifact_mmap("model/model.bin", str(tmp_path))
+            assert buffer[:] == b"weights"
+            buffer.close()
+            assert local_paths[1] == str(tmp_path / "model" / "model.bin")
+            assert os.path.exists(local_paths[1])
+
+        with pytest.raises(ValueError):
+            oci_artifact_repo.open_artifact_mmap("model/")
+
+    def test_open_artifact_mmap_decodes_artifacts(self, oci_artifact_repo):
+        """Tests that the artifacts compressed on upload are mapped decompressed."""
+        content = b"weights" * 100
+
+        def download(full_path, local_path):
+            with open(local_path, "wb") as f:
+                f.write(gzip.compress(content))
+
+        mock_fs = MagicMock()
+        mock_fs.info.return_value = {"size": 100, "etag": None}
+        mock_fs.download.side_effect = download
+        oci_artifact_repo.get_fs = MagicMock(return_value=mock_fs)
+        mock_client = MagicMock()
+        mock_client.head_object.return_value = MagicMock(
+            headers={f"opc-meta-{artifact_upload.ENCODING_METADATA_KEY}": "gzip"}
+        )
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+
+        buffer = oci_artifact_repo.open_artifact_mmap("model/model.bin")
+        assert buffer[:] == content
+        buffer.close()
+
+    def test_open_artifact_mmap_archive_member(self, oci_artifact_repo):
+        """Tests that the members of archived directories are mapped from their archive."""
+        catalog = ArchiveCatalog()
+        catalog.add("model", "model/.oci-mlflow-archive/1-a.tar", {"model.bin": [3, 7]})
+        oci_artifact_repo._get_archive_catalog = MagicMock(return_value=catalog)
+        mock_client = ranged_client(b"---weights---")
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+
+        with patch.object(oci_artifact_repo, "_download_file", side_effect=FileNotFoundError):
+            buffer = oci_artifact_repo.open_artifact_mmap("model/model.bin")
+            assert buffer[:] == b"weights"
+            buffer.close()
+            with pytest.raises(FileNotFoundError):
+                oci_artifact_repo.open_artifact_mmap("model/missing.bin")
+        mock_client.get_object.assert_called_once_with(
+            "my-namespace",
+            "my-bucket",
+            "my-artifact-path/model/.oci-mlflow-archive/1-a.tar",
+            range="bytes=3-9",
+        )
+
+    def test_open_artifact(self, oci_artifact_repo):
+        """Tests that artifacts are opened lazily with a block cache."""
+        mock_fs = MagicMock()
+        mock_fs.open.return_value = io.BytesIO(b"weights")
+        oci_artifact_repo.get_fs = MagicMock(return_value=mock_fs)
+        mock_client = MagicMock()
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+
+        assert oci_artifact_repo.open_artifact("model/model.bin") == mock_fs.open.return_value
+        # Only the objects starting with the gzip magic number are checked for the encoding.
+        mock_client.head_object.assert_not_called()
+        mock_fs.open.assert_called_once_with(
+            "oci://my-bucket@my-namespace/my-artifact-path/model/model.bin",
+            "rb",
+            block_size=16 * 1024 * 1024,
+            cache_type="blockcache",
+        )
+
+    def test_open_artifact_decodes_artifacts(self, oci_artifact_repo):
+        """Tests that the artifacts compressed on upload are decompressed as they are read."""
+        content = b"line\n" * 1000
+        compressed = io.BytesIO(gzip.compress(content))
+        mock_fs = MagicMock()
+        mock_fs.open.return_value = compressed
+        oci_artifact_repo.get_fs = MagicMock(return_value=mock_fs)
+        mock_client = MagicMock()
+        mock_client.head_object.return_value = MagicMock(
+            headers={f"opc-meta-{artifact_upload.ENCODING_METADATA_KEY}": "gzip"}
+        )
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+
+        with oci_artifact_repo.open_artifact("data/lines.txt") as f:
+            assert f.read() == content
+        assert compressed.closed
+        mock_client.head_object.assert_called_once_with(
+            "my-namespace", "my-bucket", "my-artifact-path/data/lines.txt"
+        )
+
+    def test_open_artifact_archive_member(self, oci_artifact_repo):
+        """Tests that the members of archived directories are read from their archive."""
+        archive = io.BytesIO(b"---hello world---")
+
+        def open_file(path, mode, **kwargs):
+            if path.endswith(".tar"):
+                return archive
+            raise FileNotFoundError(path)
+
+        mock_fs = MagicMock()
+        mock_fs.open.side_effect = open_file
+        oci_artifact_repo.get_fs = MagicMock(return_value=mock_fs)
+        catalog = ArchiveCatalog()
+        catalog.add("data", "data/.oci-mlflow-archive/1-a.tar", {"a.txt": [3, 11]})
+        oci_artifact_repo._get_archive_catalog = MagicMock(return_value=catalog)
+
+        with oci_artifact_repo.open_artifact("data/a.txt") as f:
+            assert f.read() == b"hello world"
+            f.seek(-5, io.SEEK_END)
+            assert f.read(3) == b"wor"
+            assert f.tell() == 9
+        assert archive.closed
+        mock_fs.open.assert_called_with(
+            "oci://my-bucket@my-namespace/my-artifact-path/data/.oci-mlflow-archive/1-a.tar",
+            "rb",
+            block_size=16 * 1024 * 1024,
+            cache_type="blockcache",
+        )
+        with pytest.raises(FileNotFoundError):
+            oci_artifact_repo.open_artifact("data/missing.txt")
+
+    @patch("oci_mlflow.oci_object_storage.get_signer")
+    @patch("fsspec.filesystem")
+    def test_get_fs_is_cached(self, mock_filesystem, mock_get_signer):
+        """Tests that repositories share one filesystem until it is refreshed."""
+        OCIObjectStorageArtifactRepository.clear_fs_cache()
+        mock_get_signer.return_value = {"config": {}, "signer": None, "client_kwargs": {}}
+        mock_filesystem.side_effect = lambda *args, **kwargs: MagicMock()
+        uri = "oci://my-bucket@my-namespace/my-artifact-path"
+
+        fs = OCIObjectStorageArtifactRepository(artifact_uri=uri).get_fs()
+        assert OCIObjectStorageArtifactRepository(artifact_uri=uri).get_fs() is fs
+        assert mock_filesystem.call_count == 1
+
+        assert OCIObjectStorageArtifactRepository(artifact_uri=uri).get_fs(refresh=True) is not fs
+        assert mock_get_signer.call_count == 2
+        OCIObjectStorageArtifactRepository.clear_fs_cache()
+
+    @patch("oci_mlflow.oci_object_storage.get_signer")
+    @patch("fsspec.filesystem")
+    def test_get_fs_per_auth_settings(self, mock_filesystem, mock_get_signer):
+        """Tests that changing the auth settings does not reuse the cached filesystem."""
+        OCIObjectStorageArtifactRepository.clear_fs_cache()
+        mock_get_signer.return_value = {"config": {}, "signer": None, "client_kwargs": {}}
+        mock_filesystem.side_effect = lambda *args, **kwargs: MagicMock()
+        repo = OCIObjectStorageArtifactRepository(
+            artifact_uri="oci://my-bucket@my-namespace/my-artifact-path"
+        )
+        with patch.object(
+            object_storage_auth, "auth_settings", return_value=("api_key", "~/.oci/config", "A")
+        ):
+            fs = repo.get_fs()
+            assert repo.get_fs() is fs
+        with patch.object(
+            object_storage_auth, "auth_settings", return_value=("api_key", "~/.oci/config", "B")
+        ):
+            assert repo.get_fs() is not fs
+        OCIObjectStorageArtifactRepository.clear_fs_cache()
+
+    @patch.dict(os.environ, {object_storage_auth.TOKEN_CHECK_INTERVAL: "0"})
+    @patch("oci_mlflow.oci_object_storage.get_signer")
+    @patch("fsspec.filesystem")
+    def test_get_fs_replaced_on_token_rotation(self, mock_filesystem, mock_get_signer, tmp_path):
+        """Tests that the filesystem of a rotated token replaces the stale one in the cache."""
+        OCIObjectStorageArtifactRepository.clear_fs_cache()
+        mock_get_signer.return_value = {"config": {}, "signer": None, "client_kwargs": {}}
+        mock_filesystem.side_effect = lambda *args, **kwargs: MagicMock()
+        token_file = tmp_path / "token"
+        token_file.write_text("token-1")
+        repo = OCIObjectStorageArtifactRepository(
+            artifact_uri="oci://my-bucket@my-namespace/my-artifact-path"
+        )
+        with patch("oci_mlflow.oci_object_storage.get_token_path", return_value=str(token_file)):
+            fs = repo.get_fs()
+            assert repo.get_fs() is fs
+            for rotation in range(3):
+                token_file.write_text(f"token-{rotation + 2}")
+                os.utime(token_file, (rotation + 1, rotation + 1))
+                assert repo.get_fs() is not fs
+                fs = repo.get_fs()
+        assert len(OCIObjectStorageArtifactRepository._fs_cache) == 1
+        OCIObjectStorageArtifactRepository.clear_fs_cache()
+
+    @patch("oci_mlflow.oci_object_storage.get_signer")
+    @patch("fsspec.filesystem")
+    def test_get_fs_expires(self, mock_filesystem, mock_get_signer):
+        """Tests that the cached filesystem is recreated once its TTL passes."""
+        OCIObjectStorageArtifactRepository.clear_fs_cache()
+        mock_get_signer.return_value = {"config": {}, "signer": None, "client_kwargs": {}}
+        mock_filesystem.side_effect = lambda *args, **kwargs: MagicMock()
+        repo = OCIObjectStorageArtifactRepository(
+            artifact_uri="oci://my-bucket@my-namespace/my-artifact-path"
+        )
+        with patch.dict(os.environ, {oci_object_storage.FS_CACHE_TTL: "0"}):
+            fs = repo.get_fs()
+            assert repo.get_fs() is not fs
+        OCIObjectStorageArtifactRepository.clear_fs_cache()
+
+    def test_download_file_re_signs_on_auth_error(self, oci_artifact_repo):
+        """Tests that an operation rejected with 401 is retried on a re-signed filesystem."""
+        expired_fs, fresh_fs = MagicMock(), MagicMock()
+        expired_fs.info.return_value = fresh_fs.info.return_value = {"size": 10}
+        expired_fs.download.side_effect = ServiceError(401, "NotAuthenticated", {}, "expired")
+        oci_artifact_repo.get_fs = MagicMock(side_effect=[expired_fs, fresh_fs])
+
+        oci_artifact_repo._download_file("my_file.txt", "/tmp/my_file.txt")
+
+        oci_artifact_repo.get_fs.assert_called_with(refresh=True)
+        fresh_fs.download.assert_called_once_with(
+            "oci://my-bucket@my-namespace/my-artifact-path/my_file.txt", "/tmp/my_file.txt"
+        )
+
+    @patch.object(oci_object_storage, "OCI_PREFIX", "oci://")
+    def test_list_artifacts_single_listing(self, oci_artifact_repo):
+        """Tests that listing a directory takes one request regardless of its size."""
+        mock_fs = MagicMock()
+        mock_fs.ls.return_value = [
+            {
+                "name": "my-bucket@my-namespace/my-artifact-path/model/data/",
+                "type": "directory",
+                "size": 0,
+            },
+            {
+                "name": "my-bucket@my-namespace/my-artifact-path/model/MLmodel",
+                "type": "file",
+                "size": 42,
+            },
+        ]
+        oci_artifact_repo.get_fs = MagicMock(return_value=mock_fs)
+
+        artifacts = oci_artifact_repo.list_artifacts("model")
+
+        assert artifacts == [
+            FileInfo("model/MLmodel", False, 42),
+            FileInfo("model/data", True, 0),
+        ]
         mock_fs.ls.assert_called_once_with(
-            "oci://my-bucket@my-namespace/my-artifact-path/test", refresh=True
+            "oci://my-bucket@my-namespace/my-artifact-path/model", detail=True
+        )
+        mock_fs.info.assert_not_called()
+        mock_fs.isdir.assert_not_called()
+
+    @patch.object(oci_object_storage, "OCI_PREFIX", "oci://")
+    def test_list_artifacts_of_file(self, oci_artifact_repo):
+        """Tests that listing a file or a missing path returns an empty list."""
+        mock_fs = MagicMock()
+        mock_fs.ls.return_value = [
+            {
+                "name": "my-bucket@my-namespace/my-artifact-path/model/MLmodel",
+                "type": "file",
+                "size": 42,
+            }
+        ]
+        oci_artifact_repo.get_fs = MagicMock(return_value=mock_fs)
+        assert oci_artifact_repo.list_artifacts("model/MLmodel") == []
+
+        mock_fs.ls.side_effect = FileNotFoundError
+        assert oci_artifact_repo.list_artifacts("missing") == []
+
+    @patch.dict(os.environ, {oci_object_storage.LIST_RECURSIVE: "true"})
+    def test_list_artifacts_from_index(self, oci_artifact_repo):
+        """Tests that a recursive listing answers the listings of all sub-directories."""
+        mock_client = MagicMock()
+        mock_client.list_objects.return_value = list_objects_response(
+            [
+                DataObject("my-artifact-path/MLmodel", 10),
+                DataObject("my-artifact-path/data/model.pkl", 20),
+                DataObject("my-artifact-path/data/nested/weights.bin", 30),
+            ]
         )
-        assert mock_fs.delete.call_count == 3
-        mock_fs.delete.assert_any_call("test/file1")
-        mock_fs.delete.assert_any_call("test/file2")
-        mock_fs.delete.assert_any_call("test/folder/")
+        oci_artifact_repo._get_client = MagicMock(return_value=mock_client)
+        OCIObjectStorageArtifactRepository._index_cache.clear()
+
+        assert oci_artifact_repo.list_artifacts() == [
+            FileInfo("MLmodel", False, 10),
+            FileInfo("data", True, 0),
+        ]
+        assert oci_artifact_repo.list_artifacts("data") == [
+            FileInfo("data/model.pkl", False, 20),
+            FileInfo("data/nested", True, 0),
+        ]
+        assert oci_artifact_repo.list_artifacts_recursive("data") == [
+            FileInfo("data/model.pkl", False, 20),
+            FileInfo("data/nested/weights.bin", False, 30),
+        ]
+        assert mock_client.list_objects.call_count == 1
+
+        with patch.object(ArtifactUploader, "__init__", return_value=None), patch.object(
+            ArtifactUploader, "upload"
+        ):
+            oci_artifact_repo.log_artifact("test_files/test.txt", "data")
+        oci_artifact_repo.list_artifacts("data")
+        assert mock_client.list_objects.call_count == 2
+        OCIObjectStorageArtifactRepository._index_cache.clear()
 
     def test_list_artifacts(self):
         print(os.path.join(self.curr_dir, "artifacts"))
@@ -163,63 +989,30 @@ class TestOCIObjectStorageArtifactRepository:
         assert artifacts == expected_artifacts
 
 
-class TestArtifactUploader:
-    def test_init(self):
-        """Ensures the ArtifactUploader instance can be initialized."""
-        artifact_uploader = ArtifactUploader()
-        assert isinstance(
-            artifact_uploader.upload_manager, object_storage.UploadManager
-        )
+class TestCompression:
+    def test_decode_artifact(self, tmp_path):
+        """Tests that only the objects marked as compressed are decompressed."""
+        content = b"line\n" * 1000
+        compressed = tmp_path / "compressed.txt"
+        compressed.write_bytes(gzip.compress(content))
+        archive = tmp_path / "archive.gz"
+        archive.write_bytes(gzip.compress(content))
+        plain = tmp_path / "plain.txt"
+        plain.write_bytes(content)
+        client = MagicMock()
+        client.head_object.side_effect = [
+            MagicMock(headers={f"opc-meta-{artifact_upload.ENCODING_METADATA_KEY}": "gzip"}),
+            MagicMock(headers={}),
+        ]
 
-    @patch.object(object_storage.UploadManager, "upload_file")
-    def test_upload(self, mock_upload_file):
-        """Tests uploading model artifacts."""
-        artifact_uploader = ArtifactUploader()
+        uri = "oci://my-bucket@my-namespace/my-artifact-path/"
+        assert oci_object_storage._decode_artifact(client, uri + "compressed.txt", str(compressed))
+        assert not oci_object_storage._decode_artifact(client, uri + "archive.gz", str(archive))
+        assert not oci_object_storage._decode_artifact(client, uri + "plain.txt", str(plain))
 
-        local_file = "test_files/test.txt"
-        dest_path = "oci://my-bucket@my-namespace/my-artifact-path/logs/test.txt"
-        artifact_uploader.upload(local_file, dest_path)
-
-        mock_upload_file.assert_called_with(
-            namespace_name="my-namespace",
-            bucket_name="my-bucket",
-            object_name="my-artifact-path/logs/test.txt",
-            file_path=local_file,
-        )
-
-
-class TestUtils:
-    """Test static methods in oci_object_storage.py."""
-
-    @patch("os.path.exists")
-    def test_get_token_path_in_df(self, mock_path):
-        """Tests getting the token path in DF session."""
-        mock_path.return_value = True
-        assert get_token_path() == DEFAULT_DELEGATION_TOKEN_PATH
-
-    @patch("os.path.exists")
-    def test_get_token_path_locally(self, mock_path):
-        """Tests getting the token path locally."""
-        mock_path.return_value = False
-        assert get_token_path() == None
-
-    @patch("oci_mlflow.oci_object_storage.get_delegation_token_signer")
-    @patch("ads.common.auth.set_auth")
-    def test_get_signer_in_df(self, mock_set_auth, mock_get_signer):
-        """Tests getting the storage options in DF session."""
-        get_signer(token_path=DEFAULT_DELEGATION_TOKEN_PATH)
-        mock_set_auth.assert_called_once_with(
-            signer_callable=mock_get_signer,
-            signer_kwargs={"token_path": DEFAULT_DELEGATION_TOKEN_PATH},
-        )
-
-    @patch("ads.common.auth.default_signer")
-    @patch("ads.common.auth.set_auth")
-    def test_get_signer_locally(self, mock_set_auth, mock_default_signer):
-        """Tests getting the storage options locally."""
-        expected_config = {"config": "value", "signer": "value2"}
-        mock_default_signer.return_value = expected_config
-
-        signer = get_signer(token_path=None)
-        mock_set_auth.assert_not_called()
-        assert signer == expected_config
+        assert compressed.read_bytes() == content
+        assert gzip.decompress(archive.read_bytes()) == content
+        assert client.head_object.call_count == 2
+        client.head_object.assert_any_call(
+            "my-namespace", "my-bucket", "my-artifact-path/compressed.txt"
+        )
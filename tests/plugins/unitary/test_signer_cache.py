@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+import base64
+import json
+import time
+from unittest.mock import MagicMock, create_autospec, patch
+
+from oci.auth.federation_client import X509FederationClient
+from oci.auth.security_token_container import SecurityTokenContainer
+from oci.auth.signers import (
+    InstancePrincipalsDelegationTokenSigner,
+    InstancePrincipalsSecurityTokenSigner,
+)
+
+from oci_mlflow.signer_cache import SignerCache, token_expiry
+
+
+def make_jwt(exp: float) -> str:
+    header, payload = (
+        base64.urlsafe_b64encode(json.dumps(part).encode()).rstrip(b"=").decode()
+        for part in ({"alg": "RS256", "typ": "JWT"}, {"exp": exp})
+    )
+    return f"{header}.{payload}.c2lnbmF0dXJl"
+
+
+def principal_signer(signer_class: type, exp: float):
+    """Creates a principal signer holding a token in its federation client, like the SDK."""
+    signer = create_autospec(signer_class, instance=True)
+    signer.federation_client = create_autospec(X509FederationClient, instance=True)
+    signer.federation_client.security_token = SecurityTokenContainer(None, make_jwt(exp))
+    return signer
+
+
+class TestSignerCache:
+    def setup_method(self):
+        SignerCache.clear()
+
+    def teardown_method(self):
+        SignerCache.clear()
+
+    def test_token_expiry(self):
+        """Tests reading the token expiry of the different signers."""
+        assert token_expiry(MagicMock(spec=[])) is None
+        assert token_expiry(MagicMock(spec=["security_token"], security_token=make_jwt(42))) == 42
+        container = MagicMock(jwt={"exp": 7})
+        assert token_expiry(MagicMock(spec=["_security_token"], _security_token=container)) == 7
+        for signer_class in (
+            InstancePrincipalsSecurityTokenSigner,
+            InstancePrincipalsDelegationTokenSigner,
+        ):
+            assert token_expiry(principal_signer(signer_class, 42)) == 42
+
+    def test_get(self):
+        """Tests that signers are created once per key and state."""
+        factory = MagicMock(side_effect=lambda: {"signer": object()})
+
+        auth = SignerCache.get("key", factory)
+        assert SignerCache.get("key", factory) is auth
+        assert SignerCache.get("other", factory) is not auth
+        assert SignerCache.get("key", factory, state=1) is not auth
+        assert factory.call_count == 3
+        assert SignerCache.stats() == {
+            "hits": 1,
+            "misses": 3,
+            "refreshes": 0,
+            "refresh_errors": 0,
+        }
+
+    @patch.object(SignerCache, "_start_refresher")
+    def test_refresh(self, mock_start_refresher):
+        """Tests that tokens close to their expiry are renewed in place."""
+        signer = principal_signer(InstancePrincipalsDelegationTokenSigner, time.time() + 60)
+
+        def refresh_security_token():
+            signer.federation_client.security_token = SecurityTokenContainer(
+                None, make_jwt(time.time() + 3600)
+            )
+
+        signer.refresh_security_token.side_effect = refresh_security_token
+        auth = SignerCache.get("key", lambda: {"signer": signer})
+        mock_start_refresher.assert_called_once()
+
+        assert SignerCache.refresh() == 1
+        # The renewed token is far from its expiry.
+        assert SignerCache.refresh() == 0
+        assert SignerCache.get("key", MagicMock()) is auth
+        assert SignerCache.stats()["refreshes"] == 1
+
+    @patch.object(SignerCache, "_listeners", [])
+    @patch.object(SignerCache, "_start_refresher")
+    def test_refresh_recreates_signers(self, _):
+        """Tests that signers without an in place renewal are recreated, and failures counted."""
+        listener = MagicMock()
+        SignerCache.add_listener(listener)
+        factory = MagicMock(
+            side_effect=[
+                {"signer": MagicMock(spec=["security_token"], security_token=make_jwt(0))},
+                RuntimeError("identity service unavailable"),
+                {"signer": MagicMock(spec=[])},
+            ]
+        )
+        auth = SignerCache.get("key", factory)
+
+        assert SignerCache.refresh() == 0
+        assert SignerCache.stats()["refresh_errors"] == 1
+        assert SignerCache.refresh() == 1
+        assert SignerCache.get("key", factory) is not auth
+        # The clients created with the replaced signer are released.
+        listener.assert_called_once_with(auth)
+        # Signers without a token are not refreshed.
+        assert SignerCache.refresh(force=True) == 0
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; -*-
+
+# Copyright (c) 2023 Oracle and/or its affiliates.
+# Licensed under the Universal Permissive License v 1.0 as shown at https://oss.oracle.com/licenses/upl/
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from oci.exceptions import ServiceError
+
+from oci_mlflow.artifact_upload import ArtifactUploader
+from oci_mlflow.object_storage_utils import call_with_retry
+from oci_mlflow.transfer_metrics import TransferEvent, TransferMetrics
+
+
+class TestTransferMetrics:
+    def setup_method(self):
+        TransferMetrics.reset()
+        self.events = []
+        TransferMetrics.register_callback(self.events.append)
+
+    def teardown_method(self):
+        TransferMetrics.unregister_callback(self.events.append)
+        TransferMetrics.reset()
+
+    def test_measure(self):
+        """Tests that measured operations are passed to the callbacks and summarized."""
+        with TransferMetrics.measure("upload", "oci://bucket@ns/a", bytes=10, parts=1):
+            pass
+        with pytest.raises(ValueError):
+            with TransferMetrics.measure("upload", "oci://bucket@ns/b", bytes=30, parts=2):
+                raise ValueError("failed")
+
+        assert [(e.path, e.bytes, e.error is not None) for e in self.events] == [
+            ("oci://bucket@ns/a", 10, False),
+            ("oci://bucket@ns/b", 30, True),
+        ]
+        summary = TransferMetrics.summary()["upload"]
+        assert (summary["count"], summary["errors"], summary["bytes"], summary["parts"]) == (
+            2,
+            1,
+            40,
+            3,
+        )
+        assert "upload" in TransferMetrics.format_summary()
+
+        TransferMetrics.reset()
+        assert TransferMetrics.summary() == {}
+
+    @patch("oci_mlflow.object_storage_utils.time.sleep")
+    def test_retries_are_merged(self, mock_sleep):
+        """Tests that retried attempts are counted on the outermost measurement."""
+        attempts = MagicMock(
+            side_effect=[ServiceError(503, "ServiceUnavailable", {}, "unavailable"), None]
+        )
+
+        def attempt():
+            with TransferMetrics.measure("delete", "attempt"):
+                attempts()
+
+        with TransferMetrics.measure("delete", "object"):
+            call_with_retry(attempt, retries=1, description="deletion")
+
+        assert len(self.events) == 1
+        assert (self.events[0].path, self.events[0].retries) == ("object", 1)
+
+    def test_failing_callback_is_ignored(self):
+        """Tests that a failing callback does not fail the operation."""
+        callback = MagicMock(side_effect=RuntimeError("broken exporter"))
+        TransferMetrics.register_callback(callback)
+        try:
+            with TransferMetrics.measure("list", "oci://bucket@ns/"):
+                pass
+        finally:
+            TransferMetrics.unregister_callback(callback)
+        callback.assert_called_once()
+        assert len(self.events) == 1
+
+    def test_upload_is_measured(self):
+        """Tests that uploads report their payload size and part count."""
+        with patch.object(ArtifactUploader, "__init__", return_value=None):
+            artifact_uploader = ArtifactUploader()
+        artifact_uploader.upload_manager = MagicMock()
+        artifact_uploader.part_size = 4
+        artifact_uploader.multipart_threshold = 8
+        artifact_uploader.deduplicate = False
+        artifact_uploader.record_md5 = False
+        artifact_uploader.compress = False
+        local_file = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "test_files", "test.txt"
+        )
+        size = os.path.getsize(local_file)
+
+        artifact_uploader.upload(local_file, "oci://my-bucket@my-namespace/test.txt")
+
+        event = self.events[-1]
+        assert isinstance(event, TransferEvent)
+        assert (event.operation, event.bytes) == ("upload", size)
+        expected_parts = 1 if size <= 8 else -(-size // 4)
+        assert event.parts == expected_parts
+        assert event.throughput >= 0